@@ -0,0 +1,43 @@
+"""A* timing on the examples/A*_demo.py workload (12^3 world, 18 obstacles).
+
+Run with: python benchmarks/bench_astar.py
+"""
+import random
+import time
+
+from motion_planning import AStarPlanner, RandomWorld
+
+SEEDS = range(10)
+
+
+def main() -> None:
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(12.0, 12.0, 12.0),
+        obstacle_count=18,
+        obstacle_size_range=(0.8, 2.2),
+    )
+    start, goal = (1.0, 1.0, 1.0), (11.0, 11.0, 11.0)
+    for diagonal in (False, True):
+        planner = AStarPlanner(resolution=0.5, allow_diagonal=diagonal)
+        cold = warm = 0.0
+        iterations = 0
+        for seed in SEEDS:
+            world = world_gen.generate(random.Random(seed))
+            t0 = time.perf_counter()
+            result = planner.plan(world, start, goal)
+            t1 = time.perf_counter()
+            planner.plan(world, start, goal)
+            t2 = time.perf_counter()
+            cold += t1 - t0
+            warm += t2 - t1
+            iterations += result.iterations
+        n = len(SEEDS)
+        print(
+            f"diagonal={diagonal!s:5} cold {cold / n * 1e3:7.1f} ms  warm {warm / n * 1e3:7.1f} ms"
+            f"  expansions/s {iterations / warm:10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Many starts, one goal: A* per query vs one cost-to-go field.
+
+Run with: python benchmarks/bench_cost_to_go.py [starts]
+"""
+import random
+import sys
+import time
+
+from motion_planning import AStarPlanner, RandomWorld, clear_cost_to_go_cache, cost_to_go_field
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(24.0, 24.0, 8.0),
+        obstacle_count=60,
+        obstacle_size_range=(0.8, 3.0),
+    )
+    rng = random.Random(0)
+    world = world_gen.generate(rng)
+    goal = world_gen.sample_free_point(world, rng)
+    starts = [world_gen.sample_free_point(world, rng) for _ in range(n)]
+    planner = AStarPlanner(resolution=0.5, allow_diagonal=True, record_visited="off")
+    planner.plan(world, starts[0], goal)  # warm the grid caches
+
+    t0 = time.perf_counter()
+    expansions = sum(planner.plan(world, s, goal).iterations for s in starts)
+    astar = time.perf_counter() - t0
+    print(f"A* per query       {astar:7.2f} s  {expansions / n:8.0f} expansions/query")
+
+    clear_cost_to_go_cache()
+    t0 = time.perf_counter()
+    field = cost_to_go_field(world, goal, 0.5, allow_diagonal=True)
+    build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for s in starts:
+        field.path(s)
+    descent = time.perf_counter() - t0
+    print(f"field build        {build:7.2f} s  ({field.nbytes / 1e6:.1f} MB)")
+    print(f"field descent      {descent:7.3f} s  x{astar / (build + descent):.1f} incl. build")
+
+    guided = AStarPlanner(
+        resolution=0.5, allow_diagonal=True, record_visited="off", cost_to_go=True
+    )
+    t0 = time.perf_counter()
+    expansions = sum(guided.plan(world, s, goal).iterations for s in starts)
+    elapsed = time.perf_counter() - t0
+    print(f"A* + field h       {elapsed:7.2f} s  {expansions / n:8.0f} expansions/query")
+
+
+if __name__ == "__main__":
+    main()
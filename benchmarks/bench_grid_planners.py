@@ -0,0 +1,57 @@
+"""Expansions and wall time: A* (26-connected) vs JPS vs bidirectional A*.
+
+Run with: python benchmarks/bench_grid_planners.py
+"""
+import random
+import time
+
+from motion_planning import (
+    AStarPlanner,
+    BidirectionalAStarPlanner,
+    JPSPlanner,
+    RandomWorld,
+)
+
+SCENARIOS = {
+    # name: (world size, obstacle count)
+    "open": (30.0, 10),
+    "mixed": (30.0, 60),
+    "cluttered": (20.0, 150),
+}
+RESOLUTION = 0.5
+QUERIES = 5
+
+
+def main() -> None:
+    planners = {
+        "astar": AStarPlanner(resolution=RESOLUTION, allow_diagonal=True),
+        "jps": JPSPlanner(resolution=RESOLUTION),
+        "bidir": BidirectionalAStarPlanner(resolution=RESOLUTION, allow_diagonal=True),
+    }
+    print(f"{'scenario':10} {'planner':6} {'solved':>6} {'expansions':>11} {'ms/query':>9}")
+    for name, (size, count) in SCENARIOS.items():
+        world_gen = RandomWorld(
+            bounds_max=(size, size, size), obstacle_count=count, obstacle_size_range=(1.0, 4.0)
+        )
+        rng = random.Random(0)
+        world = world_gen.generate(rng)
+        queries = [world_gen.sample_line_segment(world, rng) for _ in range(QUERIES)]
+        for label, planner in planners.items():
+            # Warm the shared per-world grid and edge cache before timing.
+            for start, goal in queries:
+                planner.plan(world, start, goal)
+            solved = expansions = 0
+            t0 = time.perf_counter()
+            for start, goal in queries:
+                result = planner.plan(world, start, goal)
+                solved += result.success
+                expansions += result.iterations
+            elapsed = (time.perf_counter() - t0) / QUERIES
+            print(
+                f"{name:10} {label:6} {solved:>6} {expansions // QUERIES:>11} "
+                f"{elapsed * 1e3:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
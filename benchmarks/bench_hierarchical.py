@@ -0,0 +1,52 @@
+"""Hierarchical (portal graph + corridor) planning vs flat A*: time and path cost.
+
+Run with: python benchmarks/bench_hierarchical.py
+"""
+import random
+import time
+
+from motion_planning import AStarPlanner, HierarchicalPlanner, RandomWorld
+from motion_planning.settings.types import distance
+
+QUERIES = 10
+
+
+def _cost(path):
+    return sum(distance(a, b) for a, b in zip(path, path[1:]))
+
+
+def main() -> None:
+    for size, count in ((30.0, 60), (40.0, 150)):
+        world_gen = RandomWorld(
+            bounds_max=(size, size, size), obstacle_count=count, obstacle_size_range=(1.0, 4.0)
+        )
+        rng = random.Random(0)
+        world = world_gen.generate(rng)
+        queries = [world_gen.sample_line_segment(world, rng) for _ in range(QUERIES)]
+        flat = AStarPlanner(resolution=0.5, allow_diagonal=True)
+        print(f"world {size:.0f}^3, {count} obstacles")
+        for margin in (0, 1):
+            hier = HierarchicalPlanner(resolution=0.5, corridor_margin=margin)
+            # Two passes: the first builds the cached abstraction, the second reuses it.
+            for label in ("cold", "warm"):
+                t_flat = t_hier = 0.0
+                ratios = []
+                for start, goal in queries:
+                    t0 = time.perf_counter()
+                    a = flat.plan(world, start, goal)
+                    t1 = time.perf_counter()
+                    h = hier.plan(world, start, goal)
+                    t2 = time.perf_counter()
+                    t_flat += t1 - t0
+                    t_hier += t2 - t1
+                    if a.success and h.success and len(a.path) > 1:
+                        ratios.append(_cost(h.path) / _cost(a.path))
+                print(
+                    f"  margin={margin} {label}: A* {t_flat / QUERIES * 1e3:7.1f} ms"
+                    f"  hierarchical {t_hier / QUERIES * 1e3:7.1f} ms"
+                    f"  cost ratio mean {sum(ratios) / len(ratios):.4f} max {max(ratios):.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
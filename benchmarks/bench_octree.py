@@ -0,0 +1,67 @@
+"""Sparse octree vs dense flat grid: build time, memory and a sparse A* query.
+
+The dense grid is skipped once it would exceed --dense-limit cells; the octree
+keeps going to kilometre-scale bounds.
+
+Run with: python benchmarks/bench_octree.py [--resolution 0.5] [--dense-limit 5e7]
+"""
+import argparse
+import random
+import time
+
+from motion_planning import AStarPlanner, Grid3D, RandomWorld
+
+SIZES = [
+    (50.0, 50.0, 20.0),
+    (200.0, 200.0, 50.0),
+    (1000.0, 1000.0, 100.0),
+    (2000.0, 2000.0, 200.0),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=float, default=0.5)
+    parser.add_argument("--dense-limit", type=float, default=5e7)
+    args = parser.parse_args()
+
+    print(f"{'bounds':>22} {'cells':>10} {'dense s':>8} {'dense MB':>9} {'tree s':>7} {'tree MB':>8}")
+    for size in SIZES:
+        # Roughly constant obstacle density per unit of ground area.
+        count = max(10, int(size[0] * size[1] / 15000))
+        world = RandomWorld(
+            bounds_min=(0.0, 0.0, 0.0),
+            bounds_max=size,
+            obstacle_count=count,
+            obstacle_size_range=(2.0, min(40.0, size[2] / 2)),
+        ).generate(random.Random(0)).build_index()
+        grid = Grid3D(world, args.resolution)
+        dims = grid.dims()
+        cells = dims[0] * dims[1] * dims[2]
+
+        dense = "skipped", "-"
+        if cells <= args.dense_limit:
+            t0 = time.perf_counter()
+            flat = grid.flat()
+            dense = f"{time.perf_counter() - t0:.2f}", f"{2 * flat.size / 1e6:.1f}"
+        t0 = time.perf_counter()
+        tree = grid.octree()
+        build = time.perf_counter() - t0
+        print(
+            f"{str(size):>22} {cells:>10.2e} {dense[0]:>8} {dense[1]:>9} "
+            f"{build:>7.2f} {tree.nbytes() / 1e6:>8.1f}"
+        )
+
+        planner = AStarPlanner(args.resolution, True, sparse=True, record_visited="off")
+        start = (size[0] * 0.05, size[1] * 0.05, 1.0)
+        goal = (start[0] + min(40.0, size[0] / 2), start[1] + min(30.0, size[1] / 2), 10.0)
+        t0 = time.perf_counter()
+        result = planner.plan(world, start, goal)
+        print(
+            f"{'':>22} sparse A* query: success={result.success} "
+            f"iterations={result.iterations} {time.perf_counter() - t0:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
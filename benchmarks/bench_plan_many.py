@@ -0,0 +1,47 @@
+"""Multi-query throughput: serial plan() loop vs plan_many over a process pool.
+
+Run with: python benchmarks/bench_plan_many.py [queries]
+"""
+import os
+import random
+import sys
+import time
+
+from motion_planning import AStarPlanner, RandomWorld, plan_many
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(12.0, 12.0, 12.0),
+        obstacle_count=18,
+        obstacle_size_range=(0.8, 2.2),
+    )
+    rng = random.Random(0)
+    world = world_gen.generate(rng)
+    queries = [world_gen.sample_line_segment(world, rng) for _ in range(n)]
+    planner = AStarPlanner(resolution=0.5, allow_diagonal=True)
+
+    # Warm the per-world caches so both sides start from the same state.
+    planner.plan(world, *queries[0])
+    t0 = time.perf_counter()
+    for start, goal in queries:
+        planner.plan(world, start, goal)
+    serial = time.perf_counter() - t0
+    print(f"serial          {n / serial:8.1f} queries/s")
+
+    for workers in sorted({2, 4, max(os.cpu_count() or 1, 2)}):
+        for ordered in (True, False):
+            t0 = time.perf_counter()
+            for _ in plan_many(world, queries, planner, workers=workers, ordered=ordered):
+                pass
+            elapsed = time.perf_counter() - t0
+            print(
+                f"workers={workers:<2} {'ordered' if ordered else 'unordered':9}"
+                f" {n / elapsed:8.1f} queries/s  x{serial / elapsed:.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
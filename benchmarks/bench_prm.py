@@ -0,0 +1,59 @@
+"""PRM roadmap: serial vs process-pool construction, save/load, per-query latency.
+
+Run with: python benchmarks/bench_prm.py [samples] [workers]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from motion_planning import PRMPlanner, RandomWorld, build_roadmap, load_roadmap
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(60.0, 60.0, 20.0),
+        obstacle_count=400,
+        obstacle_size_range=(1.0, 4.0),
+    )
+    rng = random.Random(0)
+    world = world_gen.generate(rng)
+
+    for w in sorted({1, workers}):
+        t0 = time.perf_counter()
+        roadmap = build_roadmap(world, n, k=10, seed=0, workers=w)
+        print(f"build, {w:2d} workers  {time.perf_counter() - t0:7.2f} s")
+    print(f"roadmap            {len(roadmap)} nodes, {roadmap.edge_count} edges")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roadmap.npz")
+        t0 = time.perf_counter()
+        roadmap.save(path)
+        save = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        roadmap = load_roadmap(path)
+        print(f"save / load        {save:7.3f} s / {time.perf_counter() - t0:.3f} s")
+
+    planner = PRMPlanner(roadmap=roadmap)
+    queries = [
+        (world_gen.sample_free_point(world, rng), world_gen.sample_free_point(world, rng))
+        for _ in range(1000)
+    ]
+    latency = []
+    solved = 0
+    for start, goal in queries:
+        t0 = time.perf_counter()
+        solved += planner.plan(world, start, goal).success
+        latency.append(time.perf_counter() - t0)
+    p50, p99 = np.percentile(latency, [50, 99]) * 1e3
+    print(f"query              p50 {p50:.2f} ms  p99 {p99:.2f} ms  solved {solved}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
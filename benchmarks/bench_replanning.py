@@ -0,0 +1,42 @@
+"""Incremental repair (D* Lite update) vs planning from scratch after small deltas.
+
+Run with: python benchmarks/bench_replanning.py
+"""
+import random
+import time
+
+from motion_planning import AStarPlanner, DStarLitePlanner, RandomWorld, Sphere
+
+UPDATES = 10
+
+
+def main() -> None:
+    world_gen = RandomWorld(
+        bounds_max=(20.0, 20.0, 20.0), obstacle_count=60, obstacle_size_range=(1.0, 3.0)
+    )
+    rng = random.Random(0)
+    world = world_gen.generate(rng)
+    start, goal = (1.0, 1.0, 1.0), (19.0, 19.0, 19.0)
+
+    planner = DStarLitePlanner(resolution=0.5, allow_diagonal=True)
+    t0 = time.perf_counter()
+    first = planner.plan(world, start, goal)
+    print(f"initial   expansions {first.iterations:6}  {(time.perf_counter() - t0) * 1e3:8.1f} ms")
+
+    for k in range(UPDATES):
+        obs = Sphere(tuple(rng.uniform(0.0, 20.0) for _ in range(3)), rng.uniform(0.5, 1.5))
+        t0 = time.perf_counter()
+        repaired = planner.update(added=[obs])
+        repair = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        scratch = AStarPlanner(resolution=0.5, allow_diagonal=True).plan(planner.world, start, goal)
+        full = time.perf_counter() - t0
+        print(
+            f"update {k:<2} re-expanded {repaired.iterations:6}  {repair * 1e3:8.1f} ms"
+            f"   | A* from scratch {scratch.iterations:6}  {full * 1e3:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
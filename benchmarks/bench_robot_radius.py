@@ -0,0 +1,50 @@
+"""Per-query cost of robot_radius: one-time inflation vs steady-state queries.
+
+Run with: python benchmarks/bench_robot_radius.py [radius] [queries]
+"""
+import random
+import sys
+import time
+
+from motion_planning import AStarPlanner, PRMPlanner, RandomWorld, RRTPlanner
+
+
+def main() -> None:
+    radius = float(sys.argv[1]) if len(sys.argv) > 1 else 0.3
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(24.0, 24.0, 8.0),
+        obstacle_count=60,
+        obstacle_size_range=(0.8, 3.0),
+    )
+    rng = random.Random(0)
+    world = world_gen.generate(rng)
+    inflated = world.inflate(radius)
+    queries = [
+        (world_gen.sample_free_point(inflated, rng), world_gen.sample_free_point(inflated, rng))
+        for _ in range(n)
+    ]
+
+    planners = {
+        "astar": lambda r: AStarPlanner(
+            resolution=0.5, allow_diagonal=True, record_visited="off", robot_radius=r
+        ),
+        "rrt": lambda r: RRTPlanner(step_size=1.0, max_iters=4000, seed=0, robot_radius=r),
+        "prm": lambda r: PRMPlanner(n_samples=2000, seed=0, robot_radius=r),
+    }
+    print(f"{'planner':8} {'radius':>6} {'first ms':>9} {'ms/query':>9} {'solved':>7}")
+    for name, make in planners.items():
+        for r in (0.0, radius):
+            planner = make(r)
+            t0 = time.perf_counter()
+            planner.plan(world, *queries[0])  # inflation, grids and roadmaps are built here
+            first = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            solved = sum(planner.plan(world, s, g).success for s, g in queries)
+            per_query = (time.perf_counter() - t0) / n
+            print(f"{name:8} {r:6.2f} {first * 1e3:9.1f} {per_query * 1e3:9.2f} {solved:7d}")
+
+
+if __name__ == "__main__":
+    main()
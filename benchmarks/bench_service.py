@@ -0,0 +1,69 @@
+"""PlanningService under concurrent load: latency percentiles and coalescing.
+
+Starts the service on a Unix socket in-process, then runs several clients that
+each issue their queries concurrently. Half of every client's queries repeat a
+shared pool, so identical in-flight requests get coalesced.
+
+Run with: python benchmarks/bench_service.py [clients] [queries per client] [workers]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from motion_planning import AStarPlanner, PlanningClient, PlanningService, RandomWorld
+
+
+async def run(clients: int, per_client: int, workers: int) -> None:
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(12.0, 12.0, 12.0),
+        obstacle_count=18,
+        obstacle_size_range=(0.8, 2.2),
+    )
+    rng = random.Random(0)
+    world = world_gen.generate(rng)
+    shared = [world_gen.sample_line_segment(world, rng) for _ in range(per_client // 2)]
+
+    service = PlanningService(
+        AStarPlanner(resolution=0.5, allow_diagonal=True, record_visited="off"), workers=workers
+    )
+    path = os.path.join(tempfile.mkdtemp(), "plan.sock")
+    server = await service.serve(path)
+    conns = [await PlanningClient.connect(path) for _ in range(clients)]
+    world_id = await conns[0].register(world)
+
+    async def client(conn: PlanningClient, seed: int) -> None:
+        local = random.Random(seed)
+        own = [world_gen.sample_line_segment(world, local) for _ in range(per_client - len(shared))]
+        queries = shared + own
+        local.shuffle(queries)
+        await asyncio.gather(*[conn.plan(world_id, s, g) for s, g in queries])
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*[client(conn, i + 1) for i, conn in enumerate(conns)])
+    elapsed = time.perf_counter() - t0
+    stats = await conns[0].stats()
+
+    for conn in conns:
+        await conn.close()
+    server.close()
+    await server.wait_closed()
+    service.close()
+
+    total = clients * per_client
+    print(f"{total} requests, {clients} clients, {workers} workers: {total / elapsed:.1f} req/s")
+    print(f"computed {stats['computed']}  coalesced {stats['coalesced']}")
+    print("latency " + "  ".join(f"{k} {v * 1e3:.1f} ms" for k, v in stats["latency"].items()))
+
+
+def main() -> None:
+    args = [int(a) for a in sys.argv[1:]]
+    clients, per_client, workers = args + [8, 40, os.cpu_count() or 1][len(args):]
+    asyncio.run(run(clients, per_client, workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Point/segment query time vs obstacle count: linear scan vs BVH index.
+
+Run with: python benchmarks/bench_spatial_index.py
+"""
+import random
+import time
+
+from motion_planning import RandomWorld, World
+
+COUNTS = (100, 500, 1000, 2000, 5000)
+QUERIES = 2000
+SIZE = 100.0
+
+
+def main() -> None:
+    print(f"{'obstacles':>9} {'build ms':>9} {'pt lin us':>10} {'pt bvh us':>10} "
+          f"{'seg lin us':>11} {'seg bvh us':>11}")
+    for count in COUNTS:
+        plain = RandomWorld(
+            bounds_min=(0.0, 0.0, 0.0),
+            bounds_max=(SIZE, SIZE, SIZE),
+            obstacle_count=count,
+            obstacle_size_range=(0.5, 3.0),
+        ).generate(random.Random(count))
+        indexed = World(plain.bounds_min, plain.bounds_max, list(plain.obstacles))
+        t0 = time.perf_counter()
+        indexed.build_index()
+        build = time.perf_counter() - t0
+
+        rng = random.Random(0)
+        points = [tuple(rng.uniform(0.0, SIZE) for _ in range(3)) for _ in range(QUERIES)]
+        ends = [tuple(c + rng.uniform(-1.0, 1.0) for c in p) for p in points]
+
+        pt_lin = _time(lambda: [plain.collides(p) for p in points])
+        pt_bvh = _time(lambda: [indexed.collides(p) for p in points])
+        seg_lin = _time(lambda: [plain.path_collides(a, b) for a, b in zip(points, ends)])
+        seg_bvh = _time(lambda: [indexed.path_collides(a, b) for a, b in zip(points, ends)])
+        print(f"{count:>9} {build * 1e3:>9.1f} {pt_lin:>10.2f} {pt_bvh:>10.2f} "
+              f"{seg_lin:>11.2f} {seg_bvh:>11.2f}")
+
+
+def _time(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) / QUERIES * 1e6
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""World generation and free-point sampling: per-obstacle Python vs vectorized.
+
+Run with: python benchmarks/bench_world_generation.py
+"""
+import random
+import time
+
+from motion_planning import RandomWorld
+
+COUNTS = [1_000, 10_000, 100_000]
+SAMPLES = 10_000
+
+
+def main() -> None:
+    print(f"{'obstacles':>9} {'min_gap':>7} {'generate s':>10} {'vectorized s':>12} {'sample s':>9}")
+    for count in COUNTS:
+        side = 10.0 * count ** (1.0 / 3.0)
+        for gap in (None, 0.5):
+            gen = RandomWorld(bounds_max=(side, side, side), obstacle_count=count, min_gap=gap)
+            t0 = time.perf_counter()
+            gen.generate(random.Random(0))
+            scalar = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            world = gen.generate_vectorized(0)
+            vectorized = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            gen.sample_free_points(world, SAMPLES, rng=0)
+            sample = time.perf_counter() - t0
+            print(f"{count:>9} {str(gap):>7} {scalar:>10.2f} {vectorized:>12.2f} {sample:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Seeded benchmark suite with a JSON baseline and regression check.
+
+Every scenario is a fixed-seed RandomWorld plus fixed queries, so repeated runs
+plan exactly the same problems. For each (scenario, planner) pair the suite
+records wall time (best of --repeat), iterations/sec, peak traced memory per
+query and total path cost.
+
+Run with: python benchmarks/suite.py                  # compare against baseline
+          python benchmarks/suite.py --update         # (re)write the baseline
+          python benchmarks/suite.py --threshold 0.5 --only astar
+
+Exits with status 1 when a run is slower or uses more memory than the baseline
+by more than --threshold (fractional), or finds a longer path / fewer solutions.
+Baselines are machine specific; regenerate them on the machine that compares.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from motion_planning import (
+    ARAStarPlanner,
+    AStarPlanner,
+    BidirectionalAStarPlanner,
+    HierarchicalPlanner,
+    JPSPlanner,
+    LazyThetaStarPlanner,
+    PRMPlanner,
+    RandomWorld,
+    RRTPlanner,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    size: float
+    obstacles: int
+    resolution: float
+    queries: int = 4
+    seed: int = 0
+
+
+SCENARIOS = [
+    Scenario("small-open", 10.0, 5, 0.5),
+    Scenario("small-dense", 10.0, 40, 0.5),
+    Scenario("medium-mixed", 20.0, 60, 0.5),
+    Scenario("medium-fine", 20.0, 60, 0.25, queries=2),
+    Scenario("large-sparse", 40.0, 80, 1.0),
+]
+
+PLANNERS: Dict[str, Callable[[float], object]] = {
+    "astar": lambda res: AStarPlanner(resolution=res, record_visited="off"),
+    "astar-diag": lambda res: AStarPlanner(resolution=res, allow_diagonal=True, record_visited="off"),
+    "astar-lazy": lambda res: AStarPlanner(
+        resolution=res, allow_diagonal=True, lazy_edges=True, record_visited="off"
+    ),
+    "jps": lambda res: JPSPlanner(resolution=res, record_visited="off"),
+    "bidir-diag": lambda res: BidirectionalAStarPlanner(
+        resolution=res, allow_diagonal=True, record_visited="off"
+    ),
+    "ara": lambda res: ARAStarPlanner(resolution=res, record_visited="off"),
+    "lazy-theta": lambda res: LazyThetaStarPlanner(resolution=res, record_visited="off"),
+    "hierarchical": lambda res: HierarchicalPlanner(resolution=res, record_visited="off"),
+    "rrt": lambda res: RRTPlanner(step_size=2 * res, max_iters=4000, seed=0),
+    "prm": lambda res: PRMPlanner(n_samples=2000, seed=0),
+}
+
+
+def build(scenario: Scenario):
+    world_gen = RandomWorld(
+        bounds_max=(scenario.size,) * 3,
+        obstacle_count=scenario.obstacles,
+        obstacle_size_range=(1.0, max(1.5, scenario.size / 8)),
+    )
+    rng = random.Random(scenario.seed)
+    world = world_gen.generate(rng)
+    queries = [world_gen.sample_line_segment(world, rng) for _ in range(scenario.queries)]
+    return world, queries
+
+
+def path_cost(path) -> float:
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def measure(planner, world, queries, repeat: int) -> Dict[str, float]:
+    # Warm per-world caches first; the suite tracks steady-state query cost.
+    for start, goal in queries:
+        planner.plan(world, start, goal)
+
+    best = float("inf")
+    for _ in range(repeat):
+        iterations = solved = 0
+        cost = 0.0
+        gc.collect()
+        t0 = time.perf_counter()
+        for start, goal in queries:
+            result = planner.plan(world, start, goal)
+            iterations += result.iterations
+            solved += result.success
+            cost += path_cost(result.path)
+        best = min(best, time.perf_counter() - t0)
+
+    # Memory is traced in a separate pass so tracemalloc does not skew timings;
+    # peak is the largest single query, with garbage collected in between.
+    peak = 0
+    tracemalloc.start()
+    for start, goal in queries:
+        gc.collect()
+        tracemalloc.reset_peak()
+        planner.plan(world, start, goal)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    return {
+        "wall_s": best,
+        "iterations": iterations,
+        "iters_per_s": iterations / best if best > 0 else 0.0,
+        "peak_kib": peak / 1024,
+        "path_cost": cost,
+        "solved": solved,
+    }
+
+
+def run(only: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    print(
+        f"{'scenario':14} {'planner':13} {'solved':>6} {'ms':>9} {'iters/s':>10} "
+        f"{'peak KiB':>9} {'cost':>9}"
+    )
+    for scenario in SCENARIOS:
+        world, queries = build(scenario)
+        for label, factory in PLANNERS.items():
+            if only and label not in only and scenario.name not in only:
+                continue
+            stats = measure(factory(scenario.resolution), world, queries, repeat)
+            results[f"{scenario.name}/{label}"] = stats
+            print(
+                f"{scenario.name:14} {label:13} {stats['solved']:>6} "
+                f"{stats['wall_s'] * 1e3:>9.1f} {stats['iters_per_s']:>10.0f} "
+                f"{stats['peak_kib']:>9.0f} {stats['path_cost']:>9.2f}"
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    problems = []
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        for metric in ("wall_s", "peak_kib"):
+            if before[metric] > 0 and now[metric] > before[metric] * (1 + threshold):
+                problems.append(
+                    f"{key}: {metric} {before[metric]:.4g} -> {now[metric]:.4g} "
+                    f"(+{now[metric] / before[metric] - 1:.0%})"
+                )
+        if now["solved"] < before["solved"]:
+            problems.append(f"{key}: solved {before['solved']} -> {now['solved']}")
+        elif now["path_cost"] > before["path_cost"] * (1 + 1e-6) + 1e-9:
+            problems.append(
+                f"{key}: path_cost {before['path_cost']:.4f} -> {now['path_cost']:.4f}"
+            )
+    return problems
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional slowdown")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repetitions (best is kept)")
+    parser.add_argument("--only", nargs="*", default=[], help="planner or scenario names")
+    args = parser.parse_args(argv)
+
+    results = run(args.only, max(1, args.repeat))
+
+    if args.update or not args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    problems = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    for line in problems:
+        print(f"REGRESSION {line}")
+    if problems:
+        return 1
+    print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
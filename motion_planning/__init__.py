@@ -1,8 +1,22 @@
 from .settings.types import Box, Point3, Sphere, World
 from .settings.env import RandomWorld
+from .settings.scene import Scene, load_scene, load_world, save_scene
 from .settings.visualize import plot_world
+from .planners.ara import ARAStarPlanner, AnytimeResult
 from .planners.astar import AStarPlanner
-from .planners.base import PlanResult, Planner
+from .planners.base import PlanResult, Planner, VisitedNodes
+from .planners.bidirectional import BidirectionalAStarPlanner
+from .planners.cost_to_go import CostToGoField, clear_cost_to_go_cache, cost_to_go_field
+from .planners.dstar_lite import DStarLitePlanner
+from .planners.hierarchical import HierarchicalPlanner, HierarchicalResult
+from .planners.jps import JPSPlanner
+from .planners.parallel import plan_all, plan_many
+from .planners.prm import PRMPlanner, Roadmap, build_roadmap, clear_roadmap_cache, load_roadmap
+from .planners.rrt import RRTPlanner
+from .planners.service import PlanningClient, PlanningService
+from .planners.smoothing import SmoothedResult, shortcut_path
+from .planners.stats import PlanStats, add_stats_hook, remove_stats_hook
+from .planners.theta import LazyThetaStarPlanner
 from .modules.grid import Grid3D, GridIndex
 
 __all__ = [
@@ -11,10 +25,41 @@ __all__ = [
     "Sphere",
     "World",
     "RandomWorld",
+    "Scene",
+    "load_scene",
+    "load_world",
+    "save_scene",
     "plot_world",
+    "ARAStarPlanner",
     "AStarPlanner",
+    "BidirectionalAStarPlanner",
+    "DStarLitePlanner",
+    "HierarchicalPlanner",
+    "JPSPlanner",
+    "LazyThetaStarPlanner",
+    "PRMPlanner",
+    "RRTPlanner",
+    "AnytimeResult",
+    "CostToGoField",
+    "HierarchicalResult",
     "PlanResult",
+    "PlanStats",
     "Planner",
+    "PlanningClient",
+    "PlanningService",
+    "Roadmap",
+    "SmoothedResult",
+    "VisitedNodes",
+    "add_stats_hook",
+    "build_roadmap",
+    "clear_cost_to_go_cache",
+    "clear_roadmap_cache",
+    "cost_to_go_field",
+    "load_roadmap",
+    "plan_all",
+    "plan_many",
+    "remove_stats_hook",
+    "shortcut_path",
     "Grid3D",
     "GridIndex",
 ]
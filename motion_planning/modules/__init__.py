@@ -1,7 +1,39 @@
 from .grid import Grid3D, GridIndex
+from .cache import CacheInfo, LRUCache
+from .distance_field import (
+    DistanceField,
+    clear_distance_field_cache,
+    seed_distance_field_cache,
+)
+from .flat import FlatGrid, clear_flat_cache, seed_flat_cache
+from .hashgrid import AABBHash, clear_world_hash_cache
+from .neighbors import BucketIndex
+from .occupancy import clear_occupancy_cache, rasterize, seed_occupancy_cache
+from .octree import OccupancyOctree, clear_octree_cache
+from .spatial import ObstacleBVH
+from .validity import ValidityCache, clear_validity_cache
 
 __all__ = [
     "Grid3D",
     "GridIndex",
+    "AABBHash",
+    "BucketIndex",
+    "CacheInfo",
+    "DistanceField",
+    "FlatGrid",
+    "LRUCache",
+    "ObstacleBVH",
+    "OccupancyOctree",
+    "ValidityCache",
+    "clear_distance_field_cache",
+    "clear_flat_cache",
+    "clear_occupancy_cache",
+    "clear_octree_cache",
+    "clear_validity_cache",
+    "clear_world_hash_cache",
+    "rasterize",
+    "seed_distance_field_cache",
+    "seed_flat_cache",
+    "seed_occupancy_cache",
 ]
 
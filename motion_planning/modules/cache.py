@@ -0,0 +1,110 @@
+# world 단위 precomputation 을 재사용하기 위한 작은 LRU cache
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class LRUCache(Generic[V]):
+    # Bounded by entry count, and optionally by total weight (e.g. bytes) as
+    # measured by weigh(value); the newest entry is always kept.
+    def __init__(
+        self,
+        maxsize: int = 16,
+        max_weight: int | None = None,
+        weigh: Callable[[V], int] | None = None,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if (max_weight is None) != (weigh is None):
+            raise ValueError("max_weight and weigh must be given together")
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self._weigh = weigh
+        self.weight = 0
+        self._data: OrderedDict[Hashable, V] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Shared by PlanningService worker threads.
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: V | None = None) -> V | None:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._insert(key, value)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], V]) -> V:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return value
+        # Built outside the lock so slow factories do not serialize other keys;
+        # if another thread stored the key meanwhile, its value wins.
+        value = factory()
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._insert(key, value)
+        return value
+
+    def _insert(self, key: Hashable, value: V) -> None:
+        # Caller holds the lock.
+        weigh = self._weigh
+        if weigh is not None:
+            if key in self._data:
+                self.weight -= weigh(self._data[key])
+            self.weight += weigh(value)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize or (
+            weigh is not None and self.weight > self.max_weight and len(self._data) > 1
+        ):
+            _, old = self._data.popitem(last=False)
+            if weigh is not None:
+                self.weight -= weigh(old)
+            self.evictions += 1
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._data), self.maxsize)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,139 @@
+# 격자 점 단위 Euclidean signed distance field (ESDF). 한 번 계산해두고 O(1) 으로 조회
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Tuple
+
+import numpy as np
+
+from ..settings.types import Point3
+from .cache import LRUCache
+
+if TYPE_CHECKING:
+    from .grid import Grid3D
+
+_FIELD_CACHE: LRUCache["DistanceField"] = LRUCache(maxsize=8)
+
+# Stand-in for "no site on this line"; big enough to never win, small enough
+# that sums of three axis passes stay finite.
+_FAR = 1e20
+
+
+class DistanceField:
+    # Signed distance in world units from each grid point to the nearest grid
+    # point of the other kind: positive in free space (distance to the nearest
+    # occupied point), negative inside obstacles (minus distance to free space).
+    # Distances are between grid points, so the true obstacle surface can be
+    # up to half a cell diagonal closer than clearance() reports.
+    def __init__(self, grid: "Grid3D", sdf: np.ndarray | None = None) -> None:
+        self.grid = grid
+        self._gradient: Tuple[np.ndarray, ...] | None = None
+        self._masks: Dict[float, bytes] = {}
+        if sdf is not None:
+            # Precomputed field, e.g. memory-mapped from a scene file.
+            if sdf.shape != grid.dims():
+                raise ValueError(f"field shape {sdf.shape} does not match grid {grid.dims()}")
+            self.sdf = sdf
+            return
+        occ = grid.occupancy()
+        res = grid.resolution
+        outside = np.sqrt(edt_squared(occ)) * res
+        if occ.any():
+            inside = np.sqrt(edt_squared(~occ)) * res
+            sdf = np.where(occ, -inside, outside)
+        else:
+            sdf = np.full(occ.shape, np.inf)
+        sdf.setflags(write=False)
+        self.sdf = sdf
+
+    def clearance(self, p: Point3) -> float:
+        return float(self.sdf[self.grid.to_index(self.grid.snap(p))])
+
+    def gradient(self, p: Point3) -> Point3:
+        # Central-difference gradient of the field at the nearest grid point.
+        if self._gradient is None:
+            finite = np.where(np.isfinite(self.sdf), self.sdf, 0.0)
+            axes = [k for k in range(3) if finite.shape[k] > 1]
+            grads = [np.zeros_like(finite) for _ in range(3)]
+            if axes:
+                computed = np.gradient(finite, self.grid.resolution, axis=axes)
+                if len(axes) == 1:
+                    computed = [computed]
+                for k, g in zip(axes, computed):
+                    grads[k] = g
+            self._gradient = tuple(grads)
+        idx = self.grid.to_index(self.grid.snap(p))
+        gx, gy, gz = self._gradient
+        return (float(gx[idx]), float(gy[idx]), float(gz[idx]))
+
+    def blocked_below(self, margin: float) -> bytes:
+        # FlatGrid-shaped blocked mask that also closes cells with clearance < margin.
+        mask = self._masks.get(margin)
+        if mask is None:
+            padded = np.pad(self.sdf < margin, 1, constant_values=True)
+            mask = padded.astype(np.uint8).tobytes()
+            self._masks[margin] = mask
+        return mask
+
+
+def distance_field(grid: "Grid3D") -> DistanceField:
+    key = (grid.world.fingerprint(), grid.resolution)
+    return _FIELD_CACHE.get_or_create(key, lambda: DistanceField(grid))
+
+
+def seed_distance_field_cache(field: DistanceField) -> None:
+    _FIELD_CACHE.put((field.grid.world.fingerprint(), field.grid.resolution), field)
+
+
+def clear_distance_field_cache() -> None:
+    _FIELD_CACHE.clear()
+
+
+def edt_squared(sites: np.ndarray) -> np.ndarray:
+    # Exact squared Euclidean distance (in cells) to the nearest True cell, using
+    # the separable linear-time transform of Felzenszwalb & Huttenlocher; every
+    # line of an axis is processed at once.
+    d = np.where(sites, 0.0, _FAR)
+    for axis in range(sites.ndim):
+        d = np.moveaxis(_edt_1d(np.moveaxis(d, axis, -1)), -1, axis)
+    return np.where(d >= _FAR, np.inf, d)
+
+
+def _edt_1d(f: np.ndarray) -> np.ndarray:
+    shape = f.shape
+    n = shape[-1]
+    f = np.ascontiguousarray(f).reshape(-1, n)
+    lines = f.shape[0]
+    rows = np.arange(lines)
+    # Lower envelope of parabolas: vertex positions v and boundaries z per line.
+    v = np.zeros((lines, n), dtype=np.int64)
+    z = np.empty((lines, n + 1))
+    z[:, 0] = -np.inf
+    z[:, 1] = np.inf
+    k = np.zeros(lines, dtype=np.int64)
+    for q in range(1, n):
+        fq = f[:, q] + q * q
+        active = rows
+        s = np.empty(lines)
+        while active.size:
+            vk = v[active, k[active]]
+            s_active = (fq[active] - (f[active, vk] + vk * vk)) / (2.0 * (q - vk))
+            s[active] = s_active
+            pop = s_active <= z[active, k[active]]
+            active = active[pop]
+            k[active] -= 1
+        k += 1
+        v[rows, k] = q
+        z[rows, k] = s
+        z[rows, k + 1] = np.inf
+
+    out = np.empty_like(f)
+    k[:] = 0
+    for q in range(n):
+        while True:
+            step = z[rows, k + 1] < q
+            if not step.any():
+                break
+            k[step] += 1
+        vk = v[rows, k]
+        out[:, q] = (q - vk) ** 2 + f[rows, vk]
+    return out.reshape(shape)
@@ -0,0 +1,138 @@
+# grid planner 용 flat integer node id 공간. 테두리를 한 칸 padding 해서 bounds check 를 없앰
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+from ..settings.types import Point3, distance
+from .cache import LRUCache
+from .occupancy import axis_coords, axis_span, occupancy
+
+if TYPE_CHECKING:
+    from .grid import Grid3D, GridIndex
+
+_FLAT_CACHE: LRUCache["FlatGrid"] = LRUCache(maxsize=16)
+
+# Neighbor offsets for the 6- and 26-connected cases.
+_AXIS_OFFSETS = ((-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1))
+_ALL_OFFSETS = tuple(
+    (dx, dy, dz)
+    for dx in (-1, 0, 1)
+    for dy in (-1, 0, 1)
+    for dz in (-1, 0, 1)
+    if not dx == dy == dz == 0
+)
+
+
+@dataclass(frozen=True)
+class FlatGrid:
+    grid: "Grid3D"
+    dims: "GridIndex"
+    # Padded strides: id = (ix + 1) * stride_x + (iy + 1) * stride_y + (iz + 1).
+    stride_x: int
+    stride_y: int
+    size: int
+    # 1 for occupied or border cells.
+    blocked: bytes
+    # 1 where an edge to a neighbor may touch an obstacle; an edge is free if
+    # either end is 0.
+    near: bytes
+    xs: List[float]
+    ys: List[float]
+    zs: List[float]
+
+    def to_id(self, idx: "GridIndex") -> int:
+        return (idx[0] + 1) * self.stride_x + (idx[1] + 1) * self.stride_y + idx[2] + 1
+
+    def to_index(self, node: int) -> "GridIndex":
+        ix, rest = divmod(node, self.stride_x)
+        iy, iz = divmod(rest, self.stride_y)
+        return (ix - 1, iy - 1, iz - 1)
+
+    def to_point(self, node: int) -> Point3:
+        ix, rest = divmod(node, self.stride_x)
+        iy, iz = divmod(rest, self.stride_y)
+        return (self.xs[ix - 1], self.ys[iy - 1], self.zs[iz - 1])
+
+    def neighbors(self, allow_diagonal: bool) -> List[Tuple[int, float]]:
+        # (id delta, edge cost) per neighbor offset.
+        return [(self.offset_id(o), c) for o, c in self.offsets(allow_diagonal)]
+
+    def offsets(self, allow_diagonal: bool) -> List[Tuple[Tuple[int, int, int], float]]:
+        return grid_offsets(self.grid.resolution, allow_diagonal)
+
+    def offset_id(self, o: Tuple[int, int, int]) -> int:
+        return o[0] * self.stride_x + o[1] * self.stride_y + o[2]
+
+
+def grid_offsets(res: float, allow_diagonal: bool) -> List[Tuple[Tuple[int, int, int], float]]:
+    # (index offset, edge cost) per neighbor for the 6- or 26-connected lattice.
+    table = _ALL_OFFSETS if allow_diagonal else _AXIS_OFFSETS
+    return [(o, distance((0.0, 0.0, 0.0), (o[0] * res, o[1] * res, o[2] * res))) for o in table]
+
+
+def flat_grid(grid: "Grid3D") -> FlatGrid:
+    key = (grid.world.fingerprint(), grid.resolution)
+    return _FLAT_CACHE.get_or_create(key, lambda: build_flat_grid(grid))
+
+
+def seed_flat_cache(flat: FlatGrid) -> None:
+    # Install a FlatGrid built elsewhere, e.g. shipped to a worker process.
+    _FLAT_CACHE.put((flat.grid.world.fingerprint(), flat.grid.resolution), flat)
+
+
+def clear_flat_cache() -> None:
+    _FLAT_CACHE.clear()
+
+
+def build_flat_grid(grid: "Grid3D") -> FlatGrid:
+    blocked = np.pad(occupancy(grid), 1, constant_values=True)
+    near = np.pad(_near_obstacles(grid), 1, constant_values=True)
+    return flat_from_masks(
+        grid, blocked.astype(np.uint8).tobytes(), near.astype(np.uint8).tobytes()
+    )
+
+
+def flat_from_masks(grid: "Grid3D", blocked: bytes, near: bytes) -> FlatGrid:
+    # Wrap padded masks computed elsewhere (e.g. shipped to a worker process)
+    # without re-rasterizing; the rest of the FlatGrid is cheap to derive.
+    dims = grid.dims()
+    xs, ys, zs = axis_coords(grid)
+    return FlatGrid(
+        grid=grid,
+        dims=dims,
+        stride_x=(dims[1] + 2) * (dims[2] + 2),
+        stride_y=dims[2] + 2,
+        size=len(blocked),
+        blocked=blocked,
+        near=near,
+        xs=xs.tolist(),
+        ys=ys.tolist(),
+        zs=zs.tolist(),
+    )
+
+
+def _near_obstacles(grid: "Grid3D") -> np.ndarray:
+    # A segment to any 26-neighbor stays inside [p - res, p + res]; nodes whose box
+    # misses every obstacle AABB (with a small margin) can skip edge checks.
+    xs, ys, zs = axis_coords(grid)
+    pad = near_pad(grid)
+    near = np.zeros((len(xs), len(ys), len(zs)), dtype=bool)
+    for obs in grid.world.obstacles:
+        mn, mx = obs.aabb()
+        near[
+            axis_span(xs, mn[0] - pad, mx[0] + pad),
+            axis_span(ys, mn[1] - pad, mx[1] + pad),
+            axis_span(zs, mn[2] - pad, mx[2] + pad),
+        ] = True
+    return near
+
+
+def near_pad(grid: "Grid3D") -> float:
+    # How far past an obstacle AABB a node still counts as near: one cell plus a
+    # margin that absorbs rounding in the segment tests.
+    world = grid.world
+    scale = 1.0 + max(abs(c) for c in world.bounds_min + world.bounds_max)
+    return grid.resolution + 1e-6 * scale
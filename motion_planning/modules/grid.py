@@ -4,7 +4,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Tuple
 
+import numpy as np
+
 from ..settings.types import Point3, World, clamp_point
+from .flat import FlatGrid, flat_grid
+from .distance_field import DistanceField, distance_field
+from .occupancy import occupancy
+from .octree import OccupancyOctree, octree
+from .validity import ValidityCache, validity_cache
 
 GridIndex = Tuple[int, int, int]
 
@@ -44,3 +51,23 @@ class Grid3D:
             self.world.bounds_min[1] + idx[1] * self.resolution,
             self.world.bounds_min[2] + idx[2] * self.resolution,
         )
+
+    # 격자 점 단위 occupancy array. (world, resolution) 별로 cache 됨
+    def occupancy(self) -> np.ndarray:
+        return occupancy(self)
+
+    # padding 된 flat node id 공간. 역시 (world, resolution) 별로 cache 됨
+    def flat(self) -> FlatGrid:
+        return flat_grid(self)
+
+    # plan 호출 사이에 공유되는 node/edge 충돌 결과 cache
+    def validity_cache(self) -> ValidityCache:
+        return validity_cache(self)
+
+    # 장애물까지의 signed distance field (ESDF). clearance/gradient 조회는 O(1)
+    def distance_field(self) -> DistanceField:
+        return distance_field(self)
+
+    # dense grid 를 만들지 않는 sparse octree occupancy. 큰 world 용, 역시 cache 됨
+    def octree(self) -> OccupancyOctree:
+        return octree(self)
@@ -0,0 +1,146 @@
+# AABB 들을 uniform cell 에 넣어두고 점/박스 후보 쌍을 numpy 로 한꺼번에 찾는 spatial hash
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from ..settings.types import World
+from .cache import LRUCache
+
+Pairs = Tuple[np.ndarray, np.ndarray]
+
+
+class AABBHash:
+    # Every box is binned into each cell it overlaps, so a query only has to
+    # look at its own cells. Queries return candidate (query, box) index pairs;
+    # callers run the exact test on those pairs.
+    def __init__(self, box_min: np.ndarray, box_max: np.ndarray, cell_size: float) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.box_min = np.asarray(box_min, dtype=np.float64).reshape(-1, 3)
+        self.box_max = np.asarray(box_max, dtype=np.float64).reshape(-1, 3)
+        self.cell_size = float(cell_size)
+        if len(self.box_min):
+            self.origin = self.box_min.min(axis=0)
+            top = self.box_max.max(axis=0)
+        else:
+            self.origin = top = np.zeros(3)
+        self.dims = np.floor((top - self.origin) / self.cell_size).astype(np.int64) + 1
+        owner, keys = self._bin(self.box_min, self.box_max)
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._owner = owner[order]
+
+    def __len__(self) -> int:
+        return len(self.box_min)
+
+    def query_points(self, points: np.ndarray) -> Pairs:
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        cells = self._cells(points)
+        inside = ((cells >= 0) & (cells < self.dims)).all(axis=1)
+        query = np.flatnonzero(inside)
+        return self._lookup(query, self._key(cells[inside]))
+
+    def query_boxes(self, box_min: np.ndarray, box_max: np.ndarray) -> Pairs:
+        # Unique (query, box) pairs whose cells overlap; AABBs may still be disjoint.
+        query, keys = self._bin(box_min, box_max)
+        q, b = self._lookup(query, keys)
+        if len(q) == 0:
+            return q, b
+        code = np.unique(q * max(len(self), 1) + b)
+        return code // max(len(self), 1), code % max(len(self), 1)
+
+    def _cells(self, p: np.ndarray) -> np.ndarray:
+        return np.floor((p - self.origin) / self.cell_size).astype(np.int64)
+
+    def _key(self, cells: np.ndarray) -> np.ndarray:
+        return (cells[:, 0] * self.dims[1] + cells[:, 1]) * self.dims[2] + cells[:, 2]
+
+    def _bin(self, box_min: np.ndarray, box_max: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Expand each box into the keys of all cells it covers (clipped to the hash).
+        box_min = np.asarray(box_min, dtype=np.float64).reshape(-1, 3)
+        box_max = np.asarray(box_max, dtype=np.float64).reshape(-1, 3)
+        lo = np.clip(self._cells(box_min), 0, self.dims - 1)
+        hi = np.clip(self._cells(box_max), 0, self.dims - 1)
+        # Boxes entirely outside the hash cover nothing.
+        outside = ((self._cells(box_max) < 0) | (self._cells(box_min) >= self.dims)).any(axis=1)
+        span = np.where(outside[:, None], 0, hi - lo + 1)
+        counts = span.prod(axis=1)
+        owner = np.repeat(np.arange(len(box_min)), counts)
+        if len(owner) == 0:
+            return owner, owner
+        local = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+        sy, sz = span[owner, 1], span[owner, 2]
+        cells = lo[owner] + np.stack(
+            [local // (sy * sz), (local // sz) % sy, local % sz], axis=1
+        )
+        return owner, self._key(cells)
+
+    def _lookup(self, query: np.ndarray, keys: np.ndarray) -> Pairs:
+        lo = np.searchsorted(self._keys, keys, side="left")
+        hi = np.searchsorted(self._keys, keys, side="right")
+        counts = hi - lo
+        q = np.repeat(query, counts)
+        if len(q) == 0:
+            return q, q
+        local = np.arange(len(q)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return q, self._owner[np.repeat(lo, counts) + local]
+
+
+_WORLD_HASH: LRUCache[AABBHash] = LRUCache(maxsize=4)
+
+
+def world_hash(world: World) -> AABBHash:
+    # Hash over the packed obstacles: box AABBs first, then sphere AABBs (padded like
+    # ObstacleBVH so rounding in the distance test never escapes the box).
+    def build() -> AABBHash:
+        packed = world._packed_obstacles()
+        reach = packed.radius[:, None] + 1e-9
+        grow = 0.0 if packed.box_rounding is None else packed.box_rounding[:, None] + 1e-9
+        box_min = np.concatenate([packed.box_min - grow, packed.center - reach])
+        box_max = np.concatenate([packed.box_max + grow, packed.center + reach])
+        return AABBHash(box_min, box_max, _cell_size(world, box_max - box_min))
+
+    return _WORLD_HASH.get_or_create(world.fingerprint(), build)
+
+
+def points_collide(world: World, points: np.ndarray) -> np.ndarray:
+    # Same answers as World.collides_many, but only tests obstacles sharing a cell.
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    hits = np.zeros(len(points), dtype=bool)
+    if len(points) == 0 or not world.obstacles:
+        return hits
+    packed = world._packed_obstacles()
+    q, b = world_hash(world).query_points(points)
+    p = points[q]
+    n_box = len(packed.box_min)
+    is_box = b < n_box
+    bi = b[is_box]
+    inside = np.zeros(len(q), dtype=bool)
+    if packed.box_rounding is None:
+        inside[is_box] = (
+            (packed.box_min[bi] <= p[is_box]) & (p[is_box] <= packed.box_max[bi])
+        ).all(axis=1)
+    else:
+        pb = p[is_box]
+        excess = np.maximum(np.maximum(packed.box_min[bi] - pb, pb - packed.box_max[bi]), 0.0)
+        inside[is_box] = (excess * excess).sum(axis=1) <= packed.box_rounding[bi] ** 2
+    si = b[~is_box] - n_box
+    d = packed.center[si] - p[~is_box]
+    dist = np.sqrt(d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1] + d[:, 2] * d[:, 2])
+    inside[~is_box] = dist <= packed.radius[si]
+    hits[q[inside]] = True
+    return hits
+
+
+def clear_world_hash_cache() -> None:
+    _WORLD_HASH.clear()
+
+
+def _cell_size(world: World, extent: np.ndarray) -> float:
+    # Roughly one obstacle per cell, but never smaller than most obstacles.
+    volume = float(np.prod(np.subtract(world.bounds_max, world.bounds_min)))
+    per_obstacle = (max(volume, 1e-12) / max(len(extent), 1)) ** (1.0 / 3.0)
+    typical = float(np.percentile(extent.max(axis=1), 90)) if len(extent) else 0.0
+    return max(per_obstacle, typical, 1e-9)
@@ -0,0 +1,100 @@
+# 점 집합을 uniform bucket 으로 나눠 nearest / radius query 를 빠르게 하는 index
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from ..settings.types import Point3
+
+Cell = Tuple[int, int, int]
+
+
+class BucketIndex:
+    # Points are appended incrementally and never removed; ids are insertion order.
+    def __init__(self, cell_size: float, origin: Point3 = (0.0, 0.0, 0.0)) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self.origin = origin
+        self.points: List[Point3] = []
+        self._buckets: Dict[Cell, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def add(self, p: Point3) -> int:
+        i = len(self.points)
+        self.points.append(p)
+        self._buckets.setdefault(self._cell(p), []).append(i)
+        return i
+
+    def nearest(self, q: Point3) -> int:
+        if not self.points:
+            raise ValueError("index is empty")
+        cx, cy, cz = self._cell(q)
+        best, best_d2 = -1, float("inf")
+        k = 0
+        while True:
+            # A ring wider than the point count is cheaper to replace with a scan.
+            if (2 * k + 1) ** 3 > 8 * len(self.points):
+                return self._scan(q)
+            for cell in _ring(cx, cy, cz, k):
+                for i in self._buckets.get(cell, ()):
+                    d2 = _dist2(self.points[i], q)
+                    if d2 < best_d2:
+                        best, best_d2 = i, d2
+            # Anything in ring k + 1 is at least k cells away.
+            reach = k * self.cell_size
+            if best >= 0 and best_d2 <= reach * reach:
+                return best
+            k += 1
+
+    def within(self, q: Point3, radius: float) -> List[int]:
+        r2 = radius * radius
+        lo = self._cell((q[0] - radius, q[1] - radius, q[2] - radius))
+        hi = self._cell((q[0] + radius, q[1] + radius, q[2] + radius))
+        span = (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+        if span > len(self._buckets):
+            return [i for i, p in enumerate(self.points) if _dist2(p, q) <= r2]
+        out: List[int] = []
+        for x in range(lo[0], hi[0] + 1):
+            for y in range(lo[1], hi[1] + 1):
+                for z in range(lo[2], hi[2] + 1):
+                    for i in self._buckets.get((x, y, z), ()):
+                        if _dist2(self.points[i], q) <= r2:
+                            out.append(i)
+        return out
+
+    def _scan(self, q: Point3) -> int:
+        best, best_d2 = -1, float("inf")
+        for i, p in enumerate(self.points):
+            d2 = _dist2(p, q)
+            if d2 < best_d2:
+                best, best_d2 = i, d2
+        return best
+
+    def _cell(self, p: Point3) -> Cell:
+        s = self.cell_size
+        o = self.origin
+        return (int((p[0] - o[0]) // s), int((p[1] - o[1]) // s), int((p[2] - o[2]) // s))
+
+
+def _ring(cx: int, cy: int, cz: int, k: int):
+    # Cells at Chebyshev distance exactly k from (cx, cy, cz).
+    if k == 0:
+        yield (cx, cy, cz)
+        return
+    for dx in range(-k, k + 1):
+        for dy in range(-k, k + 1):
+            if abs(dx) == k or abs(dy) == k:
+                for dz in range(-k, k + 1):
+                    yield (cx + dx, cy + dy, cz + dz)
+            else:
+                yield (cx + dx, cy + dy, cz - k)
+                yield (cx + dx, cy + dy, cz + k)
+
+
+def _dist2(a: Point3, b: Point3) -> float:
+    dx = a[0] - b[0]
+    dy = a[1] - b[1]
+    dz = a[2] - b[2]
+    return dx * dx + dy * dy + dz * dz
@@ -0,0 +1,91 @@
+# World 를 격자 점 단위의 dense boolean occupancy array 로 rasterize 하는 module
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+
+from ..settings.types import Box, Sphere, World
+from .cache import LRUCache
+
+if TYPE_CHECKING:
+    from .grid import Grid3D
+
+_OCCUPANCY_CACHE: LRUCache[np.ndarray] = LRUCache(maxsize=16)
+
+
+def axis_coords(grid: "Grid3D") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Same arithmetic as Grid3D.to_point so lookups agree with World.collides exactly.
+    dims = grid.dims()
+    mn = grid.world.bounds_min
+    return tuple(  # type: ignore[return-value]
+        mn[i] + np.arange(dims[i], dtype=np.float64) * grid.resolution for i in range(3)
+    )
+
+
+def rasterize(grid: "Grid3D") -> np.ndarray:
+    xs, ys, zs = axis_coords(grid)
+    occ = np.zeros((len(xs), len(ys), len(zs)), dtype=bool)
+    for obs in grid.world.obstacles:
+        if isinstance(obs, Box):
+            _fill_box(occ, xs, ys, zs, obs)
+        else:
+            _fill_sphere(occ, xs, ys, zs, obs)
+    occ.setflags(write=False)
+    return occ
+
+
+def occupancy(grid: "Grid3D") -> np.ndarray:
+    key = (grid.world.fingerprint(), grid.resolution)
+    return _OCCUPANCY_CACHE.get_or_create(key, lambda: rasterize(grid))
+
+
+def seed_occupancy_cache(grid: "Grid3D", occ: np.ndarray) -> None:
+    # Install an occupancy array computed elsewhere (e.g. loaded from a scene file).
+    if occ.shape != grid.dims():
+        raise ValueError(f"occupancy shape {occ.shape} does not match grid {grid.dims()}")
+    _OCCUPANCY_CACHE.put((grid.world.fingerprint(), grid.resolution), occ)
+
+
+def clear_occupancy_cache() -> None:
+    _OCCUPANCY_CACHE.clear()
+
+
+def _fill_box(occ: np.ndarray, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, box: Box) -> None:
+    # Axis coordinates are sorted, so the covered cells form one contiguous slab.
+    mn, mx, r = box.min_corner, box.max_corner, box.rounding
+    if r <= 0:
+        sx = axis_span(xs, mn[0], mx[0])
+        sy = axis_span(ys, mn[1], mx[1])
+        sz = axis_span(zs, mn[2], mx[2])
+        occ[sx, sy, sz] = True
+        return
+    # Rounded box: the grown slab, then the distance to the core box per cell.
+    spans = [axis_span(c, mn[k] - r, mx[k] + r, pad=1) for k, c in enumerate((xs, ys, zs))]
+    ex, ey, ez = (
+        np.maximum(np.maximum(mn[k] - c[spans[k]], c[spans[k]] - mx[k]), 0.0)
+        for k, c in enumerate((xs, ys, zs))
+    )
+    d2 = (ex * ex)[:, None, None] + (ey * ey)[None, :, None] + (ez * ez)[None, None, :]
+    occ[spans[0], spans[1], spans[2]] |= d2 <= r * r
+
+
+def _fill_sphere(
+    occ: np.ndarray, xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, sphere: Sphere
+) -> None:
+    cx, cy, cz = sphere.center
+    r = sphere.radius
+    # Pad the bounding slab by one cell so rounding at the rim never drops a cell.
+    sx = axis_span(xs, cx - r, cx + r, pad=1)
+    sy = axis_span(ys, cy - r, cy + r, pad=1)
+    sz = axis_span(zs, cz - r, cz + r, pad=1)
+    dx = (cx - xs[sx])[:, None, None]
+    dy = (cy - ys[sy])[None, :, None]
+    dz = (cz - zs[sz])[None, None, :]
+    occ[sx, sy, sz] |= np.sqrt(dx * dx + dy * dy + dz * dz) <= r
+
+
+def axis_span(coords: np.ndarray, lo: float, hi: float, pad: int = 0) -> slice:
+    start = int(np.searchsorted(coords, lo, side="left")) - pad
+    stop = int(np.searchsorted(coords, hi, side="right")) + pad
+    return slice(max(start, 0), min(stop, len(coords)))
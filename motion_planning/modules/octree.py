@@ -0,0 +1,346 @@
+# dense grid 없이 World 를 sparse octree 로 표현하는 occupancy module (OctoMap 방식)
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+from ..settings.types import Box, Point3, segments_intersect_aabbs
+from .cache import LRUCache
+from .flat import grid_offsets, near_pad
+
+if TYPE_CHECKING:
+    from .grid import Grid3D, GridIndex
+
+# Cell states, ordered so that state >= NEAR means "edges here need a check".
+FREE, NEAR, OCCUPIED = 0, 1, 2
+# Leaf values at or above _BRICK index OccupancyOctree.bricks.
+_BRICK = 3
+
+_OCTREE_CACHE: LRUCache["OccupancyOctree"] = LRUCache(maxsize=16)
+
+
+class OccupancyOctree:
+    # Same lattice, ids and cell states as FlatGrid (OCCUPIED == blocked,
+    # state >= NEAR == near), but stored as an octree: uniform blocks of any
+    # size are single leaves and only blocks straddling an obstacle surface
+    # (or the edge of its near band) are refined, down to dense brick x brick
+    # x brick leaves. Memory follows obstacle surface area, not world volume.
+    def __init__(self, grid: "Grid3D", brick: int = 8) -> None:
+        if brick < 1 or brick & (brick - 1):
+            raise ValueError("brick must be a power of two")
+        world = grid.world
+        self.grid = grid
+        self.dims = grid.dims()
+        self.stride_x = (self.dims[1] + 2) * (self.dims[2] + 2)
+        self.stride_y = self.dims[2] + 2
+        self.size = (self.dims[0] + 2) * self.stride_x
+        self.brick = brick
+        res = grid.resolution
+        mn = world.bounds_min
+        self.xs, self.ys, self.zs = (
+            [mn[i] + k * res for k in range(self.dims[i])] for i in range(3)
+        )
+        self.root_size = brick
+        while self.root_size < max(self.dims):
+            self.root_size *= 2
+
+        self._origin = np.asarray(mn, dtype=np.float64)
+        self._res = res
+        # One (is_box, near_min, near_max, a, b, r) tuple per obstacle: a, b are
+        # the box corners (r its rounding) or the sphere center and radius. The
+        # near band is the obstacle AABB padded by near_pad, as in FlatGrid.
+        pad = near_pad(grid)
+        self._obstacles = []
+        for obs in world.obstacles:
+            lo, hi = obs.aabb()
+            band = (tuple(v - pad for v in lo), tuple(v + pad for v in hi))
+            if isinstance(obs, Box):
+                self._obstacles.append((True, *band, obs.min_corner, obs.max_corner, obs.rounding))
+            else:
+                self._obstacles.append((False, *band, obs.center, obs.radius, 0.0))
+
+        # child[n] is the first of 8 consecutive children (-1 for leaves); leaf[n]
+        # is a state, or _BRICK + index into bricks.
+        self.child: List[int] = [-1]
+        self.leaf: List[int] = [FREE]
+        self.bricks: List[bytes] = []
+        self._brick_cells: List[Tuple[np.ndarray, np.ndarray] | None] = []
+        spec = self._build(0, 0, 0, self.root_size, list(range(len(self._obstacles))))
+        self._emit(0, spec)
+        del self._obstacles
+
+    def __len__(self) -> int:
+        return len(self.child)
+
+    def nbytes(self) -> int:
+        # Rough footprint: two machine words per node plus one byte per brick cell.
+        return 16 * len(self.child) + sum(len(b) for b in self.bricks)
+
+    def to_id(self, idx: "GridIndex") -> int:
+        return (idx[0] + 1) * self.stride_x + (idx[1] + 1) * self.stride_y + idx[2] + 1
+
+    def to_index(self, node: int) -> "GridIndex":
+        ix, rest = divmod(node, self.stride_x)
+        iy, iz = divmod(rest, self.stride_y)
+        return (ix - 1, iy - 1, iz - 1)
+
+    def to_point(self, node: int) -> Point3:
+        ix, rest = divmod(node, self.stride_x)
+        iy, iz = divmod(rest, self.stride_y)
+        return (self.xs[ix - 1], self.ys[iy - 1], self.zs[iz - 1])
+
+    def neighbors(self, allow_diagonal: bool) -> List[Tuple[int, float]]:
+        # (id delta, edge cost) per neighbor offset, as FlatGrid.neighbors.
+        return [
+            (o[0] * self.stride_x + o[1] * self.stride_y + o[2], cost)
+            for o, cost in grid_offsets(self.grid.resolution, allow_diagonal)
+        ]
+
+    def state(self, idx: "GridIndex") -> int:
+        # O(depth) descent; cells outside the grid are OCCUPIED like FlatGrid's border.
+        x, y, z = idx
+        dx, dy, dz = self.dims
+        if not (0 <= x < dx and 0 <= y < dy and 0 <= z < dz):
+            return OCCUPIED
+        child, leaf = self.child, self.leaf
+        n, half = 0, self.root_size >> 1
+        while child[n] >= 0:
+            k = 0
+            if x >= half:
+                x -= half
+                k = 4
+            if y >= half:
+                y -= half
+                k |= 2
+            if z >= half:
+                z -= half
+                k |= 1
+            n = child[n] + k
+            half >>= 1
+        v = leaf[n]
+        if v < _BRICK:
+            return v
+        b = self.brick
+        return self.bricks[v - _BRICK][(x * b + y) * b + z]
+
+    def node_state(self, node: int) -> int:
+        return self.state(self.to_index(node))
+
+    def collides(self, p: Point3) -> bool:
+        # Point query at lattice resolution: the state of the nearest grid point.
+        if not self.grid.world.in_bounds(p):
+            return True
+        return self.state(self.grid.to_index(p)) == OCCUPIED
+
+    def segment_collides(self, a: Point3, b: Point3) -> bool:
+        # Voxel-level test: does a-b touch any OCCUPIED cell, each cell being the
+        # res-sized cube around its grid point. Descends only into nodes whose
+        # cube the segment crosses, so the cost is O(depth) per crossed leaf.
+        a_arr = np.asarray(a, dtype=np.float64)
+        b_arr = np.asarray(b, dtype=np.float64)
+        res, half_cell = self._res, 0.5 * self._res
+        lo_corner = self._origin - half_cell
+        stack = [(0, 0, 0, 0, self.root_size)]
+        while stack:
+            n, x, y, z, size = stack.pop()
+            cmin = (
+                lo_corner[0] + x * res,
+                lo_corner[1] + y * res,
+                lo_corner[2] + z * res,
+            )
+            cmax = (cmin[0] + size * res, cmin[1] + size * res, cmin[2] + size * res)
+            if not _segment_hits_box(a, b, cmin, cmax):
+                continue
+            c = self.child[n]
+            if c >= 0:
+                h = size >> 1
+                for k in range(8):
+                    stack.append(
+                        (c + k, x + h * (k >> 2), y + h * ((k >> 1) & 1), z + h * (k & 1), h)
+                    )
+                continue
+            v = self.leaf[n]
+            if v == OCCUPIED:
+                return True
+            if v >= _BRICK:
+                cells = self._occupied_cells(v - _BRICK, x, y, z)
+                if len(cells[0]) and segments_intersect_aabbs(
+                    a_arr[None], b_arr[None], cells[0], cells[1]
+                ).any():
+                    return True
+        return False
+
+    def _occupied_cells(self, i: int, x: int, y: int, z: int) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._brick_cells[i]
+        if cached is None:
+            b = self.brick
+            states = np.frombuffer(self.bricks[i], dtype=np.uint8).reshape(b, b, b)
+            idx = np.argwhere(states == OCCUPIED) + (x, y, z)
+            lo = self._origin + (idx - 0.5) * self._res
+            cached = self._brick_cells[i] = (lo, lo + self._res)
+        return cached
+
+    def _build(self, x: int, y: int, z: int, size: int, candidates: List[int]):
+        # Returns a leaf state, brick bytes, or a list of 8 child specs; None marks
+        # a block entirely outside the grid (never queried, free for collapsing).
+        # Plain Python on purpose: most blocks have one or two candidates.
+        dx, dy, dz = self.dims
+        if x >= dx or y >= dy or z >= dz:
+            return None
+        ox, oy, oz = self.grid.world.bounds_min
+        res = self._res
+        # Grid points covered by the block, clipped to the grid.
+        lx, ly, lz = ox + x * res, oy + y * res, oz + z * res
+        hx = ox + (min(x + size, dx) - 1) * res
+        hy = oy + (min(y + size, dy) - 1) * res
+        hz = oz + (min(z + size, dz) - 1) * res
+
+        keep = []
+        touched = banded = False
+        for i in candidates:
+            is_box, nmn, nmx, a, b, r = self._obstacles[i]
+            if (
+                nmn[0] > hx or nmx[0] < lx or nmn[1] > hy
+                or nmx[1] < ly or nmn[2] > hz or nmx[2] < lz
+            ):
+                continue
+            keep.append(i)
+            if is_box and r > 0:
+                # Rounded box: inside if the farthest block corner is within r of
+                # the core box, touched if the nearest block point is.
+                far = gap = 0.0
+                for k, (lo, hi) in enumerate(((lx, hx), (ly, hy), (lz, hz))):
+                    e = max(a[k] - lo, hi - b[k], 0.0)
+                    g = max(a[k] - hi, lo - b[k], 0.0)
+                    far += e * e
+                    gap += g * g
+                if far < r * r * (1 - 1e-12):
+                    return OCCUPIED
+                touches = gap <= r * r
+            elif is_box:
+                if (
+                    a[0] <= lx and hx <= b[0] and a[1] <= ly
+                    and hy <= b[1] and a[2] <= lz and hz <= b[2]
+                ):
+                    return OCCUPIED
+                touches = (
+                    a[0] <= hx and b[0] >= lx and a[1] <= hy
+                    and b[1] >= ly and a[2] <= hz and b[2] >= lz
+                )
+            else:
+                cx, cy, cz = a
+                fx, fy, fz = max(cx - lx, hx - cx), max(cy - ly, hy - cy), max(cz - lz, hz - cz)
+                if (fx * fx + fy * fy + fz * fz) ** 0.5 < b * (1 - 1e-12):
+                    return OCCUPIED
+                nx = cx - min(max(cx, lx), hx)
+                ny = cy - min(max(cy, ly), hy)
+                nz = cz - min(max(cz, lz), hz)
+                touches = (nx * nx + ny * ny + nz * nz) ** 0.5 <= b
+            touched = touched or touches
+            banded = banded or (
+                nmn[0] <= lx and hx <= nmx[0] and nmn[1] <= ly
+                and hy <= nmx[1] and nmn[2] <= lz and hz <= nmx[2]
+            )
+        if not keep:
+            return FREE
+        if banded and not touched:
+            return NEAR
+
+        if size <= self.brick:
+            return self._brick_states(x, y, z, keep)
+        h = size // 2
+        children = [
+            self._build(x + h * (k >> 2), y + h * ((k >> 1) & 1), z + h * (k & 1), h, keep)
+            for k in range(8)
+        ]
+        inside = [c for c in children if c is not None]
+        if all(isinstance(c, int) and c == inside[0] for c in inside):
+            return inside[0]
+        return children
+
+    def _brick_states(self, x: int, y: int, z: int, candidates: List[int]):
+        # Exact per-cell states, with the arithmetic of rasterize/_near_obstacles.
+        b = self.brick
+        steps = np.arange(b, dtype=np.float64)
+        xs, ys, zs = (
+            self._origin[i] + (start + steps) * self._res for i, start in enumerate((x, y, z))
+        )
+        xs, ys, zs = xs[:, None, None], ys[None, :, None], zs[None, None, :]
+        occ = np.zeros((b, b, b), dtype=bool)
+        near = np.zeros((b, b, b), dtype=bool)
+        for i in candidates:
+            is_box, nmn, nmx, lo, hi, r = self._obstacles[i]
+            near |= _in_box(xs, ys, zs, nmn, nmx)
+            if is_box and r > 0:
+                ex, ey, ez = (
+                    np.maximum(np.maximum(lo[k] - c, c - hi[k]), 0.0)
+                    for k, c in enumerate((xs, ys, zs))
+                )
+                occ |= ex * ex + ey * ey + ez * ez <= r * r
+            elif is_box:
+                occ |= _in_box(xs, ys, zs, lo, hi)
+            else:
+                cx, cy, cz = lo
+                ddx, ddy, ddz = cx - xs, cy - ys, cz - zs
+                occ |= np.sqrt(ddx * ddx + ddy * ddy + ddz * ddz) <= hi
+        states = np.where(occ, OCCUPIED, np.where(near, NEAR, FREE)).astype(np.uint8)
+        first = int(states.flat[0])
+        if (states == first).all():
+            return first
+        return states.tobytes()
+
+    def _emit(self, n: int, spec) -> None:
+        if spec is None or isinstance(spec, int):
+            self.leaf[n] = FREE if spec is None else spec
+            return
+        if isinstance(spec, bytes):
+            self.leaf[n] = _BRICK + len(self.bricks)
+            self.bricks.append(spec)
+            self._brick_cells.append(None)
+            return
+        first = len(self.child)
+        self.child[n] = first
+        self.child.extend([-1] * 8)
+        self.leaf.extend([FREE] * 8)
+        for k, sub in enumerate(spec):
+            self._emit(first + k, sub)
+
+
+def octree(grid: "Grid3D") -> OccupancyOctree:
+    key = (grid.world.fingerprint(), grid.resolution)
+    return _OCTREE_CACHE.get_or_create(key, lambda: OccupancyOctree(grid))
+
+
+def clear_octree_cache() -> None:
+    _OCTREE_CACHE.clear()
+
+
+def _in_box(xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, mn, mx) -> np.ndarray:
+    return (
+        ((mn[0] <= xs) & (xs <= mx[0]))
+        & ((mn[1] <= ys) & (ys <= mx[1]))
+        & ((mn[2] <= zs) & (zs <= mx[2]))
+    )
+
+
+def _segment_hits_box(a: Point3, b: Point3, mn: Point3, mx: Point3) -> bool:
+    # Slab test, as segment_intersects_aabb but on raw corners.
+    tmin, tmax = 0.0, 1.0
+    for i in range(3):
+        d = b[i] - a[i]
+        if abs(d) < 1e-12:
+            if a[i] < mn[i] or a[i] > mx[i]:
+                return False
+            continue
+        t1 = (mn[i] - a[i]) / d
+        t2 = (mx[i] - a[i]) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tmin:
+            tmin = t1
+        if t2 < tmax:
+            tmax = t2
+        if tmin > tmax:
+            return False
+    return True
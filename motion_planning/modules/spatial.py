@@ -0,0 +1,162 @@
+# obstacle AABB 위에 BVH 를 만들어 point/segment query 후보를 줄이는 module
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+from ..settings.types import (
+    Box,
+    Obstacle,
+    Point3,
+    segment_intersects_aabb,
+    segment_intersects_box,
+    segment_intersects_sphere,
+)
+
+# Sphere bounds are padded so rounding in the quadratic never escapes the node box.
+_SPHERE_PAD = 1e-9
+
+
+class ObstacleBVH:
+    def __init__(self, obstacles: Sequence[Obstacle], leaf_size: int = 4) -> None:
+        if leaf_size <= 0:
+            raise ValueError("leaf_size must be positive")
+        self.obstacles: List[Obstacle] = list(obstacles)
+        self.leaf_size = leaf_size
+        # Flat node storage: bounds as Box, children (-1 for leaves) and leaf item range.
+        self._bounds: List[Box] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._start: List[int] = []
+        self._count: List[int] = []
+        self._items: List[Obstacle] = []
+        if self.obstacles:
+            boxes = [aabb(o) for o in self.obstacles]
+            self._build(list(range(len(self.obstacles))), boxes)
+
+    def __len__(self) -> int:
+        return len(self.obstacles)
+
+    def collides(self, p: Point3) -> bool:
+        if not self._bounds:
+            return False
+        x, y, z = p
+        bounds, left, right = self._bounds, self._left, self._right
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            b = bounds[node]
+            mn, mx = b.min_corner, b.max_corner
+            if not (mn[0] <= x <= mx[0] and mn[1] <= y <= mx[1] and mn[2] <= z <= mx[2]):
+                continue
+            if left[node] < 0:
+                start = self._start[node]
+                for obs in self._items[start : start + self._count[node]]:
+                    if obs.contains(p):
+                        return True
+                continue
+            stack.append(right[node])
+            stack.append(left[node])
+        return False
+
+    def path_collides(self, a: Point3, b: Point3) -> bool:
+        if not self._bounds:
+            return False
+        bounds, left, right = self._bounds, self._left, self._right
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not segment_intersects_aabb(a, b, bounds[node]):
+                continue
+            if left[node] < 0:
+                start = self._start[node]
+                for obs in self._items[start : start + self._count[node]]:
+                    if isinstance(obs, Box):
+                        if segment_intersects_box(a, b, obs):
+                            return True
+                    elif segment_intersects_sphere(a, b, obs):
+                        return True
+                continue
+            stack.append(right[node])
+            stack.append(left[node])
+        return False
+
+    def query_point(self, p: Point3) -> List[Obstacle]:
+        # Candidates whose AABB contains p.
+        return self._query(lambda box: box.contains(p))
+
+    def query_segment(self, a: Point3, b: Point3) -> List[Obstacle]:
+        # Candidates whose AABB is crossed by the segment.
+        return self._query(lambda box: segment_intersects_aabb(a, b, box))
+
+    def _query(self, hit) -> List[Obstacle]:
+        out: List[Obstacle] = []
+        if not self._bounds:
+            return out
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not hit(self._bounds[node]):
+                continue
+            if self._left[node] < 0:
+                start = self._start[node]
+                for obs in self._items[start : start + self._count[node]]:
+                    if hit(aabb(obs)):
+                        out.append(obs)
+                continue
+            stack.append(self._right[node])
+            stack.append(self._left[node])
+        return out
+
+    def _build(self, ids: List[int], boxes: List[Box]) -> int:
+        node = len(self._bounds)
+        self._bounds.append(_union(boxes[i] for i in ids))
+        self._left.append(-1)
+        self._right.append(-1)
+        self._start.append(len(self._items))
+        self._count.append(0)
+
+        if len(ids) <= self.leaf_size:
+            self._items.extend(self.obstacles[i] for i in ids)
+            self._count[node] = len(ids)
+            return node
+
+        # Median split along the widest axis of the centroid spread.
+        centers = {i: _center(boxes[i]) for i in ids}
+        spread = [
+            max(centers[i][k] for i in ids) - min(centers[i][k] for i in ids) for k in range(3)
+        ]
+        axis = spread.index(max(spread))
+        ids.sort(key=lambda i: centers[i][axis])
+        mid = len(ids) // 2
+        left = self._build(ids[:mid], boxes)
+        right = self._build(ids[mid:], boxes)
+        self._left[node] = left
+        self._right[node] = right
+        return node
+
+
+def aabb(obs: Obstacle) -> Box:
+    if isinstance(obs, Box):
+        return obs if obs.rounding <= 0 else Box(*obs.aabb())
+    c, r = obs.center, obs.radius + _SPHERE_PAD
+    return Box((c[0] - r, c[1] - r, c[2] - r), (c[0] + r, c[1] + r, c[2] + r))
+
+
+def _union(boxes) -> Box:
+    mn = [float("inf")] * 3
+    mx = [float("-inf")] * 3
+    for box in boxes:
+        for k in range(3):
+            if box.min_corner[k] < mn[k]:
+                mn[k] = box.min_corner[k]
+            if box.max_corner[k] > mx[k]:
+                mx[k] = box.max_corner[k]
+    return Box((mn[0], mn[1], mn[2]), (mx[0], mx[1], mx[2]))
+
+
+def _center(box: Box) -> Tuple[float, float, float]:
+    return (
+        (box.min_corner[0] + box.max_corner[0]) * 0.5,
+        (box.min_corner[1] + box.max_corner[1]) * 0.5,
+        (box.min_corner[2] + box.max_corner[2]) * 0.5,
+    )
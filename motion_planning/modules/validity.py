@@ -0,0 +1,70 @@
+# 같은 world 에 대한 반복 query 사이에서 edge 충돌 결과를 재사용하는 cache
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+from ..settings.types import Point3, World
+from .cache import CacheInfo, LRUCache
+
+if TYPE_CHECKING:
+    from .grid import Grid3D
+
+# Per-world entry bound; a bool entry costs roughly 100 bytes in an OrderedDict.
+# Node validity needs no cache: grid planners read it from the occupancy mask.
+DEFAULT_MAX_EDGES = 1 << 20
+
+_VALIDITY_CACHE: LRUCache["ValidityCache"] = LRUCache(maxsize=8)
+
+
+class ValidityCache:
+    # Keys are flat node ids of one FlatGrid; edges are stored undirected.
+    def __init__(self, world: World, size: int, max_edges: int = DEFAULT_MAX_EDGES) -> None:
+        self.world = world
+        self.size = size
+        self.edges: LRUCache[bool] = LRUCache(max_edges)
+
+    def edge_key(self, u: int, v: int) -> int:
+        return u * self.size + v if u < v else v * self.size + u
+
+    def edge_collides(self, u: int, v: int, a: Point3, b: Point3) -> bool:
+        return self.edges.get_or_create(self.edge_key(u, v), lambda: self.world.path_collides(a, b))
+
+    def edges_collide(
+        self, u: int, a: Point3, items: Sequence[Tuple[int, Point3]]
+    ) -> List[bool]:
+        # Edges u -> v for each (v, point of v); misses are checked as one fan.
+        size, edges = self.size, self.edges
+        out: List[bool] = []
+        todo: List[int] = []
+        for k, (v, _) in enumerate(items):
+            hit = edges.get(u * size + v if u < v else v * size + u)
+            if hit is None:
+                todo.append(k)
+                hit = False
+            out.append(hit)
+        if todo:
+            hits = self.world.path_collides_fan(a, [items[k][1] for k in todo])
+            for k, hit in zip(todo, hits):
+                v = items[k][0]
+                edges.put(u * size + v if u < v else v * size + u, hit)
+                out[k] = hit
+        return out
+
+    def edge_info(self) -> CacheInfo:
+        return self.edges.info()
+
+    def clear(self) -> None:
+        self.edges.clear()
+
+
+def validity_cache(grid: "Grid3D") -> ValidityCache:
+    key = (grid.world.fingerprint(), grid.resolution)
+    # Padded id space size, from dims so sparse (octree) searches never build the flat grid.
+    dx, dy, dz = grid.dims()
+    return _VALIDITY_CACHE.get_or_create(
+        key, lambda: ValidityCache(grid.world, (dx + 2) * (dy + 2) * (dz + 2))
+    )
+
+
+def clear_validity_cache() -> None:
+    _VALIDITY_CACHE.clear()
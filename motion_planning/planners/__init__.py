@@ -1,8 +1,48 @@
-from .base import PlanResult, Planner
+from .base import PlanResult, Planner, VisitedNodes
+from .ara import ARAStarPlanner, AnytimeResult
 from .astar import AStarPlanner
+from .bidirectional import BidirectionalAStarPlanner
+from .cost_to_go import CostToGoField, clear_cost_to_go_cache, cost_to_go_field
+from .dstar_lite import DStarLitePlanner
+from .hierarchical import HierarchicalPlanner, HierarchicalResult
+from .jps import JPSPlanner
+from .parallel import plan_all, plan_many
+from .prm import PRMPlanner, Roadmap, build_roadmap, clear_roadmap_cache, load_roadmap
+from .rrt import RRTPlanner
+from .service import PlanningClient, PlanningService
+from .smoothing import SmoothedResult, shortcut_path
+from .stats import PlanStats, add_stats_hook, remove_stats_hook
+from .theta import LazyThetaStarPlanner
 
 __all__ = [
+    "AnytimeResult",
+    "CostToGoField",
+    "HierarchicalResult",
     "PlanResult",
+    "PlanStats",
     "Planner",
+    "PlanningClient",
+    "PlanningService",
+    "Roadmap",
+    "SmoothedResult",
+    "VisitedNodes",
+    "ARAStarPlanner",
     "AStarPlanner",
+    "BidirectionalAStarPlanner",
+    "DStarLitePlanner",
+    "HierarchicalPlanner",
+    "JPSPlanner",
+    "LazyThetaStarPlanner",
+    "PRMPlanner",
+    "RRTPlanner",
+    "add_stats_hook",
+    "build_roadmap",
+    "clear_cost_to_go_cache",
+    "clear_roadmap_cache",
+    "cost_to_go_field",
+    "load_roadmap",
+    "plan_all",
+    "plan_many",
+    "remove_stats_hook",
+    "shortcut_path",
 ]
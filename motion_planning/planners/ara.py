@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Callable, List, Set, Tuple
+
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World
+from .base import PlanResult, VisitLog
+from .stats import PlanStats, emit_stats, stats_enabled
+
+# The clock and the cancel callback are polled every this many expansions.
+_POLL_EVERY = 64
+
+
+@dataclass(frozen=True)
+class AnytimeResult(PlanResult):
+    # cost(path) <= bound * optimal cost; 1.0 means the path is optimal. inf means
+    # no round finished: either no path, or one found before the budget ran out
+    # without a proven bound.
+    bound: float = float("inf")
+    # Number of improved solutions published before returning.
+    solutions: int = 0
+    # True when the search stopped on the budget or cancellation.
+    interrupted: bool = False
+
+
+@dataclass
+class ARAStarPlanner:
+    # Anytime Repairing A* (Likhachev, Gordon & Thrun) on the AStarPlanner grid
+    # graph. The first search inflates the heuristic by epsilon to find a path
+    # quickly; epsilon is then lowered by epsilon_step and the search resumes
+    # from the previous g-values, re-expanding only inconsistent nodes, until
+    # it reaches 1 or the budget runs out.
+    resolution: float = 0.5
+    allow_diagonal: bool = True
+    cache_edges: bool = True
+    epsilon: float = 3.0
+    epsilon_step: float = 0.5
+    # Wall-clock budget in seconds and/or expansion budget; None = unbounded.
+    time_budget: float | None = None
+    max_expansions: int | None = None
+    record_visited: str = "full"
+    sample_every: int = 10
+    # Attach PlanStats to results (also on while any stats hook is registered).
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+
+    def plan(
+        self,
+        world: World,
+        start: Point3,
+        goal: Point3,
+        cancel: Callable[[], bool] | None = None,
+    ) -> AnytimeResult:
+        # cancel is polled cooperatively (e.g. threading.Event().is_set); when it
+        # returns True the best path found so far is returned.
+        world = world.inflate(self.robot_radius)
+        deadline = None if self.time_budget is None else perf_counter() + self.time_budget
+        if self.resolution <= 0 or self.epsilon < 1 or self.epsilon_step <= 0:
+            return AnytimeResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return AnytimeResult([], False, 0, [])
+
+        grid = Grid3D(world, self.resolution)
+        flat = grid.flat()
+        blocked, near = flat.blocked, flat.near
+        start_id = flat.to_id(grid.to_index(grid.snap(start)))
+        goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+        if blocked[start_id] or blocked[goal_id]:
+            return AnytimeResult([], False, 0, [])
+
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        to_point = flat.to_point
+        offsets = flat.neighbors(self.allow_diagonal)
+        gx, gy, gz = to_point(goal_id)
+        log = VisitLog(flat, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+
+        inf = float("inf")
+        g_score = [inf] * flat.size
+        h_score = [-1.0] * flat.size
+        parent = [-1] * flat.size
+        g_score[start_id] = 0.0
+
+        def h(node: int) -> float:
+            value = h_score[node]
+            if value < 0:
+                p = to_point(node)
+                hx, hy, hz = p[0] - gx, p[1] - gy, p[2] - gz
+                value = h_score[node] = (hx * hx + hy * hy + hz * hz) ** 0.5
+            return value
+
+        eps = self.epsilon
+        open_heap: List[Tuple[float, float, int]] = [(eps * h(start_id), 0.0, start_id)]
+        incons: Set[int] = set()
+        closed = bytearray(flat.size)
+        expansions = 0
+        stopped = False
+
+        limit = inf if self.max_expansions is None else self.max_expansions
+
+        def out_of_budget() -> bool:
+            if expansions >= limit:
+                return True
+            if deadline is not None and perf_counter() >= deadline:
+                return True
+            return cancel is not None and cancel()
+
+        def improve_path() -> bool:
+            # Returns False when interrupted before the goal became consistent.
+            nonlocal expansions
+            while open_heap:
+                f, curr_g, curr = open_heap[0]
+                if closed[curr] or curr_g != g_score[curr]:
+                    heapq.heappop(open_heap)
+                    if stats is not None:
+                        stats.stale_pops += 1
+                    continue
+                if g_score[goal_id] <= f:
+                    return True
+                if expansions >= limit or (expansions % _POLL_EVERY == 0 and out_of_budget()):
+                    return False
+                heapq.heappop(open_heap)
+                closed[curr] = 1
+                expansions += 1
+                if record is not None and expansions % every == 0:
+                    record(curr)
+
+                curr_p = to_point(curr)
+                pending = []
+                for step, cost in offsets:
+                    nxt = curr + step
+                    if blocked[nxt]:
+                        continue
+                    tentative_g = curr_g + cost
+                    if tentative_g >= g_score[nxt]:
+                        continue
+                    if near[curr] and near[nxt]:
+                        pending.append((nxt, tentative_g))
+                    else:
+                        relax(curr, nxt, tentative_g)
+                if not pending:
+                    continue
+                if stats is not None:
+                    t0 = perf_counter()
+                if cache is not None:
+                    hits = cache.edges_collide(
+                        curr, curr_p, [(nxt, to_point(nxt)) for nxt, _ in pending]
+                    )
+                else:
+                    hits = world.path_collides_fan(curr_p, [to_point(nxt) for nxt, _ in pending])
+                if stats is not None:
+                    stats.collision_time += perf_counter() - t0
+                    stats.segment_checks += len(pending)
+                for (nxt, tentative_g), hit in zip(pending, hits):
+                    if not hit:
+                        relax(curr, nxt, tentative_g)
+            return True
+
+        def relax(curr: int, nxt: int, tentative_g: float) -> None:
+            g_score[nxt] = tentative_g
+            parent[nxt] = curr
+            if closed[nxt]:
+                # Already expanded in this round: defer to the next one.
+                incons.add(nxt)
+            else:
+                heapq.heappush(open_heap, (tentative_g + eps * h(nxt), tentative_g, nxt))
+                if stats is not None:
+                    stats.heap_pushes += 1
+
+        def frontier() -> List[int]:
+            live = {n for _, g, n in open_heap if g == g_score[n] and not closed[n]}
+            live.update(incons)
+            return list(live)
+
+        def achieved_bound() -> float:
+            # g(goal) / min(g + h) over OPEN u INCONS lower-bounds the optimum.
+            lower = min((g_score[n] + h(n) for n in frontier()), default=inf)
+            if lower >= g_score[goal_id]:
+                return 1.0
+            return min(eps, g_score[goal_id] / lower)
+
+        bound = inf
+        solutions = 0
+        while True:
+            if not improve_path():
+                stopped = True
+                break
+            if g_score[goal_id] == inf:
+                break
+            bound = achieved_bound()
+            solutions += 1
+            if bound <= 1.0:
+                break
+            if out_of_budget():
+                stopped = True
+                break
+            # Next round: lower epsilon, move INCONS back into OPEN, re-key, reopen.
+            eps = max(1.0, min(eps - self.epsilon_step, bound))
+            nodes = frontier()
+            incons.clear()
+            open_heap[:] = [(g_score[n] + eps * h(n), g_score[n], n) for n in nodes]
+            heapq.heapify(open_heap)
+            closed = bytearray(flat.size)
+            if stats is not None:
+                stats.heap_pushes += len(open_heap)
+
+        if g_score[goal_id] == inf:
+            result = AnytimeResult([], False, expansions, log.visited(), interrupted=stopped)
+        else:
+            node, path = goal_id, [to_point(goal_id)]
+            while parent[node] >= 0:
+                node = parent[node]
+                path.append(to_point(node))
+            path.reverse()
+            result = AnytimeResult(
+                path,
+                True,
+                expansions,
+                log.visited(),
+                bound=bound,
+                solutions=solutions,
+                interrupted=stopped,
+            )
+        if stats is None:
+            return result
+        # Re-keyed frontiers count as fresh pushes at the start of each round.
+        stats.heap_pops = expansions + stats.stale_pops
+        stats.heap_pushes += 1
+        stats.nodes_generated = flat.size - g_score.count(inf)
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.total_time = perf_counter() - t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
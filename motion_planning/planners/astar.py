@@ -1,99 +1,426 @@
 from __future__ import annotations
 
 import heapq
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Dict, List, Sequence, Set, Tuple
 
-from ..settings.types import Point3, World, distance
-from .base import PlanResult
-from ..modules.grid import Grid3D, GridIndex
+from ..settings.types import Point3, World
+from .base import PlanResult, VisitLog
+from .stats import PlanStats, emit_stats, stats_enabled
+from ..modules.flat import FlatGrid
+from ..modules.grid import Grid3D
+from ..modules.octree import NEAR, OCCUPIED, OccupancyOctree
+from .cost_to_go import cost_to_go_field
+
+# Explicit heuristics (cost-to-go fields) are exact, so many nodes tie on f;
+# scaling h by a hair breaks ties towards deeper nodes without changing which
+# grid path is optimal.
+_TIE = 1.0 + 1e-9
 
 
 @dataclass
 class AStarPlanner:
     resolution: float = 0.5
     allow_diagonal: bool = False
+    # Share edge collision results across plan() calls on the same world.
+    cache_edges: bool = True
+    # Reject grid nodes whose ESDF clearance is below this distance.
+    safety_margin: float = 0.0
+    # PlanResult.visited recording: "full", "off", "compact" or "sampled".
+    record_visited: str = "full"
+    sample_every: int = 10
+    # Attach PlanStats to results (also on while any stats hook is registered).
+    collect_stats: bool = False
+    # Lazy A*: defer edge collision checks until the node is popped for
+    # expansion. Same optimal paths, far fewer segment checks.
+    lazy_edges: bool = False
+    # Search on Grid3D.octree() instead of the dense flat grid, with dict-based
+    # search state, for worlds whose grid does not fit in memory.
+    sparse: bool = False
+    # Use the goal's cached CostToGoField (built on first use) as a perfect
+    # heuristic; repeated queries to the same goal then expand ~path nodes only.
+    cost_to_go: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
 
     def plan(self, world: World, start: Point3, goal: Point3) -> PlanResult:
+        world = world.inflate(self.robot_radius)
         if self.resolution <= 0:
             return PlanResult([], False, 0, [])
         if not world.in_bounds(start) or not world.in_bounds(goal):
             return PlanResult([], False, 0, [])
 
         grid = Grid3D(world, self.resolution)
+        if self.sparse:
+            if self.safety_margin > 0 or self.cost_to_go:
+                raise ValueError("safety_margin and cost_to_go need dense grids; use sparse=False")
+            tree = grid.octree()
+            start_id = tree.to_id(grid.to_index(grid.snap(start)))
+            goal_id = tree.to_id(grid.to_index(grid.snap(goal)))
+            if tree.node_state(start_id) == OCCUPIED or tree.node_state(goal_id) == OCCUPIED:
+                return PlanResult([], False, 0, [])
+            result = self._search_sparse(grid, tree, start_id, goal_id)
+            emit_stats(self, result.stats)
+            return result
 
-        start_p = grid.snap(start)
-        goal_p = grid.snap(goal)
-        if world.collides(start_p) or world.collides(goal_p):
+        flat = grid.flat()
+        start_id = flat.to_id(grid.to_index(grid.snap(start)))
+        goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+        blocked = flat.blocked
+        if self.safety_margin > 0:
+            blocked = grid.distance_field().blocked_below(self.safety_margin)
+        if blocked[start_id] or blocked[goal_id]:
             return PlanResult([], False, 0, [])
+        heuristic = None
+        if self.cost_to_go:
+            # Exact on flat.blocked, so admissible for any stricter mask too.
+            heuristic = cost_to_go_field(
+                world, goal, self.resolution, self.allow_diagonal, self.cache_edges
+            ).cost
+            if heuristic[start_id] == float("inf"):
+                return PlanResult([], False, 0, [])
+        result = self._search(grid, blocked, start_id, goal_id, heuristic)
+        emit_stats(self, result.stats)
+        return result
+
+    def _search(
+        self,
+        grid: Grid3D,
+        blocked: bytes,
+        start_id: int,
+        goal_id: int,
+        heuristic: Sequence[float] | None = None,
+    ) -> PlanResult:
+        # Core search over FlatGrid ids; callers may pass a stricter blocked mask
+        # and a per-id heuristic in place of the Euclidean distance to the goal.
+        if self.lazy_edges:
+            return self._search_lazy(grid, blocked, start_id, goal_id, heuristic)
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        world = grid.world
+        flat = grid.flat()
+
+        # Everything the hot loop touches is bound to locals up front.
+        near = flat.near
+        xs, ys, zs = flat.xs, flat.ys, flat.zs
+        stride_x, stride_y = flat.stride_x, flat.stride_y
+        gx, gy, gz = flat.to_point(goal_id)
+        offsets = [
+            (flat.offset_id(o), o[0] - 1, o[1] - 1, o[2] - 1, cost)
+            for o, cost in flat.offsets(self.allow_diagonal)
+        ]
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        push, pop = heapq.heappush, heapq.heappop
+
+        g_score = [float("inf")] * flat.size
+        parent = [-1] * flat.size
+        closed = bytearray(flat.size)
+        g_score[start_id] = 0.0
+        open_heap: List[Tuple[float, float, int]] = [(0.0, 0.0, start_id)]
+
+        log = VisitLog(flat, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+        iterations = stale = 0
+        found = -1
+        while open_heap:
+            _, curr_g, curr = pop(open_heap)
+            if closed[curr]:
+                stale += 1
+                continue
+            closed[curr] = 1
+            iterations += 1
+            ix, rest = divmod(curr, stride_x)
+            iy, iz = divmod(rest, stride_y)
+            curr_p = (xs[ix - 1], ys[iy - 1], zs[iz - 1])
+            if record is not None and iterations % every == 0:
+                record(curr)
+            if curr == goal_id:
+                found = curr
+                break
+
+            check_edges = near[curr]
+            pending = []
+            for step, dx, dy, dz, cost in offsets:
+                nxt = curr + step
+                if blocked[nxt] or closed[nxt]:
+                    continue
+                tentative_g = curr_g + cost
+                if tentative_g >= g_score[nxt]:
+                    continue
+                nxt_p = (xs[ix + dx], ys[iy + dy], zs[iz + dz])
+                if check_edges and near[nxt]:
+                    pending.append((nxt, nxt_p, tentative_g))
+                    continue
+                g_score[nxt] = tentative_g
+                parent[nxt] = curr
+                if heuristic is not None:
+                    push(open_heap, (tentative_g + heuristic[nxt] * _TIE, tentative_g, nxt))
+                    continue
+                hx, hy, hz = nxt_p[0] - gx, nxt_p[1] - gy, nxt_p[2] - gz
+                push(open_heap, (tentative_g + (hx * hx + hy * hy + hz * hz) ** 0.5, tentative_g, nxt))
 
-        dims = grid.dims()
-        start_idx = grid.to_index(start_p)
-        goal_idx = grid.to_index(goal_p)
+            if not pending:
+                continue
+            if stats is not None:
+                t0 = perf_counter()
+            if cache is not None:
+                hits = cache.edges_collide(curr, curr_p, [(nxt, p) for nxt, p, _ in pending])
+            else:
+                hits = world.path_collides_fan(curr_p, [p for _, p, _ in pending])
+            if stats is not None:
+                stats.collision_time += perf_counter() - t0
+                stats.segment_checks += len(pending)
+            for item, hit in zip(pending, hits):
+                if not hit:
+                    self._relax(open_heap, g_score, parent, curr, item, gx, gy, gz, heuristic)
 
-        open_heap: List[Tuple[float, float, GridIndex]] = []
-        heapq.heappush(open_heap, (0.0, 0.0, start_idx))
-        came_from: Dict[GridIndex, GridIndex] = {}
-        g_score: Dict[GridIndex, float] = {start_idx: 0.0}
+        path = self._reconstruct(flat, parent, found) if found >= 0 else []
+        result = PlanResult(path, found >= 0, iterations, log.visited())
+        if stats is None:
+            return result
+        # Every push is eventually popped or still queued.
+        stats.heap_pops = iterations + stale
+        stats.stale_pops = stale
+        stats.heap_pushes = stats.heap_pops + len(open_heap)
+        stats.nodes_generated = flat.size - g_score.count(float("inf"))
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.total_time = perf_counter() - t_start
+        return replace(result, stats=stats)
 
-        iterations = 0
-        visited = []
+    def _search_lazy(
+        self,
+        grid: Grid3D,
+        blocked: bytes,
+        start_id: int,
+        goal_id: int,
+        heuristic: Sequence[float] | None = None,
+    ) -> PlanResult:
+        # Edges that need a geometric check (both ends near an obstacle) are
+        # pushed unverified, one heap entry per candidate parent, and checked
+        # only when popped. An invalid entry is dropped and the node is repaired
+        # by its next-best entry still in the heap, so the first valid pop is
+        # still the optimal one. g_score only holds verified costs.
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        world = grid.world
+        flat = grid.flat()
+
+        near = flat.near
+        xs, ys, zs = flat.xs, flat.ys, flat.zs
+        stride_x, stride_y = flat.stride_x, flat.stride_y
+        gx, gy, gz = flat.to_point(goal_id)
+        offsets = [
+            (flat.offset_id(o), o[0] - 1, o[1] - 1, o[2] - 1, cost)
+            for o, cost in flat.offsets(self.allow_diagonal)
+        ]
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        to_point = flat.to_point
+        push, pop = heapq.heappush, heapq.heappop
+
+        g_score = [float("inf")] * flat.size
+        parent = [-1] * flat.size
+        closed = bytearray(flat.size)
+        g_score[start_id] = 0.0
+        # (f, g, node, parent, unverified)
+        open_heap: List[Tuple[float, float, int, int, bool]] = [(0.0, 0.0, start_id, -1, False)]
+
+        log = VisitLog(flat, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+        iterations = stale = 0
+        found = -1
         while open_heap:
+            _, curr_g, curr, prev, unverified = pop(open_heap)
+            if closed[curr]:
+                stale += 1
+                continue
+            if unverified:
+                if stats is not None:
+                    t0 = perf_counter()
+                if cache is not None:
+                    hit = cache.edge_collides(prev, curr, to_point(prev), to_point(curr))
+                else:
+                    hit = world.path_collides(to_point(prev), to_point(curr))
+                if stats is not None:
+                    stats.collision_time += perf_counter() - t0
+                    stats.segment_checks += 1
+                if hit:
+                    stale += 1
+                    continue
+            closed[curr] = 1
+            g_score[curr] = curr_g
+            parent[curr] = prev
             iterations += 1
-            _, curr_g, curr = heapq.heappop(open_heap)
-            visited.append(grid.to_point(curr))
-            if curr == goal_idx:
-                path = self._reconstruct(grid, came_from, curr)
-                return PlanResult(path, True, iterations, visited)
-
-            curr_p = grid.to_point(curr)
-            for nxt in self._neighbors(curr, dims):
-                nxt_p = grid.to_point(nxt)
-                if world.collides(nxt_p):
+            if record is not None and iterations % every == 0:
+                record(curr)
+            if curr == goal_id:
+                found = curr
+                break
+
+            ix, rest = divmod(curr, stride_x)
+            iy, iz = divmod(rest, stride_y)
+            check_edges = near[curr]
+            for step, dx, dy, dz, cost in offsets:
+                nxt = curr + step
+                if blocked[nxt] or closed[nxt]:
                     continue
-                if world.path_collides(curr_p, nxt_p):
+                tentative_g = curr_g + cost
+                if tentative_g >= g_score[nxt]:
                     continue
-                tentative_g = curr_g + distance(curr_p, nxt_p)
-                if tentative_g < g_score.get(nxt, float("inf")):
-                    came_from[nxt] = curr
+                lazy = check_edges and near[nxt]
+                if not lazy:
                     g_score[nxt] = tentative_g
-                    f = tentative_g + distance(nxt_p, grid.to_point(goal_idx))
-                    heapq.heappush(open_heap, (f, tentative_g, nxt))
-
-        return PlanResult([], False, iterations, visited)
-
-    def _neighbors(self, idx: GridIndex, dims: GridIndex) -> List[GridIndex]:
-        neighbors: List[GridIndex] = []
-        if self.allow_diagonal:
-            for dx in (-1, 0, 1):
-                for dy in (-1, 0, 1):
-                    for dz in (-1, 0, 1):
-                        if dx == dy == dz == 0:
-                            continue
-                        nx, ny, nz = idx[0] + dx, idx[1] + dy, idx[2] + dz
-                        if 0 <= nx < dims[0] and 0 <= ny < dims[1] and 0 <= nz < dims[2]:
-                            neighbors.append((nx, ny, nz))
-            return neighbors
-
-        for dx, dy, dz in (
-            (-1, 0, 0),
-            (1, 0, 0),
-            (0, -1, 0),
-            (0, 1, 0),
-            (0, 0, -1),
-            (0, 0, 1),
-        ):
-            nx, ny, nz = idx[0] + dx, idx[1] + dy, idx[2] + dz
-            if 0 <= nx < dims[0] and 0 <= ny < dims[1] and 0 <= nz < dims[2]:
-                neighbors.append((nx, ny, nz))
-        return neighbors
-
-    def _reconstruct(
-        self, grid: Grid3D, came_from: Dict[GridIndex, GridIndex], current: GridIndex
-    ) -> List[Point3]:
-        path = [grid.to_point(current)]
-        while current in came_from:
-            current = came_from[current]
-            path.append(grid.to_point(current))
+                if heuristic is not None:
+                    f = tentative_g + heuristic[nxt] * _TIE
+                else:
+                    hx, hy, hz = xs[ix + dx] - gx, ys[iy + dy] - gy, zs[iz + dz] - gz
+                    f = tentative_g + (hx * hx + hy * hy + hz * hz) ** 0.5
+                push(open_heap, (f, tentative_g, nxt, curr, lazy))
+
+        path = self._reconstruct(flat, parent, found) if found >= 0 else []
+        result = PlanResult(path, found >= 0, iterations, log.visited())
+        if stats is None:
+            return result
+        # Dropped unverified entries are counted as stale pops.
+        stats.heap_pops = iterations + stale
+        stats.stale_pops = stale
+        stats.heap_pushes = stats.heap_pops + len(open_heap)
+        stats.nodes_generated = flat.size - g_score.count(float("inf"))
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.total_time = perf_counter() - t_start
+        return replace(result, stats=stats)
+
+    def _search_sparse(
+        self, grid: Grid3D, tree: OccupancyOctree, start_id: int, goal_id: int
+    ) -> PlanResult:
+        # _search on the octree: node states are looked up (and memoized per
+        # query) instead of indexed, and g/parent/closed only hold touched nodes.
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        world = grid.world
+        node_state = tree.node_state
+        states: Dict[int, int] = {}
+        to_point = tree.to_point
+        gx, gy, gz = to_point(goal_id)
+        offsets = tree.neighbors(self.allow_diagonal)
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        push, pop = heapq.heappush, heapq.heappop
+        inf = float("inf")
+
+        g_score: Dict[int, float] = {start_id: 0.0}
+        parent: Dict[int, int] = {}
+        closed: Set[int] = set()
+        open_heap: List[Tuple[float, float, int]] = [(0.0, 0.0, start_id)]
+
+        log = VisitLog(tree, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+        iterations = stale = 0
+        found = -1
+        while open_heap:
+            _, curr_g, curr = pop(open_heap)
+            if curr in closed:
+                stale += 1
+                continue
+            closed.add(curr)
+            iterations += 1
+            if record is not None and iterations % every == 0:
+                record(curr)
+            if curr == goal_id:
+                found = curr
+                break
+
+            curr_p = to_point(curr)
+            check_edges = states.get(curr, NEAR) == NEAR
+            pending = []
+            for step, cost in offsets:
+                nxt = curr + step
+                state = states.get(nxt)
+                if state is None:
+                    state = states[nxt] = node_state(nxt)
+                if state == OCCUPIED or nxt in closed:
+                    continue
+                tentative_g = curr_g + cost
+                if tentative_g >= g_score.get(nxt, inf):
+                    continue
+                nxt_p = to_point(nxt)
+                if check_edges and state == NEAR:
+                    pending.append((nxt, nxt_p, tentative_g))
+                    continue
+                g_score[nxt] = tentative_g
+                parent[nxt] = curr
+                hx, hy, hz = nxt_p[0] - gx, nxt_p[1] - gy, nxt_p[2] - gz
+                push(open_heap, (tentative_g + (hx * hx + hy * hy + hz * hz) ** 0.5, tentative_g, nxt))
+
+            if not pending:
+                continue
+            if stats is not None:
+                t0 = perf_counter()
+            if cache is not None:
+                hits = cache.edges_collide(curr, curr_p, [(nxt, p) for nxt, p, _ in pending])
+            else:
+                hits = world.path_collides_fan(curr_p, [p for _, p, _ in pending])
+            if stats is not None:
+                stats.collision_time += perf_counter() - t0
+                stats.segment_checks += len(pending)
+            for (nxt, nxt_p, tentative_g), hit in zip(pending, hits):
+                if hit:
+                    continue
+                g_score[nxt] = tentative_g
+                parent[nxt] = curr
+                hx, hy, hz = nxt_p[0] - gx, nxt_p[1] - gy, nxt_p[2] - gz
+                push(open_heap, (tentative_g + (hx * hx + hy * hy + hz * hz) ** 0.5, tentative_g, nxt))
+
+        path = []
+        if found >= 0:
+            node = found
+            path.append(to_point(node))
+            while node in parent:
+                node = parent[node]
+                path.append(to_point(node))
+            path.reverse()
+        result = PlanResult(path, found >= 0, iterations, log.visited())
+        if stats is None:
+            return result
+        stats.heap_pops = iterations + stale
+        stats.stale_pops = stale
+        stats.heap_pushes = stats.heap_pops + len(open_heap)
+        stats.nodes_generated = len(g_score)
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.total_time = perf_counter() - t_start
+        return replace(result, stats=stats)
+
+    @staticmethod
+    def _relax(
+        open_heap: List[Tuple[float, float, int]],
+        g_score: List[float],
+        parent: List[int],
+        curr: int,
+        item: Tuple[int, Point3, float],
+        gx: float,
+        gy: float,
+        gz: float,
+        heuristic: Sequence[float] | None = None,
+    ) -> None:
+        nxt, nxt_p, tentative_g = item
+        g_score[nxt] = tentative_g
+        parent[nxt] = curr
+        if heuristic is not None:
+            h = heuristic[nxt] * _TIE
+        else:
+            hx, hy, hz = nxt_p[0] - gx, nxt_p[1] - gy, nxt_p[2] - gz
+            h = (hx * hx + hy * hy + hz * hz) ** 0.5
+        heapq.heappush(open_heap, (tentative_g + h, tentative_g, nxt))
+
+    def _reconstruct(self, flat: FlatGrid, parent: List[int], current: int) -> List[Point3]:
+        path = [flat.to_point(current)]
+        while parent[current] >= 0:
+            current = parent[current]
+            path.append(flat.to_point(current))
         path.reverse()
         return path
@@ -1,9 +1,63 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
-from typing import List, Protocol
+from typing import Iterator, List, Protocol
 
+import numpy as np
+
+from ..modules.flat import FlatGrid
 from ..settings.types import Point3, World
+from .stats import PlanStats
+
+# How planners record popped nodes in PlanResult.visited:
+#   "full"    every pop as a Point3 (the original behaviour)
+#   "off"     nothing; visited is None
+#   "compact" every pop as a VisitedNodes id buffer
+#   "sampled" every k-th pop as a Point3
+RECORD_MODES = ("full", "off", "compact", "sampled")
+
+
+@dataclass(frozen=True, eq=False)
+class VisitedNodes:
+    # Pop order as FlatGrid ids (int64); 8 bytes per node instead of a tuple.
+    # Only the padded strides and the lattice origin/resolution are kept for
+    # decoding, so pickling a result does not drag the grid along.
+    ids: np.ndarray
+    stride_x: int
+    stride_y: int
+    origin: Point3
+    resolution: float
+
+    def points(self) -> np.ndarray:
+        # Same arithmetic as axis_coords, so points match FlatGrid.to_point exactly.
+        ix, rest = np.divmod(self.ids, self.stride_x)
+        iy, iz = np.divmod(rest, self.stride_y)
+        out = np.empty((len(self.ids), 3))
+        for axis, idx in enumerate((ix, iy, iz)):
+            out[:, axis] = self.origin[axis] + (idx - 1).astype(np.float64) * self.resolution
+        return out
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        pts = self.points()
+        return pts if dtype is None else pts.astype(dtype)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Point3]:
+        return (tuple(p) for p in self.points().tolist())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VisitedNodes):
+            return NotImplemented
+        return (
+            self.stride_x == other.stride_x
+            and self.stride_y == other.stride_y
+            and self.origin == other.origin
+            and self.resolution == other.resolution
+            and np.array_equal(self.ids, other.ids)
+        )
 
 
 @dataclass(frozen=True)
@@ -11,7 +65,39 @@ class PlanResult:
     path: List[Point3]
     success: bool
     iterations: int
-    visited: List[Point3] | None = None
+    visited: List[Point3] | VisitedNodes | None = None
+    stats: PlanStats | None = None
+
+
+class VisitLog:
+    # Collects popped ids inside a search loop. The loop only does
+    #     if log.add is not None and iterations % log.every == 0: log.add(node)
+    # so "off" costs one attribute test per pop.
+    def __init__(self, flat: FlatGrid, mode: str = "full", every: int = 1) -> None:
+        if mode not in RECORD_MODES:
+            raise ValueError(f"unknown record mode {mode!r}; expected one of {RECORD_MODES}")
+        if every < 1:
+            raise ValueError("sample interval must be >= 1")
+        self.flat = flat
+        self.mode = mode
+        self.every = every if mode == "sampled" else 1
+        self.ids = array("q")
+        self.add = None if mode == "off" else self.ids.append
+
+    def visited(self) -> List[Point3] | VisitedNodes | None:
+        if self.mode == "off":
+            return None
+        if self.mode == "compact":
+            flat = self.flat
+            return VisitedNodes(
+                np.frombuffer(self.ids, dtype=np.int64),
+                flat.stride_x,
+                flat.stride_y,
+                tuple(flat.grid.world.bounds_min),
+                flat.grid.resolution,
+            )
+        to_point = self.flat.to_point
+        return [to_point(node) for node in self.ids]
 
 
 class Planner(Protocol):
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import List, Tuple
+
+from ..modules.flat import FlatGrid
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World
+from .base import PlanResult, VisitLog
+from .stats import PlanStats, emit_stats, stats_enabled
+
+
+@dataclass
+class BidirectionalAStarPlanner:
+    # Forward and backward A* on the AStarPlanner grid graph; the side with the
+    # smaller open list expands next. Stops once the best meeting cost is no
+    # larger than either frontier's minimum f, which keeps the result optimal.
+    resolution: float = 0.5
+    allow_diagonal: bool = False
+    cache_edges: bool = True
+    # PlanResult.visited recording: "full", "off", "compact" or "sampled".
+    record_visited: str = "full"
+    sample_every: int = 10
+    # Attach PlanStats to results (also on while any stats hook is registered).
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+
+    def plan(self, world: World, start: Point3, goal: Point3) -> PlanResult:
+        world = world.inflate(self.robot_radius)
+        if self.resolution <= 0:
+            return PlanResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return PlanResult([], False, 0, [])
+
+        grid = Grid3D(world, self.resolution)
+        flat = grid.flat()
+        blocked, near = flat.blocked, flat.near
+        start_id = flat.to_id(grid.to_index(grid.snap(start)))
+        goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+        if blocked[start_id] or blocked[goal_id]:
+            return PlanResult([], False, 0, [])
+
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        to_point = flat.to_point
+        offsets = flat.neighbors(self.allow_diagonal)
+        targets = (to_point(goal_id), to_point(start_id))
+
+        def heuristic(node: int, side: int) -> float:
+            p, t = to_point(node), targets[side]
+            hx, hy, hz = p[0] - t[0], p[1] - t[1], p[2] - t[2]
+            return (hx * hx + hy * hy + hz * hz) ** 0.5
+
+        def edge_collides(u: int, v: int) -> bool:
+            if cache is not None:
+                return cache.edge_collides(u, v, to_point(u), to_point(v))
+            return world.path_collides(to_point(u), to_point(v))
+
+        if stats is not None:
+            edge_collides = stats.segments(edge_collides)
+
+        def edge_free(u: int, v: int) -> bool:
+            return not (near[u] and near[v]) or not edge_collides(u, v)
+
+        inf = float("inf")
+        g_score = ([inf] * flat.size, [inf] * flat.size)
+        parent = ([-1] * flat.size, [-1] * flat.size)
+        closed = (bytearray(flat.size), bytearray(flat.size))
+        g_score[0][start_id] = 0.0
+        g_score[1][goal_id] = 0.0
+        heaps: Tuple[List[Tuple[float, float, int]], ...] = (
+            [(heuristic(start_id, 0), 0.0, start_id)],
+            [(heuristic(goal_id, 1), 0.0, goal_id)],
+        )
+
+        best, meet = (0.0, start_id) if start_id == goal_id else (inf, -1)
+        log = VisitLog(flat, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+        iterations = stale = pushes = 0
+        while heaps[0] and heaps[1]:
+            # Heap tops (stale entries included) lower-bound any path not yet met.
+            if best <= max(heaps[0][0][0], heaps[1][0][0]):
+                break
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            other = 1 - side
+            _, curr_g, curr = heapq.heappop(heaps[side])
+            if closed[side][curr]:
+                stale += 1
+                continue
+            closed[side][curr] = 1
+            iterations += 1
+            if record is not None and iterations % every == 0:
+                record(curr)
+
+            g_side, g_other = g_score[side], g_score[other]
+            for step, cost in offsets:
+                nxt = curr + step
+                if blocked[nxt] or closed[side][nxt]:
+                    continue
+                tentative_g = curr_g + cost
+                if tentative_g >= g_side[nxt] or not edge_free(curr, nxt):
+                    continue
+                g_side[nxt] = tentative_g
+                parent[side][nxt] = curr
+                heapq.heappush(
+                    heaps[side], (tentative_g + heuristic(nxt, side), tentative_g, nxt)
+                )
+                pushes += 1
+                if tentative_g + g_other[nxt] < best:
+                    best, meet = tentative_g + g_other[nxt], nxt
+
+        path = self._reconstruct(flat, parent, meet) if meet >= 0 else []
+        result = PlanResult(path, meet >= 0, iterations, log.visited())
+        if stats is None:
+            return result
+        stats.heap_pops = iterations + stale
+        stats.stale_pops = stale
+        stats.heap_pushes = pushes + 2
+        # Counted per side; a node reached from both ends counts twice.
+        stats.nodes_generated = 2 * flat.size - g_score[0].count(inf) - g_score[1].count(inf)
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.total_time = perf_counter() - t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
+
+    def _reconstruct(
+        self, flat: FlatGrid, parent: Tuple[List[int], List[int]], meet: int
+    ) -> List[Point3]:
+        forward = [meet]
+        while parent[0][forward[-1]] >= 0:
+            forward.append(parent[0][forward[-1]])
+        forward.reverse()
+        node = meet
+        while parent[1][node] >= 0:
+            node = parent[1][node]
+            forward.append(node)
+        return [flat.to_point(n) for n in forward]
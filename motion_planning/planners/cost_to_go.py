@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+from ..modules.cache import LRUCache
+from ..modules.flat import FlatGrid
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World
+from .base import PlanResult
+
+# Fields are bounded by total array bytes rather than count: one field costs
+# 16 bytes per padded grid cell.
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+@dataclass(frozen=True)
+class CostToGoField:
+    # Exact cost-to-go to one goal over the AStarPlanner grid graph, from one
+    # backward Dijkstra sweep. cost[id] is inf where the goal is unreachable;
+    # succ[id] is the neighbour a node was settled through, i.e. the steepest
+    # descent step on cost, so extracting a path is a walk down succ.
+    flat: FlatGrid
+    goal_id: int
+    allow_diagonal: bool
+    cost: np.ndarray
+    succ: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.cost.nbytes + self.succ.nbytes
+
+    def value(self, p: Point3) -> float:
+        grid = self.flat.grid
+        if not grid.world.in_bounds(p):
+            return float("inf")
+        return float(self.cost[self.flat.to_id(grid.to_index(grid.snap(p)))])
+
+    def path(self, start: Point3) -> List[Point3]:
+        # O(path length); [] when start is out of bounds, blocked or cut off.
+        grid = self.flat.grid
+        if not grid.world.in_bounds(start):
+            return []
+        node = self.flat.to_id(grid.to_index(grid.snap(start)))
+        if self.cost[node] == np.inf:
+            return []
+        succ, to_point = self.succ, self.flat.to_point
+        path = [to_point(node)]
+        while node != self.goal_id:
+            node = int(succ[node])
+            path.append(to_point(node))
+        return path
+
+    def plan(self, start: Point3) -> PlanResult:
+        path = self.path(start)
+        return PlanResult(path, bool(path), len(path), None)
+
+
+_FIELD_CACHE: LRUCache[CostToGoField] = LRUCache(
+    maxsize=64, max_weight=DEFAULT_MAX_BYTES, weigh=lambda field: field.nbytes
+)
+
+
+def cost_to_go_field(
+    world: World,
+    goal: Point3,
+    resolution: float = 0.5,
+    allow_diagonal: bool = False,
+    cache_edges: bool = True,
+) -> CostToGoField | None:
+    # Cached per (world, goal cell, resolution, connectivity). None when the
+    # goal is out of bounds or blocked.
+    if resolution <= 0 or not world.in_bounds(goal):
+        return None
+    grid = Grid3D(world, resolution)
+    flat = grid.flat()
+    goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+    if flat.blocked[goal_id]:
+        return None
+    key = (world.fingerprint(), goal_id, resolution, allow_diagonal)
+    return _FIELD_CACHE.get_or_create(
+        key, lambda: _sweep(grid, goal_id, allow_diagonal, cache_edges)
+    )
+
+
+def set_cost_to_go_cache_limit(max_bytes: int) -> None:
+    _FIELD_CACHE.max_weight = max_bytes
+
+
+def clear_cost_to_go_cache() -> None:
+    _FIELD_CACHE.clear()
+
+
+def _sweep(grid: Grid3D, goal_id: int, allow_diagonal: bool, cache_edges: bool) -> CostToGoField:
+    # Dijkstra from the goal. Edges are undirected with the same validity rule
+    # as AStarPlanner (checked only when both ends are near an obstacle), so
+    # cost equals the optimal A* cost from every start.
+    flat = grid.flat()
+    world = grid.world
+    blocked, near = flat.blocked, flat.near
+    to_point = flat.to_point
+    offsets = flat.neighbors(allow_diagonal)
+    cache = grid.validity_cache() if cache_edges else None
+    push, pop = heapq.heappush, heapq.heappop
+
+    cost = [float("inf")] * flat.size
+    succ = [-1] * flat.size
+    closed = bytearray(flat.size)
+    cost[goal_id] = 0.0
+    succ[goal_id] = goal_id
+    heap = [(0.0, goal_id)]
+    while heap:
+        d, u = pop(heap)
+        if closed[u]:
+            continue
+        closed[u] = 1
+        check_edges = near[u]
+        pending = []
+        for step, c in offsets:
+            v = u + step
+            if blocked[v] or closed[v]:
+                continue
+            nd = d + c
+            if nd >= cost[v]:
+                continue
+            if check_edges and near[v]:
+                pending.append((v, nd))
+                continue
+            cost[v] = nd
+            succ[v] = u
+            push(heap, (nd, v))
+        if not pending:
+            continue
+        u_p = to_point(u)
+        if cache is not None:
+            hits = cache.edges_collide(u, u_p, [(v, to_point(v)) for v, _ in pending])
+        else:
+            hits = world.path_collides_fan(u_p, [to_point(v) for v, _ in pending])
+        for (v, nd), hit in zip(pending, hits):
+            if not hit:
+                cost[v] = nd
+                succ[v] = u
+                push(heap, (nd, v))
+
+    cost_arr = np.array(cost, dtype=np.float64)
+    succ_arr = np.array(succ, dtype=np.int64)
+    cost_arr.setflags(write=False)
+    succ_arr.setflags(write=False)
+    return CostToGoField(flat, goal_id, allow_diagonal, cost_arr, succ_arr)
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, replace
+from time import perf_counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ..modules.flat import near_pad
+from ..modules.grid import Grid3D
+from ..settings.types import Obstacle, Point3, World
+from .base import PlanResult, VisitLog
+from .stats import PlanStats, emit_stats, stats_enabled
+
+Key = Tuple[float, float]
+
+
+@dataclass
+class DStarLitePlanner:
+    # Incremental planner on the AStarPlanner grid graph (D* Lite, Koenig &
+    # Likhachev). plan() runs the initial backward search from the goal; update()
+    # applies obstacle deltas and repairs only the affected part of the search.
+    # PlanResult.iterations counts the vertices expanded by that call.
+    resolution: float = 0.5
+    allow_diagonal: bool = False
+    # PlanResult.visited recording: "full", "off", "compact" or "sampled".
+    record_visited: str = "full"
+    sample_every: int = 10
+    # Attach PlanStats to results (also on while any stats hook is registered);
+    # plan(), update() and move_start() each report their own work.
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+    world: World | None = field(default=None, init=False, repr=False)
+
+    def plan(self, world: World, start: Point3, goal: Point3) -> PlanResult:
+        world = world.inflate(self.robot_radius)
+        self.world = None
+        if self.resolution <= 0:
+            return PlanResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return PlanResult([], False, 0, [])
+
+        self._begin()
+        grid = Grid3D(world, self.resolution)
+        flat = grid.flat()
+        self.world = world
+        self._grid = grid
+        self._flat = flat
+        # Private copies: deltas edit occupancy in place.
+        self._blocked = bytearray(flat.blocked)
+        self._near = bytearray(flat.near)
+        self._edges: Dict[int, bool] = {}
+        self._offsets = flat.neighbors(self.allow_diagonal)
+        self._start = flat.to_id(grid.to_index(grid.snap(start)))
+        self._goal = flat.to_id(grid.to_index(grid.snap(goal)))
+        self._last = self._start
+        self._km = 0.0
+
+        inf = float("inf")
+        self._g = [inf] * flat.size
+        self._rhs = [inf] * flat.size
+        self._open: List[Tuple[float, float, int]] = []
+        self._queued: Dict[int, Key] = {}
+        self._rhs[self._goal] = 0.0
+        self._push(self._goal)
+        return self._solve()
+
+    def update(
+        self, added: Iterable[Obstacle] = (), removed: Iterable[Obstacle] = ()
+    ) -> PlanResult:
+        if self.world is None:
+            raise RuntimeError("call plan() before update()")
+        # Deltas are given in workspace terms, like the world passed to plan().
+        added = [obs.inflate(self.robot_radius) for obs in added]
+        given, removed = list(removed), []
+        obstacles = list(self.world.obstacles)
+        # Validate every removal before touching any planner state.
+        for obs in given:
+            inflated = obs.inflate(self.robot_radius)
+            if inflated not in obstacles:
+                raise ValueError(f"cannot remove {obs!r}: not an obstacle of the planned world")
+            obstacles.remove(inflated)
+            removed.append(inflated)
+        self._begin()
+        obstacles.extend(added)
+        self.world = World(self.world.bounds_min, self.world.bounds_max, obstacles)
+
+        touched: Set[int] = set()
+        for obs in added + removed:
+            touched.update(self._cells_near(obs))
+        stats = self._stats
+        t0 = perf_counter()
+        for node in touched:
+            self._blocked[node] = self.world.collides(self._flat.to_point(node))
+        if stats is not None:
+            stats.point_checks += len(touched)
+            stats.collision_time += perf_counter() - t0
+        for obs in added:
+            for node in self._cells_near(obs):
+                self._near[node] = 1
+        if removed:
+            self._refresh_near(removed)
+
+        # Every edge incident to a touched cell may have changed cost.
+        size = self._flat.size
+        dirty: Set[int] = set(touched)
+        for u in touched:
+            for step, _ in self._offsets:
+                v = u + step
+                self._edges.pop(u * size + v if u < v else v * size + u, None)
+                dirty.add(v)
+        for node in dirty:
+            self._update_vertex(node)
+        return self._solve()
+
+    def move_start(self, start: Point3) -> PlanResult:
+        # Robot moved along (or off) the path: shift keys by the heuristic drift.
+        if self.world is None:
+            raise RuntimeError("call plan() before move_start()")
+        self._begin()
+        node = self._flat.to_id(self._grid.to_index(self._grid.snap(start)))
+        self._km += self._h(self._last, node)
+        self._last = node
+        self._start = node
+        return self._solve()
+
+    # --- search core -----------------------------------------------------------------
+
+    def _begin(self) -> None:
+        self._stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        self._t_start = perf_counter()
+
+    def _solve(self) -> PlanResult:
+        log = VisitLog(self._flat, self.record_visited, self.sample_every)
+        if self._blocked[self._start] or self._blocked[self._goal]:
+            result = PlanResult([], False, 0, log.visited())
+        else:
+            iterations = self._compute_shortest_path(log)
+            if self._rhs[self._start] == float("inf"):
+                result = PlanResult([], False, iterations, log.visited())
+            else:
+                result = PlanResult(self._extract_path(), True, iterations, log.visited())
+        stats = self._stats
+        if stats is None:
+            return result
+        inf = float("inf")
+        stats.nodes_generated = sum(1 for g, rhs in zip(self._g, self._rhs) if g < inf or rhs < inf)
+        stats.total_time = perf_counter() - self._t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
+
+    def _compute_shortest_path(self, log: VisitLog) -> int:
+        g, rhs, queued, start = self._g, self._rhs, self._queued, self._start
+        record, every = log.add, log.every
+        stats = self._stats
+        iterations = 0
+        while self._open:
+            k1, k2, u = self._open[0]
+            if queued.get(u) != (k1, k2):
+                heapq.heappop(self._open)
+                if stats is not None:
+                    stats.heap_pops += 1
+                    stats.stale_pops += 1
+                continue
+            start_key = self._key(start)
+            if (k1, k2) >= start_key and rhs[start] == g[start]:
+                break
+            heapq.heappop(self._open)
+            if stats is not None:
+                stats.heap_pops += 1
+            del queued[u]
+            new_key = self._key(u)
+            if (k1, k2) < new_key:
+                self._push(u, new_key)
+                continue
+            iterations += 1
+            if record is not None and iterations % every == 0:
+                record(u)
+            if g[u] > rhs[u]:
+                g[u] = rhs[u]
+                for v, _ in self._neighbors(u):
+                    self._update_vertex(v)
+            else:
+                g[u] = float("inf")
+                self._update_vertex(u)
+                for v, _ in self._neighbors(u):
+                    self._update_vertex(v)
+        return iterations
+
+    def _update_vertex(self, u: int) -> None:
+        if u != self._goal:
+            best = float("inf")
+            blocked = self._blocked
+            if not blocked[u]:
+                g = self._g
+                for step, cost in self._offsets:
+                    v = u + step
+                    # Edge checks only for neighbours that would lower rhs.
+                    if not blocked[v] and cost + g[v] < best and self._edge_free(u, v):
+                        best = cost + g[v]
+            self._rhs[u] = best
+        self._queued.pop(u, None)
+        if self._g[u] != self._rhs[u]:
+            self._push(u)
+
+    def _neighbors(self, u: int):
+        # Traversable neighbours of u with their edge cost.
+        blocked = self._blocked
+        if blocked[u]:
+            return
+        for step, cost in self._offsets:
+            v = u + step
+            if not blocked[v] and self._edge_free(u, v):
+                yield v, cost
+
+    def _edge_free(self, u: int, v: int) -> bool:
+        if not (self._near[u] and self._near[v]):
+            return True
+        size = self._flat.size
+        key = u * size + v if u < v else v * size + u
+        free = self._edges.get(key)
+        if free is None:
+            to_point = self._flat.to_point
+            t0 = perf_counter()
+            free = not self.world.path_collides(to_point(u), to_point(v))
+            self._edges[key] = free
+            stats = self._stats
+            if stats is not None:
+                stats.segment_checks += 1
+                stats.collision_time += perf_counter() - t0
+        return free
+
+    def _extract_path(self) -> List[Point3]:
+        node = self._start
+        path = [self._flat.to_point(node)]
+        g = self._g
+        for _ in range(self._flat.size):
+            if node == self._goal:
+                return path
+            node = min(self._neighbors(node), key=lambda vc: vc[1] + g[vc[0]])[0]
+            path.append(self._flat.to_point(node))
+        return path
+
+    def _key(self, u: int) -> Key:
+        m = min(self._g[u], self._rhs[u])
+        return (m + self._h(self._start, u) + self._km, m)
+
+    def _push(self, u: int, key: Key | None = None) -> None:
+        key = key or self._key(u)
+        self._queued[u] = key
+        heapq.heappush(self._open, (key[0], key[1], u))
+        if self._stats is not None:
+            self._stats.heap_pushes += 1
+
+    def _h(self, a: int, b: int) -> float:
+        pa, pb = self._flat.to_point(a), self._flat.to_point(b)
+        dx, dy, dz = pa[0] - pb[0], pa[1] - pb[1], pa[2] - pb[2]
+        return (dx * dx + dy * dy + dz * dz) ** 0.5
+
+    # --- deltas ----------------------------------------------------------------------
+
+    def _refresh_near(self, removed: List[Obstacle]) -> None:
+        # Cells near a removed obstacle stay near only if another obstacle's
+        # grown AABB still covers them; same test as FlatGrid.near.
+        cleared = set()
+        for obs in removed:
+            cleared.update(self._cells_near(obs))
+        for node in cleared:
+            self._near[node] = 0
+        pad = near_pad(self._grid)
+        boxes = [obs.aabb() for obs in removed]
+        for obs in self.world.obstacles:
+            mn, mx = obs.aabb()
+            if any(
+                all(mn[k] - pad <= bmx[k] + pad and bmn[k] - pad <= mx[k] + pad for k in range(3))
+                for bmn, bmx in boxes
+            ):
+                for node in self._cells_near(obs):
+                    if node in cleared:
+                        self._near[node] = 1
+
+    def _cells_near(self, obs: Obstacle) -> List[int]:
+        # Cells whose edges can touch obs: its AABB grown by one cell.
+        mn, mx = obs.aabb()
+        flat = self._flat
+        pad = near_pad(self._grid)
+        ranges = []
+        for coords, lo, hi in zip((flat.xs, flat.ys, flat.zs), mn, mx):
+            ranges.append(range(bisect_left(coords, lo - pad), bisect_right(coords, hi + pad)))
+        return [flat.to_id((ix, iy, iz)) for ix in ranges[0] for iy in ranges[1] for iz in ranges[2]]
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from collections import deque
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from ..modules.cache import LRUCache
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World, distance
+from .astar import AStarPlanner
+from .base import PlanResult
+from .stats import emit_stats, stats_enabled
+
+Cluster = Tuple[int, int, int]
+
+_GRAPH_CACHE: LRUCache["ClusterGraph"] = LRUCache(maxsize=8)
+
+
+@dataclass(frozen=True)
+class HierarchicalResult(PlanResult):
+    # cost(path) <= bound * optimal grid cost. The optimum is bounded below by
+    # the obstacle-free grid distance from start to goal, so this is the ratio
+    # achieved against that; 1.0 means provably optimal (always the case for the
+    # full A* fallback). inf when no path was found.
+    bound: float = float("inf")
+
+
+@dataclass
+class HierarchicalPlanner:
+    # HPA*-style planning: search a cached portal graph over cluster_size^3
+    # blocks of the grid, then run A* only inside the corridor of clusters the
+    # abstract path visits (grown by corridor_margin clusters).
+    #
+    # The returned path is optimal among grid paths that stay in the corridor,
+    # so it is never worse than the abstract path, and a margin covering the
+    # whole world reduces to plain A*. Corridor paths carry no a-priori bound;
+    # HierarchicalResult.bound reports the one achieved (see there). Falls back
+    # to full A* when the portal graph has no route (e.g. a passage only
+    # crossable diagonally at a cluster corner).
+    resolution: float = 0.5
+    allow_diagonal: bool = True
+    cluster_size: int = 8
+    portal_spacing: int | None = None
+    corridor_margin: int = 0
+    # PlanResult.visited recording: "full", "off", "compact" or "sampled".
+    record_visited: str = "full"
+    sample_every: int = 10
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+
+    def plan(self, world: World, start: Point3, goal: Point3) -> HierarchicalResult:
+        world = world.inflate(self.robot_radius)
+        if self.resolution <= 0 or self.cluster_size <= 0:
+            return HierarchicalResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return HierarchicalResult([], False, 0, [])
+
+        t_start = perf_counter()
+        grid = Grid3D(world, self.resolution)
+        flat = grid.flat()
+        start_id = flat.to_id(grid.to_index(grid.snap(start)))
+        goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+        if flat.blocked[start_id] or flat.blocked[goal_id]:
+            return HierarchicalResult([], False, 0, [])
+
+        graph = self.graph(grid)
+        route, expansions = graph.search(start_id, goal_id)
+        low = AStarPlanner(
+            self.resolution,
+            self.allow_diagonal,
+            record_visited=self.record_visited,
+            sample_every=self.sample_every,
+            collect_stats=stats_enabled(self.collect_stats),
+        )
+        if route is None:
+            result = low._search(grid, flat.blocked, start_id, goal_id)
+            bound = 1.0
+        else:
+            mask = graph.corridor_mask(route, self.corridor_margin)
+            result = low._search(grid, mask, start_id, goal_id)
+            lower = graph.open_distance(start_id, goal_id)
+            cost = sum(distance(a, b) for a, b in zip(result.path, result.path[1:]))
+            bound = cost / lower if lower > 0 else 1.0
+        stats = result.stats
+        if stats is not None:
+            # Low-level A* counters plus the portal-graph search and graph lookup.
+            stats.total_time = perf_counter() - t_start
+            emit_stats(self, stats)
+        return HierarchicalResult(
+            result.path,
+            result.success,
+            expansions + result.iterations,
+            result.visited,
+            stats,
+            bound=bound if result.success else float("inf"),
+        )
+
+    def graph(self, grid: Grid3D) -> "ClusterGraph":
+        spacing = self.portal_spacing or self.cluster_size
+        key = (
+            grid.world.fingerprint(),
+            grid.resolution,
+            self.cluster_size,
+            spacing,
+            self.allow_diagonal,
+        )
+        return _GRAPH_CACHE.get_or_create(
+            key, lambda: ClusterGraph(grid, self.cluster_size, spacing, self.allow_diagonal)
+        )
+
+
+class ClusterGraph:
+    # Portal nodes are flat ids of boundary cells. Inter-cluster edges are found
+    # at construction; intra-cluster edges are filled in per cluster on first use
+    # and kept, so later queries on the same world reuse them.
+    def __init__(self, grid: Grid3D, cluster_size: int, spacing: int, allow_diagonal: bool) -> None:
+        self.grid = grid
+        self.flat = flat = grid.flat()
+        self.cluster_size = cluster_size
+        self.allow_diagonal = allow_diagonal
+        self.offsets = flat.neighbors(allow_diagonal)
+        self._validity = grid.validity_cache()
+        padded = tuple(d + 2 for d in flat.dims)
+        self._blocked = np.frombuffer(flat.blocked, dtype=np.uint8).reshape(padded)
+        near = np.frombuffer(flat.near, dtype=np.uint8).reshape(padded)[1:-1, 1:-1, 1:-1]
+
+        c = cluster_size
+        self.shape = tuple(-(-d // c) for d in flat.dims)
+        # Clusters without near cells have no obstacles touching any inner edge,
+        # so inner distances have a closed form.
+        self._clean: Set[Cluster] = {
+            cl
+            for cl in np.ndindex(*self.shape)
+            if not near[tuple(slice(k * c, (k + 1) * c) for k in cl)].any()
+        }
+        self.portals: Dict[Cluster, List[int]] = {}
+        self.edges: Dict[int, List[Tuple[int, float]]] = {}
+        self._intra_done: Set[Cluster] = set()
+        # Graphs are shared through _GRAPH_CACHE, so lazy fills may race.
+        self._intra_lock = threading.Lock()
+        self._build_entrances(spacing)
+
+    def complete(self) -> "ClusterGraph":
+        # Fill in every intra-cluster edge now instead of on first use.
+        for cluster in self.portals:
+            self._ensure_intra(cluster)
+        return self
+
+    def cluster_of(self, node: int) -> Cluster:
+        ix, iy, iz = self.flat.to_index(node)
+        c = self.cluster_size
+        return (ix // c, iy // c, iz // c)
+
+    def open_distance(self, a: int, b: int) -> float:
+        # Shortest grid distance from a to b ignoring obstacles: exact inside clean
+        # clusters and a lower bound on any grid path elsewhere.
+        ia, ib = self.flat.to_index(a), self.flat.to_index(b)
+        d = sorted((abs(ia[k] - ib[k]) for k in range(3)), reverse=True)
+        res = self.grid.resolution
+        if not self.allow_diagonal:
+            return res * (d[0] + d[1] + d[2])
+        return res * (d[2] * 3.0 ** 0.5 + (d[1] - d[2]) * 2.0 ** 0.5 + (d[0] - d[1]))
+
+    def search(self, start: int, goal: int) -> Tuple[List[int] | None, int]:
+        # Abstract A* from start to goal; returns (node route, expansions).
+        c_start, c_goal = self.cluster_of(start), self.cluster_of(goal)
+        from_start = self._distances(start, c_start, self.portals.get(c_start, []) + [goal])
+        to_goal = self._distances(goal, c_goal, self.portals.get(c_goal, []))
+        if c_start != c_goal:
+            from_start.pop(goal, None)
+
+        to_point = self.flat.to_point
+        gp = to_point(goal)
+
+        def heuristic(node: int) -> float:
+            p = to_point(node)
+            dx, dy, dz = p[0] - gp[0], p[1] - gp[1], p[2] - gp[2]
+            return (dx * dx + dy * dy + dz * dz) ** 0.5
+
+        g_score: Dict[int, float] = {start: 0.0}
+        parent: Dict[int, int] = {}
+        closed: Set[int] = set()
+        open_heap = [(heuristic(start), 0.0, start)]
+        expansions = 0
+        while open_heap:
+            _, g, u = heapq.heappop(open_heap)
+            if u in closed:
+                continue
+            closed.add(u)
+            expansions += 1
+            if u == goal:
+                route = [u]
+                while route[-1] in parent:
+                    route.append(parent[route[-1]])
+                route.reverse()
+                return route, expansions
+            if u == start:
+                successors = list(from_start.items())
+            else:
+                self._ensure_intra(self.cluster_of(u))
+                successors = list(self.edges.get(u, ()))
+                if u in to_goal:
+                    successors.append((goal, to_goal[u]))
+            for v, cost in successors:
+                if v in closed:
+                    continue
+                tentative = g + cost
+                if tentative < g_score.get(v, float("inf")):
+                    g_score[v] = tentative
+                    parent[v] = u
+                    heapq.heappush(open_heap, (tentative + heuristic(v), tentative, v))
+        return None, expansions
+
+    def corridor_mask(self, route: List[int], margin: int = 0) -> bytes:
+        # Blocked mask with everything outside the route's clusters closed off.
+        c = self.cluster_size
+        outside = np.ones_like(self._blocked)
+        for cl in {self.cluster_of(n) for n in route}:
+            lo = [max(k - margin, 0) * c + 1 for k in cl]
+            hi = [(k + margin + 1) * c + 1 for k in cl]
+            outside[lo[0] : hi[0], lo[1] : hi[1], lo[2] : hi[2]] = 0
+        return (self._blocked | outside).tobytes()
+
+    # --- construction ----------------------------------------------------------------
+
+    def _build_entrances(self, spacing: int) -> None:
+        flat = self.flat
+        dims = flat.dims
+        c = self.cluster_size
+        free = self._blocked[1:-1, 1:-1, 1:-1] == 0
+        step_cost = self.grid.resolution
+        for axis in range(3):
+            step = flat.offset_id(tuple(1 if k == axis else 0 for k in range(3)))
+            other = [k for k in range(3) if k != axis]
+            for boundary in range(c, dims[axis], c):
+                lo_plane = np.take(free, boundary - 1, axis=axis)
+                hi_plane = np.take(free, boundary, axis=axis)
+                valid = lo_plane & hi_plane
+                for cu in range(self.shape[other[0]]):
+                    for cv in range(self.shape[other[1]]):
+                        block = valid[cu * c : (cu + 1) * c, cv * c : (cv + 1) * c]
+                        for u, v in self._pick_portals(block, spacing):
+                            idx = [0, 0, 0]
+                            idx[axis] = boundary - 1
+                            idx[other[0]] = cu * c + u
+                            idx[other[1]] = cv * c + v
+                            a = flat.to_id((idx[0], idx[1], idx[2]))
+                            b = a + step
+                            if not self._edge_free(a, b):
+                                continue
+                            self._add_portal(a)
+                            self._add_portal(b)
+                            self.edges[a].append((b, step_cost))
+                            self.edges[b].append((a, step_cost))
+
+    def _pick_portals(self, block: np.ndarray, spacing: int) -> List[Tuple[int, int]]:
+        # One portal per connected entrance (closest to its centroid), plus a
+        # lattice every `spacing` cells along long entrances.
+        picks: List[Tuple[int, int]] = []
+        seen = np.zeros_like(block)
+        half = spacing // 2
+        for start in zip(*np.nonzero(block)):
+            if seen[start]:
+                continue
+            component = []
+            queue = deque([start])
+            seen[start] = True
+            while queue:
+                u, v = queue.popleft()
+                component.append((int(u), int(v)))
+                for nu, nv in ((u - 1, v), (u + 1, v), (u, v - 1), (u, v + 1)):
+                    if 0 <= nu < block.shape[0] and 0 <= nv < block.shape[1]:
+                        if block[nu, nv] and not seen[nu, nv]:
+                            seen[nu, nv] = True
+                            queue.append((nu, nv))
+            mu = sum(u for u, _ in component) / len(component)
+            mv = sum(v for _, v in component) / len(component)
+            chosen = {min(component, key=lambda p: (p[0] - mu) ** 2 + (p[1] - mv) ** 2)}
+            chosen.update(p for p in component if p[0] % spacing == half and p[1] % spacing == half)
+            picks.extend(sorted(chosen))
+        return picks
+
+    def _add_portal(self, node: int) -> None:
+        if node in self.edges:
+            return
+        self.edges[node] = []
+        self.portals.setdefault(self.cluster_of(node), []).append(node)
+
+    def _ensure_intra(self, cluster: Cluster) -> None:
+        if cluster in self._intra_done:
+            return
+        with self._intra_lock:
+            if cluster in self._intra_done:
+                return
+            nodes = self.portals.get(cluster, [])
+            for i, u in enumerate(nodes):
+                for v, d in self._distances(u, cluster, nodes[i + 1 :]).items():
+                    self.edges[u].append((v, d))
+                    self.edges[v].append((u, d))
+            # Marked only once filled: readers skip the lock on this test.
+            self._intra_done.add(cluster)
+
+    # --- in-cluster distances --------------------------------------------------------
+
+    def _distances(self, source: int, cluster: Cluster, targets: List[int]) -> Dict[int, float]:
+        targets = [t for t in targets if t != source]
+        if not targets:
+            return {}
+        if cluster in self._clean:
+            return {t: self.open_distance(source, t) for t in targets}
+        return self._dijkstra(source, cluster, set(targets))
+
+    def _dijkstra(self, source: int, cluster: Cluster, targets: Set[int]) -> Dict[int, float]:
+        flat = self.flat
+        blocked, near, to_point = flat.blocked, flat.near, flat.to_point
+        members = self._members(cluster)
+        inf = float("inf")
+
+        dist: Dict[int, float] = {source: 0.0}
+        found: Dict[int, float] = {}
+        heap = [(0.0, source)]
+        while heap and len(found) < len(targets):
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u in targets:
+                found[u] = d
+            pending = []
+            for step, cost in self.offsets:
+                v = u + step
+                if v not in members or blocked[v]:
+                    continue
+                nd = d + cost
+                if nd >= dist.get(v, inf):
+                    continue
+                if near[u] and near[v]:
+                    pending.append((v, nd))
+                    continue
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+            if pending:
+                hits = self._validity.edges_collide(u, to_point(u), [(v, to_point(v)) for v, _ in pending])
+                for (v, nd), hit in zip(pending, hits):
+                    if not hit:
+                        dist[v] = nd
+                        heapq.heappush(heap, (nd, v))
+        return found
+
+    def _members(self, cluster: Cluster) -> Set[int]:
+        c = self.cluster_size
+        flat = self.flat
+        ranges = [range(k * c, min((k + 1) * c, d)) for k, d in zip(cluster, flat.dims)]
+        return {flat.to_id((ix, iy, iz)) for ix in ranges[0] for iy in ranges[1] for iz in ranges[2]}
+
+    def _edge_free(self, u: int, v: int) -> bool:
+        near = self.flat.near
+        if not (near[u] and near[v]):
+            return True
+        to_point = self.flat.to_point
+        return not self._validity.edge_collides(u, v, to_point(u), to_point(v))
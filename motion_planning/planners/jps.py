@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from ..modules.flat import FlatGrid
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World
+from .base import PlanResult, VisitLog
+from .stats import PlanStats, emit_stats, stats_enabled
+
+Direction = Tuple[int, int, int]
+
+
+@dataclass
+class JPSPlanner:
+    # 26-connected Jump Point Search on the same grid graph as AStarPlanner.
+    # Nodes whose neighbourhood touches an obstacle (FlatGrid.near) are always
+    # jump points and expand every neighbour; elsewhere only the natural
+    # (canonical) successors are kept and straight/diagonal runs are jumped over.
+    resolution: float = 0.5
+    cache_edges: bool = True
+    # PlanResult.visited recording: "full", "off", "compact" or "sampled".
+    record_visited: str = "full"
+    sample_every: int = 10
+    # Attach PlanStats to results (also on while any stats hook is registered).
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+
+    def plan(self, world: World, start: Point3, goal: Point3) -> PlanResult:
+        world = world.inflate(self.robot_radius)
+        if self.resolution <= 0:
+            return PlanResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return PlanResult([], False, 0, [])
+
+        grid = Grid3D(world, self.resolution)
+        flat = grid.flat()
+        blocked, near = flat.blocked, flat.near
+        start_id = flat.to_id(grid.to_index(grid.snap(start)))
+        goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+        if blocked[start_id] or blocked[goal_id]:
+            return PlanResult([], False, 0, [])
+
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        to_point = flat.to_point
+        gx, gy, gz = to_point(goal_id)
+
+        dirs = flat.offsets(True)
+        steps = [flat.offset_id(o) for o, _ in dirs]
+        costs = [c for _, c in dirs]
+        dir_index = {o: i for i, (o, _) in enumerate(dirs)}
+        natural = [[dir_index[s] for s in _natural(o)] for o, _ in dirs]
+        # Sub-directions probed at every step of a diagonal jump.
+        probes = [[dir_index[s] for s in _natural(o) if s != o] for o, _ in dirs]
+        all_dirs = list(range(len(dirs)))
+
+        def edge_free(u: int, v: int) -> bool:
+            if cache is not None:
+                return not cache.edge_collides(u, v, to_point(u), to_point(v))
+            return not world.path_collides(to_point(u), to_point(v))
+
+        if stats is not None:
+            edge_free = stats.segments(edge_free)
+
+        # Jump results only depend on what lies ahead along the ray, so every
+        # node on a scanned run shares the same answer; memoize per direction.
+        memo: List[Dict[int, int]] = [{} for _ in dirs]
+
+        def jump(u: int, d: int) -> int:
+            # Next jump point from u along direction d, or -1.
+            seen = memo[d]
+            found = seen.get(u)
+            if found is not None:
+                return found
+            step = steps[d]
+            sub = probes[d]
+            run = [u]
+            v = u
+            found = -1
+            while True:
+                nxt = v + step
+                if blocked[nxt]:
+                    break
+                # An edge is free unless both ends are near; only the first step
+                # of a jump can start at a near node.
+                if near[v] and near[nxt] and not edge_free(v, nxt):
+                    break
+                if nxt == goal_id or near[nxt]:
+                    found = nxt
+                    break
+                if any(jump(nxt, s) >= 0 for s in sub):
+                    found = nxt
+                    break
+                known = seen.get(nxt)
+                if known is not None:
+                    found = known
+                    break
+                run.append(nxt)
+                v = nxt
+            for node in run:
+                seen[node] = found
+            return found
+
+        def heuristic(node: int) -> float:
+            p = to_point(node)
+            hx, hy, hz = p[0] - gx, p[1] - gy, p[2] - gz
+            return (hx * hx + hy * hy + hz * hz) ** 0.5
+
+        g_score = [float("inf")] * flat.size
+        parent = [-1] * flat.size
+        closed = bytearray(flat.size)
+        g_score[start_id] = 0.0
+        # Heap entries carry the arrival direction (-1 at the start).
+        open_heap: List[Tuple[float, float, int, int]] = [(heuristic(start_id), 0.0, start_id, -1)]
+
+        log = VisitLog(flat, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+        iterations = stale = pushes = 0
+        found = -1
+        while open_heap:
+            _, curr_g, curr, d = heapq.heappop(open_heap)
+            if closed[curr]:
+                stale += 1
+                continue
+            closed[curr] = 1
+            iterations += 1
+            if record is not None and iterations % every == 0:
+                record(curr)
+            if curr == goal_id:
+                found = curr
+                break
+
+            successors = all_dirs if d < 0 or near[curr] else natural[d]
+            for e in successors:
+                first = curr + steps[e]
+                if blocked[first]:
+                    continue
+                # A near first cell is itself the jump point; skip the edge check
+                # unless it would improve that cell, as plain A* does.
+                if near[first] and (closed[first] or curr_g + costs[e] >= g_score[first]):
+                    continue
+                nxt = jump(curr, e)
+                if nxt < 0 or closed[nxt]:
+                    continue
+                tentative_g = curr_g + (nxt - curr) // steps[e] * costs[e]
+                if tentative_g < g_score[nxt]:
+                    g_score[nxt] = tentative_g
+                    parent[nxt] = curr
+                    heapq.heappush(
+                        open_heap, (tentative_g + heuristic(nxt), tentative_g, nxt, e)
+                    )
+                    pushes += 1
+
+        path = self._reconstruct(flat, parent, found) if found >= 0 else []
+        result = PlanResult(path, found >= 0, iterations, log.visited())
+        if stats is None:
+            return result
+        stats.heap_pops = iterations + stale
+        stats.stale_pops = stale
+        stats.heap_pushes = pushes + 1
+        stats.nodes_generated = flat.size - g_score.count(float("inf"))
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.total_time = perf_counter() - t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
+
+    def _reconstruct(self, flat: FlatGrid, parent: List[int], current: int) -> List[Point3]:
+        # Jump points are joined by straight runs; emit every cell along them.
+        nodes = [current]
+        while parent[current] >= 0:
+            current = parent[current]
+            nodes.append(current)
+        nodes.reverse()
+        path = [flat.to_point(nodes[0])]
+        for a, b in zip(nodes, nodes[1:]):
+            ia, ib = flat.to_index(a), flat.to_index(b)
+            n = max(abs(ib[k] - ia[k]) for k in range(3))
+            step = tuple((ib[k] - ia[k]) // n for k in range(3))
+            for i in range(1, n + 1):
+                path.append(flat.to_point(a + i * flat.offset_id(step)))
+        return path
+
+
+def _natural(d: Direction) -> List[Direction]:
+    # d and every direction obtained by zeroing a subset of its non-zero components.
+    axes = [k for k in range(3) if d[k] != 0]
+    out: List[Direction] = []
+    for mask in range(1, 1 << len(axes)):
+        o = [0, 0, 0]
+        for j, k in enumerate(axes):
+            if mask >> j & 1:
+                o[k] = d[k]
+        out.append((o[0], o[1], o[2]))
+    return out
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from typing import Iterable, Iterator, Sequence, Tuple
+
+from ..modules.flat import FlatGrid, flat_from_masks, seed_flat_cache
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World
+from .astar import AStarPlanner
+from .base import PlanResult, Planner
+
+Query = Tuple[Point3, Point3]
+
+# Per-process state installed once by the pool initializer.
+_WORKER_PLANNER: Planner | None = None
+_WORKER_WORLD: World | None = None
+
+
+def plan_many(
+    world: World,
+    queries: Iterable[Query],
+    planner: Planner | None = None,
+    workers: int | None = None,
+    ordered: bool = True,
+    chunksize: int = 1,
+) -> Iterator[Tuple[int, PlanResult]]:
+    # Yields (query index, result) as results arrive. ordered=False yields in
+    # completion order. The world and its precomputed grid masks travel to each
+    # worker once through the pool initializer instead of with every query.
+    planner = planner or AStarPlanner()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = ((i, start, goal) for i, (start, goal) in enumerate(queries))
+
+    if workers <= 1:
+        for i, start, goal in tasks:
+            yield i, planner.plan(world, start, goal)
+        return
+
+    # Only the masks are shipped: a FlatGrid would carry its grid's world a
+    # second time, and the worker rebuilds the rest from the world cheaply.
+    flat = precompute_grid(planner, world)
+    masks = None if flat is None else (flat.blocked, flat.near)
+    with multiprocessing.Pool(
+        workers, initializer=_init_worker, initargs=(planner, world, masks)
+    ) as pool:
+        run = pool.imap if ordered else pool.imap_unordered
+        yield from run(_run_query, tasks, chunksize)
+
+
+def plan_all(
+    world: World,
+    queries: Sequence[Query],
+    planner: Planner | None = None,
+    workers: int | None = None,
+    chunksize: int = 1,
+) -> list[PlanResult]:
+    return [r for _, r in plan_many(world, queries, planner, workers, True, chunksize)]
+
+
+def _planner_grid(planner: Planner, world: World) -> Grid3D | None:
+    # The grid a grid planner searches: the configuration space at its resolution.
+    resolution = getattr(planner, "resolution", None)
+    if resolution is None or resolution <= 0:
+        return None
+    return Grid3D(world.inflate(getattr(planner, "robot_radius", 0.0)), resolution)
+
+
+def precompute_grid(planner: Planner, world: World) -> FlatGrid | None:
+    # The flat grid a grid planner will search (None for other planners), built
+    # up front so workers, or PlanningService threads, can be seeded with it.
+    grid = _planner_grid(planner, world)
+    return None if grid is None else grid.flat()
+
+
+def _init_worker(planner: Planner, world: World, masks: Tuple[bytes, bytes] | None) -> None:
+    global _WORKER_PLANNER, _WORKER_WORLD
+    _WORKER_PLANNER = planner
+    _WORKER_WORLD = world
+    grid = _planner_grid(planner, world) if masks is not None else None
+    if grid is not None:
+        seed_flat_cache(flat_from_masks(grid, *masks))
+
+
+def _run_query(task: Tuple[int, Point3, Point3]) -> Tuple[int, PlanResult]:
+    i, start, goal = task
+    assert _WORKER_PLANNER is not None and _WORKER_WORLD is not None
+    return i, _WORKER_PLANNER.plan(_WORKER_WORLD, start, goal)
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import heapq
+import multiprocessing
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..modules.cache import LRUCache
+from ..settings.env import RandomWorld
+from ..settings.types import Point3, World, world_key
+from .base import PlanResult
+from .stats import PlanStats, emit_stats, stats_enabled
+
+# Rows of the neighbour distance matrix and edges checked per task (one pool
+# task each when workers > 1).
+_KNN_ROWS = 256
+_EDGE_CHUNK = 4096
+
+
+@dataclass(frozen=True, eq=False)
+class Roadmap:
+    # Undirected PRM graph in CSR form: the neighbours of node i are
+    # indices[indptr[i]:indptr[i + 1]] at edge lengths weights[...]. world_id is
+    # world_key() of the world it was built for.
+    world_id: str
+    nodes: np.ndarray
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    def __post_init__(self) -> None:
+        # Python-side adjacency for the query loop, built once per roadmap.
+        points = [tuple(p) for p in self.nodes.tolist()]
+        ptr, idx, w = self.indptr.tolist(), self.indices.tolist(), self.weights.tolist()
+        adj = [
+            list(zip(idx[ptr[i] : ptr[i + 1]], w[ptr[i] : ptr[i + 1]])) for i in range(len(points))
+        ]
+        object.__setattr__(self, "_points", points)
+        object.__setattr__(self, "_adj", adj)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as fh:
+            np.savez(
+                fh,
+                world_id=np.array(self.world_id),
+                nodes=self.nodes,
+                indptr=self.indptr,
+                indices=self.indices,
+                weights=self.weights,
+            )
+
+    def query(
+        self,
+        world: World,
+        start: Point3,
+        goal: Point3,
+        connect_k: int = 10,
+        stats: PlanStats | None = None,
+    ) -> PlanResult:
+        # Links start and goal to their connect_k nearest visible nodes, then A*
+        # over the roadmap with the goal as an extra node.
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return PlanResult([], False, 0, [])
+        if world.collides(start) or world.collides(goal):
+            return PlanResult([], False, 0, [])
+        if stats is not None:
+            stats.point_checks += 2
+            stats.segment_checks += 1
+        if not world.path_collides(start, goal):
+            return PlanResult([start, goal], True, 0, [start])
+        if not len(self.nodes):
+            return PlanResult([], False, 0, [])
+
+        start_links = self._links(world, start, connect_k, stats)
+        goal_links = dict(self._links(world, goal, connect_k, stats))
+        points, adj = self._points, self._adj
+        target = len(points)
+        gx, gy, gz = goal
+
+        def h(i: int) -> float:
+            x, y, z = points[i]
+            return ((x - gx) ** 2 + (y - gy) ** 2 + (z - gz) ** 2) ** 0.5
+
+        inf = float("inf")
+        g_score: Dict[int, float] = {}
+        parent: Dict[int, int] = {}
+        closed = set()
+        heap: List[Tuple[float, float, int]] = []
+        for i, d in start_links:
+            if d < g_score.get(i, inf):
+                g_score[i] = d
+                parent[i] = -1
+                heapq.heappush(heap, (d + h(i), d, i))
+        if stats is not None:
+            stats.heap_pushes += len(heap)
+
+        iterations = 0
+        visited: List[Point3] = [start]
+        while heap:
+            _, g, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == target:
+                path = [goal]
+                node = parent[u]
+                while node >= 0:
+                    path.append(points[node])
+                    node = parent[node]
+                path.append(start)
+                path.reverse()
+                return PlanResult(path, True, iterations, visited)
+            closed.add(u)
+            iterations += 1
+            visited.append(points[u])
+            if stats is not None:
+                stats.heap_pops += 1
+            for v, w in adj[u]:
+                ng = g + w
+                if v not in closed and ng < g_score.get(v, inf):
+                    g_score[v] = ng
+                    parent[v] = u
+                    heapq.heappush(heap, (ng + h(v), ng, v))
+                    if stats is not None:
+                        stats.heap_pushes += 1
+            if u in goal_links:
+                ng = g + goal_links[u]
+                if ng < g_score.get(target, inf):
+                    g_score[target] = ng
+                    parent[target] = u
+                    heapq.heappush(heap, (ng, ng, target))
+        return PlanResult([], False, iterations, visited)
+
+    def _links(
+        self, world: World, p: Point3, k: int, stats: PlanStats | None
+    ) -> List[Tuple[int, float]]:
+        # (node, distance) for the k nearest nodes with a free segment to p.
+        d = np.linalg.norm(self.nodes - np.asarray(p, dtype=np.float64), axis=1)
+        k = min(k, len(d))
+        near = np.argpartition(d, k - 1)[:k] if k < len(d) else np.arange(len(d))
+        near = near[np.argsort(d[near])]
+        t0 = perf_counter()
+        hits = world.path_collides_many(np.broadcast_to(p, (len(near), 3)), self.nodes[near])
+        if stats is not None:
+            stats.segment_checks += len(near)
+            stats.collision_time += perf_counter() - t0
+        return [(i, dist) for i, dist, hit in zip(near.tolist(), d[near].tolist(), hits) if not hit]
+
+
+_ROADMAP_CACHE: LRUCache[Roadmap] = LRUCache(maxsize=8)
+
+
+def load_roadmap(path: str | Path) -> Roadmap:
+    with np.load(path, allow_pickle=False) as data:
+        return Roadmap(
+            str(data["world_id"]),
+            data["nodes"],
+            data["indptr"],
+            data["indices"],
+            data["weights"],
+        )
+
+
+def clear_roadmap_cache() -> None:
+    _ROADMAP_CACHE.clear()
+
+
+def build_roadmap(
+    world: World,
+    n_samples: int = 1000,
+    k: int = 10,
+    connect_radius: float | None = None,
+    seed: int | None = None,
+    workers: int = 1,
+) -> Roadmap:
+    # Samples n_samples free points, links each to its k nearest samples (within
+    # connect_radius when given) and keeps the collision-free links. Both the
+    # neighbour search and the edge checks are split across a process pool when
+    # workers > 1; the world and samples travel to each worker once.
+    nodes = RandomWorld(world.bounds_min, world.bounds_max).sample_free_points(
+        world, n_samples, seed
+    )
+    n = len(nodes)
+    k = min(k, n - 1)
+    rows = [(lo, min(lo + _KNN_ROWS, n)) for lo in range(0, n, _KNN_ROWS)] if k > 0 else []
+    if workers > 1 and len(rows) > 1:
+        with multiprocessing.Pool(
+            workers, initializer=_init_worker, initargs=(world, nodes, k, connect_radius)
+        ) as pool:
+            a, b = _unique_pairs(pool.map(_worker_pairs, rows), n)
+            hits = pool.map(_worker_collides, _edge_chunks(a, b))
+    else:
+        a, b = _unique_pairs([_nearest_pairs(nodes, r, k, connect_radius) for r in rows], n)
+        hits = [world.path_collides_many(nodes[ca], nodes[cb]) for ca, cb in _edge_chunks(a, b)]
+    if hits:
+        free = ~np.concatenate(hits)
+        a, b = a[free], b[free]
+    weights = np.linalg.norm(nodes[a] - nodes[b], axis=1)
+
+    # Both directions, sorted by source node.
+    src = np.concatenate([a, b])
+    dst = np.concatenate([b, a])
+    w = np.concatenate([weights, weights])
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return Roadmap(world_key(world), nodes, indptr, dst[order], w[order])
+
+
+def _nearest_pairs(
+    nodes: np.ndarray, rows: Tuple[int, int], k: int, radius: float | None
+) -> np.ndarray:
+    # Pair keys min * n + max linking each node in rows to its k nearest nodes.
+    lo, hi = rows
+    n = len(nodes)
+    sq = (nodes * nodes).sum(axis=1)
+    d2 = sq[lo:hi, None] + sq[None, :] - 2.0 * nodes[lo:hi] @ nodes.T
+    local = np.arange(hi - lo)
+    d2[local, local + lo] = np.inf
+    near = np.argpartition(d2, k - 1, axis=1)[:, :k]
+    src = np.repeat(np.arange(lo, hi), k)
+    dst = near.ravel()
+    if radius is not None:
+        keep = d2[np.repeat(local, k), dst] <= radius * radius
+        src, dst = src[keep], dst[keep]
+    return np.minimum(src, dst) * n + np.maximum(src, dst)
+
+
+def _unique_pairs(keys: List[np.ndarray], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    if not keys:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    unique = np.unique(np.concatenate(keys))
+    return unique // n, unique % n
+
+
+def _edge_chunks(a: np.ndarray, b: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    step = _EDGE_CHUNK
+    return [(a[lo : lo + step], b[lo : lo + step]) for lo in range(0, len(a), step)]
+
+
+# Per-process state installed once by the pool initializer.
+_WORKER_STATE: Tuple[World, np.ndarray, int, float | None] | None = None
+
+
+def _init_worker(world: World, nodes: np.ndarray, k: int, radius: float | None) -> None:
+    global _WORKER_STATE
+    _WORKER_STATE = (world, nodes, k, radius)
+
+
+def _worker_pairs(rows: Tuple[int, int]) -> np.ndarray:
+    assert _WORKER_STATE is not None
+    _, nodes, k, radius = _WORKER_STATE
+    return _nearest_pairs(nodes, rows, k, radius)
+
+
+def _worker_collides(edges: Tuple[np.ndarray, np.ndarray]) -> np.ndarray:
+    assert _WORKER_STATE is not None
+    world, nodes = _WORKER_STATE[0], _WORKER_STATE[1]
+    return world.path_collides_many(nodes[edges[0]], nodes[edges[1]])
+
+
+@dataclass
+class PRMPlanner:
+    # Multi-query PRM. The roadmap is built on the first plan() for a world and
+    # cached per (world, parameters); later queries only link start and goal
+    # into it and search the graph. Pass a saved roadmap (load_roadmap) to skip
+    # construction entirely.
+    n_samples: int = 1000
+    # Roadmap edges: each sample links to its k nearest samples, optionally
+    # capped at connect_radius.
+    k: int = 10
+    connect_radius: float | None = None
+    # Nearest roadmap nodes tried when linking start and goal.
+    connect_k: int = 10
+    workers: int = 1
+    seed: int | None = None
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+    roadmap: Roadmap | None = None
+    _checked: World | None = field(default=None, init=False, repr=False, compare=False)
+
+    def roadmap_for(self, world: World) -> Roadmap:
+        if self.roadmap is not None:
+            if self._checked is not world:
+                if self.roadmap.world_id != world_key(world):
+                    raise ValueError("roadmap was built for a different world")
+                self._checked = world
+            return self.roadmap
+        key = (world.fingerprint(), self.n_samples, self.k, self.connect_radius, self.seed)
+        return _ROADMAP_CACHE.get_or_create(
+            key,
+            lambda: build_roadmap(
+                world, self.n_samples, self.k, self.connect_radius, self.seed, self.workers
+            ),
+        )
+
+    def plan(self, world: World, start: Point3, goal: Point3) -> PlanResult:
+        world = world.inflate(self.robot_radius)
+        roadmap = self.roadmap_for(world)
+        if not stats_enabled(self.collect_stats):
+            return roadmap.query(world, start, goal, self.connect_k)
+        stats = PlanStats()
+        t_start = perf_counter()
+        result = roadmap.query(world, start, goal, self.connect_k, stats)
+        stats.nodes_generated = len(result.visited or ())
+        stats.total_time = perf_counter() - t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
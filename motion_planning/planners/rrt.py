@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+import random
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Callable, List
 
-from ..settings.types import Point3, World
+from ..modules.neighbors import BucketIndex
+from ..settings.types import Point3, World, distance
 from .base import PlanResult
+from .stats import PlanStats, emit_stats, stats_enabled
 
 
 @dataclass
@@ -11,6 +17,152 @@ class RRTPlanner:
     step_size: float = 0.5
     max_iters: int = 1000
     goal_sample_rate: float = 0.05
+    # RRT*: choose the cheapest parent and rewire neighbours; runs all max_iters.
+    star: bool = False
+    # Upper bound on the RRT* neighbourhood radius (defaults to 2 * step_size).
+    rewire_radius: float | None = None
+    seed: int | None = None
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
 
-    def plan(self, world: World, start: Point3, goal: Point3) -> PlanResult:
-        return PlanResult([], False, 0, [])
+    def plan(
+        self, world: World, start: Point3, goal: Point3, rng: random.Random | None = None
+    ) -> PlanResult:
+        world = world.inflate(self.robot_radius)
+        if not stats_enabled(self.collect_stats):
+            return self._plan(world, start, goal, rng, world.collides, world.path_collides)
+        stats = PlanStats()
+        t_start = perf_counter()
+        result = self._plan(
+            world, start, goal, rng, stats.points(world.collides), stats.segments(world.path_collides)
+        )
+        stats.nodes_generated = len(result.visited or ())
+        stats.total_time = perf_counter() - t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
+
+    def _plan(
+        self,
+        world: World,
+        start: Point3,
+        goal: Point3,
+        rng: random.Random | None,
+        collides: Callable[[Point3], bool],
+        path_collides: Callable[[Point3, Point3], bool],
+    ) -> PlanResult:
+        if self.step_size <= 0:
+            return PlanResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return PlanResult([], False, 0, [])
+        if collides(start) or collides(goal):
+            return PlanResult([], False, 0, [])
+
+        if distance(start, goal) <= self.step_size and not path_collides(start, goal):
+            return PlanResult([start, goal], True, 0, [start])
+
+        rng = rng or random.Random(self.seed)
+        radius_cap = self.rewire_radius or 2.0 * self.step_size
+        gamma = self._gamma(world)
+        index = BucketIndex(radius_cap if self.star else self.step_size, world.bounds_min)
+        index.add(start)
+        parent: List[int] = [-1]
+        cost: List[float] = [0.0]
+        children: List[List[int]] = [[]]
+        # Tree nodes with a collision-free edge to the goal.
+        goal_links: List[int] = []
+
+        mn, mx = world.bounds_min, world.bounds_max
+        iterations = 0
+        for _ in range(self.max_iters):
+            iterations += 1
+            if rng.random() < self.goal_sample_rate:
+                sample = goal
+            else:
+                sample = (
+                    rng.uniform(mn[0], mx[0]),
+                    rng.uniform(mn[1], mx[1]),
+                    rng.uniform(mn[2], mx[2]),
+                )
+            nearest = index.nearest(sample)
+            near_p = index.points[nearest]
+            new_p = _steer(near_p, sample, self.step_size)
+            if collides(new_p) or path_collides(near_p, new_p):
+                continue
+
+            best_parent = nearest
+            best_cost = cost[nearest] + distance(near_p, new_p)
+            near_ids: List[int] = []
+            if self.star:
+                n = len(index) + 1
+                radius = min(gamma * (math.log(n) / n) ** (1.0 / 3.0), radius_cap)
+                near_ids = index.within(new_p, radius)
+                for i in near_ids:
+                    c = cost[i] + distance(index.points[i], new_p)
+                    if c < best_cost and not path_collides(index.points[i], new_p):
+                        best_parent, best_cost = i, c
+
+            if new_p == goal:
+                # Reached the goal itself: link the parent to it instead of adding
+                # the goal as a tree node (repeated goal samples would stack it).
+                goal_links.append(best_parent)
+                if not self.star:
+                    break
+                continue
+
+            new_id = index.add(new_p)
+            parent.append(best_parent)
+            cost.append(best_cost)
+            children.append([])
+            children[best_parent].append(new_id)
+
+            if self.star:
+                for i in near_ids:
+                    if i == best_parent:
+                        continue
+                    c = best_cost + distance(new_p, index.points[i])
+                    if c < cost[i] and not path_collides(new_p, index.points[i]):
+                        children[parent[i]].remove(i)
+                        parent[i] = new_id
+                        children[new_id].append(i)
+                        self._propagate(i, c - cost[i], cost, children)
+
+            if distance(new_p, goal) <= self.step_size and not path_collides(new_p, goal):
+                goal_links.append(new_id)
+                if not self.star:
+                    break
+
+        if not goal_links:
+            return PlanResult([], False, iterations, list(index.points))
+        # Rewiring may have lowered costs since a link was found, so pick at the end.
+        node = min(goal_links, key=lambda i: cost[i] + distance(index.points[i], goal))
+        path = [goal]
+        while node >= 0:
+            path.append(index.points[node])
+            node = parent[node]
+        path.reverse()
+        return PlanResult(path, True, iterations, list(index.points))
+
+    def _gamma(self, world: World) -> float:
+        # RRT* radius constant for d = 3 (Karaman & Frazzoli), over the bounds volume.
+        volume = 1.0
+        for lo, hi in zip(world.bounds_min, world.bounds_max):
+            volume *= max(hi - lo, 1e-9)
+        unit_ball = 4.0 / 3.0 * math.pi
+        return 2.0 * (1.0 + 1.0 / 3.0) ** (1.0 / 3.0) * (volume / unit_ball) ** (1.0 / 3.0)
+
+    @staticmethod
+    def _propagate(node: int, delta: float, cost: List[float], children: List[List[int]]) -> None:
+        stack = [node]
+        while stack:
+            i = stack.pop()
+            cost[i] += delta
+            stack.extend(children[i])
+
+
+def _steer(a: Point3, b: Point3, step: float) -> Point3:
+    d = distance(a, b)
+    if d <= step:
+        return b
+    s = step / d
+    return (a[0] + (b[0] - a[0]) * s, a[1] + (b[1] - a[1]) * s, a[2] + (b[2] - a[2]) * s)
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Deque, Dict, Sequence, Tuple
+
+import numpy as np
+
+from ..modules.cache import LRUCache
+from ..modules.flat import FlatGrid, seed_flat_cache
+from ..settings.scene import Scene, load_world
+from ..settings.types import Point3, World, world_key
+from .astar import AStarPlanner
+from .base import PlanResult, Planner
+from .parallel import precompute_grid
+
+# Wire protocol: one JSON object per line in each direction. Requests carry a
+# client-chosen "id" that the response echoes; responses may arrive out of
+# order. Ops:
+#   {"op": "register", "world": {...}} or {"op": "register", "path": scene}
+#       -> {"world_id": str}
+#   {"op": "plan", "world_id", "start", "goal", "timeout"?}
+#       -> {"path", "success", "iterations"}
+#   {"op": "cancel", "target": request id} -> {"cancelled": bool}
+#   {"op": "stats"} -> PlanningService.stats()
+# Failures come back as {"id", "error": "timeout" | "cancelled" | message}.
+
+Key = Tuple[str, Point3, Point3]
+
+
+@dataclass
+class _WorldEntry:
+    world: World
+    # Precomputed padded grid for grid planners (None for sampling planners).
+    flat: FlatGrid | None
+
+
+@dataclass
+class _Shared:
+    # One in-flight computation and the number of requests waiting on it.
+    future: asyncio.Future
+    stop: threading.Event
+    waiters: int = 0
+
+
+@dataclass
+class PlanningService:
+    # Async front end for a single planner. Worlds are registered once; their
+    # precomputed grid lives in an LRU of max_worlds entries and is re-seeded
+    # into the per-process caches before each plan() on the worker pool.
+    # Concurrent identical queries share one computation. Planners whose plan()
+    # takes a cancel callback (ARAStarPlanner) are stopped once every waiter
+    # has timed out or been cancelled; others run to completion in the pool.
+    planner: Planner = field(default_factory=lambda: AStarPlanner(record_visited="off"))
+    workers: int = 4
+    max_worlds: int = 8
+    # Default per-request timeout in seconds; None = wait forever.
+    timeout: float | None = None
+    # Latencies kept for the percentile report.
+    latency_window: int = 10000
+    executor: Executor | None = None
+
+    def __post_init__(self) -> None:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="plan")
+        self._worlds: LRUCache[_WorldEntry] = LRUCache(self.max_worlds)
+        self._inflight: Dict[Key, _Shared] = {}
+        self._latency: Deque[float] = deque(maxlen=self.latency_window)
+        self._cancellable = "cancel" in inspect.signature(self.planner.plan).parameters
+        self.counts = dict.fromkeys(
+            ("requests", "computed", "coalesced", "timeouts", "cancelled"), 0
+        )
+
+    async def register(self, world: World) -> str:
+        world_id = world_key(world)
+        if world_id not in self._worlds:
+            loop = asyncio.get_running_loop()
+            flat = await loop.run_in_executor(self.executor, precompute_grid, self.planner, world)
+            self._worlds.put(world_id, _WorldEntry(world, flat))
+        return world_id
+
+    async def plan(
+        self, world_id: str, start: Point3, goal: Point3, timeout: float | None = None
+    ) -> PlanResult:
+        # Raises KeyError for unknown (or evicted) worlds and asyncio.TimeoutError.
+        t0 = perf_counter()
+        self.counts["requests"] += 1
+        entry = self._worlds.get(world_id)
+        if entry is None:
+            raise KeyError(f"unknown world {world_id!r}")
+        key = (world_id, tuple(start), tuple(goal))
+        shared = self._inflight.get(key)
+        if shared is None:
+            shared = self._submit(key, entry)
+        else:
+            self.counts["coalesced"] += 1
+        shared.waiters += 1
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(shared.future), self.timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            self.counts["timeouts"] += 1
+            raise
+        except asyncio.CancelledError:
+            self.counts["cancelled"] += 1
+            raise
+        finally:
+            shared.waiters -= 1
+            if shared.waiters == 0 and not shared.future.done():
+                # Nobody is left waiting: drop it from the queue or stop it.
+                shared.stop.set()
+                shared.future.cancel()
+                self._inflight.pop(key, None)
+        self._latency.append(perf_counter() - t0)
+        return result
+
+    def _submit(self, key: Key, entry: _WorldEntry) -> _Shared:
+        loop = asyncio.get_running_loop()
+        stop = threading.Event()
+        cancel = stop.is_set if self._cancellable else None
+        future = loop.run_in_executor(
+            self.executor, _run_plan, self.planner, entry, key[1], key[2], cancel
+        )
+        shared = _Shared(future, stop)
+        self._inflight[key] = shared
+        self.counts["computed"] += 1
+
+        def done(_: asyncio.Future) -> None:
+            if self._inflight.get(key) is shared:
+                del self._inflight[key]
+
+        future.add_done_callback(done)
+        return shared
+
+    def latency_percentiles(self, percentiles: Sequence[float] = (50, 90, 99)) -> Dict[str, float]:
+        # Seconds from request arrival to result, over completed plan requests.
+        if not self._latency:
+            return {f"p{q:g}": 0.0 for q in percentiles}
+        values = np.percentile(np.fromiter(self._latency, dtype=np.float64), percentiles)
+        return {f"p{q:g}": float(v) for q, v in zip(percentiles, values)}
+
+    def stats(self) -> Dict[str, Any]:
+        info = self._worlds.info()
+        return {
+            **self.counts,
+            "in_flight": len(self._inflight),
+            "worlds": info.size,
+            "world_evictions": info.evictions,
+            "latency": self.latency_percentiles(),
+        }
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def serve(
+        self, path: str | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> asyncio.AbstractServer:
+        # Unix socket at path when given, otherwise TCP on host:port (0 = any free port).
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks: Dict[Any, asyncio.Task] = {}
+        lock = asyncio.Lock()
+
+        async def reply(message: Dict[str, Any]) -> None:
+            async with lock:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+
+        async def run(request: Dict[str, Any]) -> None:
+            rid = request.get("id")
+            try:
+                body = await self._dispatch(request)
+            except asyncio.TimeoutError:
+                body = {"error": "timeout"}
+            except asyncio.CancelledError:
+                body = {"error": "cancelled"}
+            except Exception as exc:  # reported to the client, the server keeps going
+                body = {"error": str(exc) or type(exc).__name__}
+            finally:
+                tasks.pop(rid, None)
+            await reply({"id": rid, **body})
+
+        try:
+            while line := await reader.readline():
+                # A bad line only fails itself; pipelined requests keep running.
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    await reply({"id": None, "error": f"malformed request: {exc}"})
+                    continue
+                if not isinstance(request, dict):
+                    await reply({"id": None, "error": "request must be a JSON object"})
+                    continue
+                if request.get("op") == "cancel":
+                    task = tasks.get(request.get("target"))
+                    if task is not None:
+                        task.cancel()
+                    await reply({"id": request.get("id"), "cancelled": task is not None})
+                    continue
+                tasks[request.get("id")] = asyncio.create_task(run(request))
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    async def _dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "plan":
+            result = await self.plan(
+                request["world_id"],
+                tuple(request["start"]),
+                tuple(request["goal"]),
+                request.get("timeout"),
+            )
+            return {
+                "path": [list(p) for p in result.path],
+                "success": result.success,
+                "iterations": result.iterations,
+            }
+        if op == "register":
+            if "path" in request:
+                world = load_world(request["path"])
+            else:
+                world = world_from_dict(request["world"])
+            return {"world_id": await self.register(world)}
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"unknown op {op!r}")
+
+
+class PlanningClient:
+    # Minimal asyncio client for PlanningService.serve. Requests are pipelined
+    # over one connection; cancelling a pending plan() also cancels it remotely.
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader, self._writer = reader, writer
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def connect(
+        cls, path: str | None = None, host: str = "127.0.0.1", port: int = 0
+    ) -> "PlanningClient":
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def register(self, world: World) -> str:
+        return (await self._call({"op": "register", "world": world_to_dict(world)}))["world_id"]
+
+    async def register_scene(self, path: str) -> str:
+        # Server-side load of a save_scene file (memory-mapped, caches seeded).
+        return (await self._call({"op": "register", "path": str(path)}))["world_id"]
+
+    async def plan(
+        self, world_id: str, start: Point3, goal: Point3, timeout: float | None = None
+    ) -> PlanResult:
+        request = {"op": "plan", "world_id": world_id, "start": start, "goal": goal}
+        if timeout is not None:
+            request["timeout"] = timeout
+        body = await self._call(request)
+        path = [tuple(p) for p in body["path"]]
+        return PlanResult(path, body["success"], body["iterations"], None)
+
+    async def stats(self) -> Dict[str, Any]:
+        return await self._call({"op": "stats"})
+
+    async def close(self) -> None:
+        self._listener.cancel()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def _call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self._next_id += 1
+        rid = request["id"] = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = future
+        await self._send(request)
+        try:
+            body = await future
+        except asyncio.CancelledError:
+            self._next_id += 1
+            await self._send({"op": "cancel", "id": self._next_id, "target": rid})
+            raise
+        finally:
+            self._pending.pop(rid, None)
+        error = body.get("error")
+        if error == "timeout":
+            raise asyncio.TimeoutError()
+        if error is not None:
+            raise RuntimeError(error)
+        return body
+
+    async def _send(self, request: Dict[str, Any]) -> None:
+        self._writer.write(json.dumps(request).encode() + b"\n")
+        await self._writer.drain()
+
+    async def _listen(self) -> None:
+        while line := await self._reader.readline():
+            body = json.loads(line)
+            future = self._pending.get(body.get("id"))
+            if future is not None and not future.done():
+                future.set_result(body)
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("planning service closed the connection"))
+
+
+def world_to_dict(world: World) -> Dict[str, Any]:
+    # JSON form using the scene file's obstacle encoding.
+    scene = Scene.from_world(world)
+    return {
+        "bounds_min": list(scene.bounds_min),
+        "bounds_max": list(scene.bounds_max),
+        "kinds": scene.kinds.tolist(),
+        "params": scene.params.tolist(),
+    }
+
+
+def world_from_dict(data: Dict[str, Any]) -> World:
+    scene = Scene(
+        tuple(data["bounds_min"]),
+        tuple(data["bounds_max"]),
+        np.asarray(data["kinds"], dtype=np.uint8),
+        np.asarray(data["params"], dtype=np.float64).reshape(-1, 6),
+    )
+    return scene.to_world(seed_caches=False)
+
+
+def _run_plan(planner: Planner, entry: _WorldEntry, start: Point3, goal: Point3, cancel):
+    if entry.flat is not None:
+        seed_flat_cache(entry.flat)
+    if cancel is not None:
+        return planner.plan(entry.world, start, goal, cancel=cancel)
+    return planner.plan(entry.world, start, goal)
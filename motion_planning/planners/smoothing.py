@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import List, Sequence
+
+from ..settings.types import Point3, World
+from .base import PlanResult
+
+
+@dataclass(frozen=True)
+class SmoothedResult(PlanResult):
+    # Waypoint count before smoothing (input path, or the one-waypoint-per-cell
+    # grid path for any-angle planners) and the time spent on line-of-sight checks.
+    waypoints_before: int = 0
+    added_time: float = 0.0
+
+    @property
+    def waypoint_reduction(self) -> float:
+        # Fraction of waypoints removed, 0.0 when nothing was removed.
+        if self.waypoints_before <= 0:
+            return 0.0
+        return 1.0 - len(self.path) / self.waypoints_before
+
+
+def shortcut_path(
+    world: World,
+    path: Sequence[Point3] | PlanResult,
+    max_lookahead: int | None = None,
+) -> SmoothedResult:
+    # Greedy shortcutting: from each kept waypoint jump to the furthest later one
+    # in direct line of sight. All candidates of one anchor go through a single
+    # World.path_collides_fan call; max_lookahead caps that batch for long paths.
+    base = path if isinstance(path, PlanResult) else None
+    points: List[Point3] = list(base.path if base is not None else path)
+    t0 = perf_counter()
+    if len(points) > 2:
+        kept = [points[0]]
+        i = 0
+        last = len(points) - 1
+        while i < last:
+            hi = last if max_lookahead is None else min(last, i + max_lookahead)
+            hits = world.path_collides_fan(points[i], points[i + 1 : hi + 1])
+            # The next waypoint is always kept reachable, even if the input path
+            # itself clips an obstacle there.
+            j = i + 1
+            for k in range(hi - i - 1, 0, -1):
+                if not hits[k]:
+                    j = i + 1 + k
+                    break
+            kept.append(points[j])
+            i = j
+        smoothed = kept
+    else:
+        smoothed = points
+    elapsed = perf_counter() - t0
+
+    if base is not None:
+        return SmoothedResult(
+            smoothed,
+            base.success,
+            base.iterations,
+            base.visited,
+            base.stats,
+            waypoints_before=len(points),
+            added_time=elapsed,
+        )
+    return SmoothedResult(
+        smoothed, bool(smoothed), 0, None, waypoints_before=len(points), added_time=elapsed
+    )
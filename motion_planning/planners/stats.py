@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, List, Protocol
+
+# Planners only collect stats when asked to (collect_stats=True) or when a hook
+# is registered; otherwise PlanResult.stats is None and the search loops run
+# their uninstrumented path.
+
+
+@dataclass
+class PlanStats:
+    # Geometric collision queries issued by the planner. Lookups answered from a
+    # precomputed occupancy mask are not counted; edge checks answered by the
+    # shared ValidityCache are, and also show up in segment_cache_hits.
+    point_checks: int = 0
+    segment_checks: int = 0
+    segment_cache_hits: int = 0
+    heap_pushes: int = 0
+    heap_pops: int = 0
+    # Pops of already-closed (superseded) heap entries.
+    stale_pops: int = 0
+    # Distinct nodes that received a cost (grid planners) or tree nodes (RRT).
+    nodes_generated: int = 0
+    collision_time: float = 0.0
+    total_time: float = 0.0
+
+    @property
+    def search_time(self) -> float:
+        # Everything that is not collision checking: heap, bookkeeping, setup.
+        return max(self.total_time - self.collision_time, 0.0)
+
+    def points(self, check: Callable[..., bool]) -> Callable[..., bool]:
+        # Wrap a single-point collision function so calls are counted and timed.
+        def counted(*args):
+            self.point_checks += 1
+            t0 = perf_counter()
+            hit = check(*args)
+            self.collision_time += perf_counter() - t0
+            return hit
+
+        return counted
+
+    def segments(self, check: Callable[..., bool]) -> Callable[..., bool]:
+        def counted(*args):
+            self.segment_checks += 1
+            t0 = perf_counter()
+            hit = check(*args)
+            self.collision_time += perf_counter() - t0
+            return hit
+
+        return counted
+
+
+class StatsHook(Protocol):
+    def __call__(self, planner: object, stats: PlanStats) -> None:
+        ...
+
+
+_HOOKS: List[StatsHook] = []
+
+
+def add_stats_hook(hook: StatsHook) -> StatsHook:
+    # Called with (planner, stats) after every instrumented plan() call; use it to
+    # forward PlanStats to an external metrics system.
+    _HOOKS.append(hook)
+    return hook
+
+
+def remove_stats_hook(hook: StatsHook) -> None:
+    _HOOKS.remove(hook)
+
+
+def stats_enabled(requested: bool) -> bool:
+    return requested or bool(_HOOKS)
+
+
+def emit_stats(planner: object, stats: PlanStats | None) -> None:
+    if stats is None:
+        return
+    for hook in list(_HOOKS):
+        hook(planner, stats)
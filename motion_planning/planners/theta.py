@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import List, Tuple
+
+from ..modules.flat import FlatGrid
+from ..modules.grid import Grid3D
+from ..settings.types import Point3, World
+from .base import VisitLog
+from .smoothing import SmoothedResult
+from .stats import PlanStats, emit_stats, stats_enabled
+
+
+@dataclass
+class LazyThetaStarPlanner:
+    # Lazy Theta* (Nash, Koenig & Tovey) on the 26-connected AStarPlanner grid.
+    # A generated node optimistically inherits its expanding node's parent; the
+    # line-of-sight check (World.path_collides) is deferred until the node is
+    # expanded, and only on failure does it fall back to its best expanded grid
+    # neighbour. Paths are any-angle: waypoints only where the path turns.
+    resolution: float = 0.5
+    cache_edges: bool = True
+    record_visited: str = "full"
+    sample_every: int = 10
+    # Attach PlanStats to results (also on while any stats hook is registered).
+    collect_stats: bool = False
+    # Radius of a ball-shaped robot; plans on World.inflate(robot_radius).
+    robot_radius: float = 0.0
+
+    def plan(self, world: World, start: Point3, goal: Point3) -> SmoothedResult:
+        world = world.inflate(self.robot_radius)
+        if self.resolution <= 0:
+            return SmoothedResult([], False, 0, [])
+        if not world.in_bounds(start) or not world.in_bounds(goal):
+            return SmoothedResult([], False, 0, [])
+
+        grid = Grid3D(world, self.resolution)
+        flat = grid.flat()
+        blocked, near = flat.blocked, flat.near
+        start_id = flat.to_id(grid.to_index(grid.snap(start)))
+        goal_id = flat.to_id(grid.to_index(grid.snap(goal)))
+        if blocked[start_id] or blocked[goal_id]:
+            return SmoothedResult([], False, 0, [])
+
+        stats = PlanStats() if stats_enabled(self.collect_stats) else None
+        t_start = perf_counter()
+        cache = grid.validity_cache() if self.cache_edges else None
+        cache_hits = cache.edge_info().hits if stats is not None and cache is not None else 0
+        to_point = flat.to_point
+        offsets = flat.neighbors(True)
+        gx, gy, gz = to_point(goal_id)
+        log = VisitLog(flat, self.record_visited, self.sample_every)
+        record, every = log.add, log.every
+        los_time = 0.0
+
+        def sight(u: int, v: int) -> bool:
+            nonlocal los_time
+            t0 = perf_counter()
+            if cache is not None:
+                free = not cache.edge_collides(u, v, to_point(u), to_point(v))
+            else:
+                free = not world.path_collides(to_point(u), to_point(v))
+            los_time += perf_counter() - t0
+            if stats is not None:
+                stats.segment_checks += 1
+            return free
+
+        def visible(u: int, v: int) -> bool:
+            # Grid edges with an endpoint away from obstacles need no check.
+            if (not near[u] or not near[v]) and _adjacent(flat, u, v):
+                return True
+            return sight(u, v)
+
+        def dist(u: int, v: int) -> float:
+            a, b = to_point(u), to_point(v)
+            dx, dy, dz = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+            return (dx * dx + dy * dy + dz * dz) ** 0.5
+
+        inf = float("inf")
+        g_score = [inf] * flat.size
+        parent = [-1] * flat.size
+        closed = bytearray(flat.size)
+        g_score[start_id] = 0.0
+        parent[start_id] = start_id
+        open_heap: List[Tuple[float, float, int]] = [(dist(start_id, goal_id), 0.0, start_id)]
+
+        iterations = stale = pushes = 0
+        found = False
+        while open_heap:
+            _, curr_g, curr = heapq.heappop(open_heap)
+            if closed[curr] or curr_g != g_score[curr]:
+                stale += 1
+                continue
+            # SetVertex: verify the deferred line of sight to the inherited parent.
+            up = parent[curr]
+            if up != curr and not visible(up, curr):
+                best_g, best_p = inf, -1
+                for step, cost in offsets:
+                    prev = curr - step
+                    if not closed[prev] or g_score[prev] + cost >= best_g:
+                        continue
+                    if not visible(prev, curr):
+                        continue
+                    best_g, best_p = g_score[prev] + cost, prev
+                g_score[curr], parent[curr] = best_g, best_p
+                if best_p < 0:
+                    # No expanded neighbour reaches it yet; it may be regenerated later.
+                    stale += 1
+                    continue
+            closed[curr] = 1
+            iterations += 1
+            if record is not None and iterations % every == 0:
+                record(curr)
+            if curr == goal_id:
+                found = True
+                break
+
+            up = parent[curr]
+            up_g = g_score[up]
+            ux, uy, uz = to_point(up)
+            for step, _ in offsets:
+                nxt = curr + step
+                if blocked[nxt] or closed[nxt]:
+                    continue
+                nx, ny, nz = to_point(nxt)
+                dx, dy, dz = nx - ux, ny - uy, nz - uz
+                tentative_g = up_g + (dx * dx + dy * dy + dz * dz) ** 0.5
+                if tentative_g < g_score[nxt]:
+                    g_score[nxt] = tentative_g
+                    parent[nxt] = up
+                    hx, hy, hz = nx - gx, ny - gy, nz - gz
+                    heapq.heappush(
+                        open_heap,
+                        (tentative_g + (hx * hx + hy * hy + hz * hz) ** 0.5, tentative_g, nxt),
+                    )
+                    pushes += 1
+
+        if not found:
+            result = SmoothedResult([], False, iterations, log.visited(), added_time=los_time)
+        else:
+            nodes = [goal_id]
+            while nodes[-1] != start_id:
+                nodes.append(parent[nodes[-1]])
+            nodes.reverse()
+            # Length of the equivalent one-waypoint-per-cell path.
+            cells = 1 + sum(_steps(flat, a, b) for a, b in zip(nodes, nodes[1:]))
+            result = SmoothedResult(
+                [to_point(n) for n in nodes],
+                True,
+                iterations,
+                log.visited(),
+                waypoints_before=cells,
+                added_time=los_time,
+            )
+        if stats is None:
+            return result
+        # Nodes dropped after a failed line of sight count as stale pops.
+        stats.heap_pops = iterations + stale
+        stats.stale_pops = stale
+        stats.heap_pushes = pushes + 1
+        stats.nodes_generated = flat.size - g_score.count(inf)
+        if cache is not None:
+            stats.segment_cache_hits = cache.edge_info().hits - cache_hits
+        stats.collision_time = los_time
+        stats.total_time = perf_counter() - t_start
+        emit_stats(self, stats)
+        return replace(result, stats=stats)
+
+
+def _steps(flat: FlatGrid, a: int, b: int) -> int:
+    # Grid cells a straight run from a to b crosses (Chebyshev distance).
+    ia, ib = flat.to_index(a), flat.to_index(b)
+    return max(abs(ia[k] - ib[k]) for k in range(3))
+
+
+def _adjacent(flat: FlatGrid, a: int, b: int) -> bool:
+    return _steps(flat, a, b) <= 1
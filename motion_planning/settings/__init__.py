@@ -1,5 +1,6 @@
 from .types import Box, Point3, Sphere, World
 from .env import RandomWorld
+from .scene import Scene, load_scene, load_world, save_scene
 from .visualize import plot_world
 
 __all__ = [
@@ -8,6 +9,10 @@ __all__ = [
     "Sphere",
     "World",
     "RandomWorld",
+    "Scene",
+    "load_scene",
+    "load_world",
+    "save_scene",
     "plot_world",
 ]
 
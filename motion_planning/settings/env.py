@@ -1,8 +1,11 @@
+import math
 import random
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
-from .types import Box, Point3, Sphere, World
+import numpy as np
+
+from .types import Box, PackedObstacles, Point3, Sphere, World
 
 
 @dataclass(frozen=True)
@@ -13,10 +16,17 @@ class RandomWorld:
     obstacle_size_range: Tuple[float, float] = (0.5, 2.0)
     sphere_ratio: float = 0.3
     max_tries: int = 200
+    # Minimum clearance between obstacle AABBs; None allows overlaps, 0 forbids
+    # them. Candidates that violate it are redrawn up to max_tries times.
+    min_gap: float | None = None
 
     def generate(self, rng: random.Random | None = None) -> World:
         rng = rng or random.Random()
         obstacles: List[Box | Sphere] = []
+        # Spatial hash of placed AABBs by min-corner cell. With cells as wide as
+        # the largest obstacle plus the gap, clashes only come from adjacent cells.
+        cell = self.obstacle_size_range[1] + (self.min_gap or 0.0)
+        placed: Dict[Tuple[int, int, int], List[Tuple[Point3, Point3]]] = {}
         for _ in range(self.obstacle_count):
             for _ in range(self.max_tries):
                 size = rng.uniform(*self.obstacle_size_range)
@@ -25,15 +35,100 @@ class RandomWorld:
                     x = rng.uniform(self.bounds_min[0] + radius, self.bounds_max[0] - radius)
                     y = rng.uniform(self.bounds_min[1] + radius, self.bounds_max[1] - radius)
                     z = rng.uniform(self.bounds_min[2] + radius, self.bounds_max[2] - radius)
-                    obstacles.append(Sphere((x, y, z), radius))
+                    obs: Box | Sphere = Sphere((x, y, z), radius)
+                    aabb = ((x - radius, y - radius, z - radius), (x + radius, y + radius, z + radius))
                 else:
                     x = rng.uniform(self.bounds_min[0], self.bounds_max[0] - size)
                     y = rng.uniform(self.bounds_min[1], self.bounds_max[1] - size)
                     z = rng.uniform(self.bounds_min[2], self.bounds_max[2] - size)
-                    obstacles.append(Box((x, y, z), (x + size, y + size, z + size)))
+                    obs = Box((x, y, z), (x + size, y + size, z + size))
+                    aabb = (obs.min_corner, obs.max_corner)
+                if self.min_gap is not None:
+                    key = tuple(int(math.floor(v / cell)) for v in aabb[0])
+                    if any(
+                        _too_close(aabb, other, self.min_gap)
+                        for dx in (-1, 0, 1)
+                        for dy in (-1, 0, 1)
+                        for dz in (-1, 0, 1)
+                        for other in placed.get((key[0] + dx, key[1] + dy, key[2] + dz), ())
+                    ):
+                        continue
+                    placed.setdefault(key, []).append(aabb)
+                obstacles.append(obs)
                 break
         return World(self.bounds_min, self.bounds_max, obstacles)
 
+    # Vectorized generate() for very large worlds (10^5+ obstacles). Same size,
+    # shape and placement distributions, drawn with numpy; min_gap is enforced
+    # through an AABBHash in rounds of bulk candidates. May return fewer than
+    # obstacle_count obstacles if the gap rule cannot be met within max_tries rounds.
+    def generate_vectorized(self, rng: np.random.Generator | int | None = None) -> World:
+        from ..modules.hashgrid import AABBHash
+
+        gen = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        target = self.obstacle_count
+        gap = self.min_gap
+        is_sphere = np.zeros(0, dtype=bool)
+        corner = np.zeros((0, 3))
+        size = np.zeros(0)
+        for _ in range(self.max_tries if gap is not None else 1):
+            need = target - len(is_sphere)
+            if need <= 0:
+                break
+            c_sphere, c_min, c_size = self._draw(gen, need if gap is None else need + need // 4 + 16)
+            if gap is not None:
+                c_max = c_min + c_size[:, None]
+                keep = np.ones(len(c_sphere), dtype=bool)
+                cell = float(c_size.max()) + gap
+                if len(is_sphere):
+                    placed = AABBHash(corner, corner + size[:, None] + gap, cell)
+                    q, b = placed.query_boxes(c_min, c_max + gap)
+                    hit = _overlaps(c_min[q], c_max[q], corner[b], corner[b] + size[b, None], gap)
+                    keep[q[hit]] = False
+                # Among the candidates themselves, drop the later one of each clash.
+                own = AABBHash(c_min, c_max + gap, cell)
+                q, b = own.query_boxes(c_min, c_max + gap)
+                later = q > b
+                q, b = q[later], b[later]
+                hit = _overlaps(c_min[q], c_max[q], c_min[b], c_max[b], gap)
+                keep[q[hit]] = False
+                idx = np.flatnonzero(keep)[:need]
+                c_sphere, c_min, c_size = c_sphere[idx], c_min[idx], c_size[idx]
+            is_sphere = np.concatenate([is_sphere, c_sphere])
+            corner = np.concatenate([corner, c_min])
+            size = np.concatenate([size, c_size])
+
+        radius = size * 0.5
+        center = corner + radius[:, None]
+        far = corner + size[:, None]
+        boxes = ~is_sphere
+        obstacles: List[Box | Sphere] = [None] * len(size)  # type: ignore[list-item]
+        for i, obs in zip(
+            np.flatnonzero(boxes).tolist(),
+            map(Box, map(tuple, corner[boxes].tolist()), map(tuple, far[boxes].tolist())),
+        ):
+            obstacles[i] = obs
+        for i, obs in zip(
+            np.flatnonzero(is_sphere).tolist(),
+            map(Sphere, map(tuple, center[is_sphere].tolist()), radius[is_sphere].tolist()),
+        ):
+            obstacles[i] = obs
+        world = World(self.bounds_min, self.bounds_max, obstacles)
+        # Hand the arrays over directly instead of re-packing 10^5 objects later.
+        packed = PackedObstacles(corner[boxes], far[boxes], center[is_sphere], radius[is_sphere])
+        object.__setattr__(world, "_packed", packed)
+        return world
+
+    def _draw(self, gen: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # n candidates as (is_sphere, aabb_min, size); like generate(), boxes and
+        # spheres (centre = aabb_min + size / 2) both stay inside the bounds.
+        lo = np.asarray(self.bounds_min, dtype=np.float64)
+        hi = np.asarray(self.bounds_max, dtype=np.float64)
+        size = gen.uniform(*self.obstacle_size_range, size=n)
+        is_sphere = gen.random(n) < self.sphere_ratio
+        c_min = lo + gen.random((n, 3)) * (hi - lo - size[:, None])
+        return is_sphere, c_min, size
+
     def sample_free_point(self, world: World, rng: random.Random | None = None) -> Point3:
         rng = rng or random.Random()
         for _ in range(self.max_tries):
@@ -47,8 +142,40 @@ class RandomWorld:
         # Fallback: return a corner if random sampling fails.
         return world.bounds_min
 
+    # n free points drawn and filtered in bulk, as an (n, 3) array. Returns fewer
+    # rows if max_tries rounds of sampling cannot find n free points.
+    def sample_free_points(
+        self, world: World, n: int, rng: np.random.Generator | int | None = None
+    ) -> np.ndarray:
+        from ..modules.hashgrid import points_collide
+
+        gen = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        lo = np.asarray(world.bounds_min, dtype=np.float64)
+        hi = np.asarray(world.bounds_max, dtype=np.float64)
+        found = [np.zeros((0, 3))]
+        have = 0
+        for _ in range(self.max_tries):
+            if have >= n:
+                break
+            points = lo + gen.random((max(2 * (n - have), 64), 3)) * (hi - lo)
+            free = points[~points_collide(world, points)]
+            found.append(free)
+            have += len(free)
+        return np.concatenate(found)[:n]
+
     def sample_line_segment(
         self, world: World, rng: random.Random | None = None
     ) -> tuple[Point3, Point3]:
         rng = rng or random.Random()
         return self.sample_free_point(world, rng), self.sample_free_point(world, rng)
+
+
+def _too_close(a: Tuple[Point3, Point3], b: Tuple[Point3, Point3], gap: float) -> bool:
+    # AABBs closer than gap on every axis (overlap when gap == 0; touching is fine).
+    return all(a[0][k] < b[1][k] + gap and b[0][k] < a[1][k] + gap for k in range(3))
+
+
+def _overlaps(
+    a_min: np.ndarray, a_max: np.ndarray, b_min: np.ndarray, b_max: np.ndarray, gap: float
+) -> np.ndarray:
+    return ((a_min < b_max + gap) & (b_min < a_max + gap)).all(axis=1)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import mmap
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from .types import Box, PackedObstacles, Sphere, World
+
+# File layout (little endian):
+#   8 bytes   magic b"MPSCENE1"
+#   8 bytes   uint64 length of the JSON header
+#   header    {"bounds_min", "bounds_max", "arrays": {name: [offset, dtype, shape]},
+#              "occupancy": [[resolution, name]], "distance": [[resolution, name]]}
+#   arrays    raw C-order data; offsets are relative to the data section, which
+#             starts at the first _ALIGN boundary after the header
+# Obstacles are stored in world order as kind (0 = box, 1 = sphere) plus six
+# float64 params: box min/max corners, or sphere center, radius, 0, 0.
+_MAGIC = b"MPSCENE1"
+_ALIGN = 64
+BOX, SPHERE = 0, 1
+
+
+@dataclass(frozen=True)
+class Scene:
+    bounds_min: tuple
+    bounds_max: tuple
+    kinds: np.ndarray
+    params: np.ndarray
+    # Precomputed grids keyed by resolution: occupancy (bool) and ESDF (float64).
+    occupancy: Dict[float, np.ndarray] = field(default_factory=dict)
+    distance: Dict[float, np.ndarray] = field(default_factory=dict)
+
+    @staticmethod
+    def from_world(
+        world: World, occupancy: Iterable[float] = (), distance: Iterable[float] = ()
+    ) -> "Scene":
+        from ..modules.grid import Grid3D
+
+        n = len(world.obstacles)
+        kinds = np.empty(n, dtype=np.uint8)
+        params = np.zeros((n, 6), dtype=np.float64)
+        for i, obs in enumerate(world.obstacles):
+            if isinstance(obs, Box):
+                if obs.rounding > 0:
+                    # Inflated worlds are derived views; store the original world.
+                    raise ValueError("rounded boxes cannot be stored in a scene file")
+                kinds[i] = BOX
+                params[i, :3] = obs.min_corner
+                params[i, 3:] = obs.max_corner
+            else:
+                kinds[i] = SPHERE
+                params[i, :3] = obs.center
+                params[i, 3] = obs.radius
+        return Scene(
+            tuple(float(v) for v in world.bounds_min),
+            tuple(float(v) for v in world.bounds_max),
+            kinds,
+            params,
+            {res: Grid3D(world, res).occupancy() for res in occupancy},
+            {res: Grid3D(world, res).distance_field().sdf for res in distance},
+        )
+
+    def obstacles(self) -> List[Box | Sphere]:
+        out: List[Box | Sphere] = []
+        for kind, row in zip(self.kinds.tolist(), self.params.tolist()):
+            if kind == BOX:
+                out.append(Box((row[0], row[1], row[2]), (row[3], row[4], row[5])))
+            else:
+                out.append(Sphere((row[0], row[1], row[2]), row[3]))
+        return out
+
+    def packed(self) -> PackedObstacles:
+        # Batched-query arrays straight from the stored params (no per-obstacle objects).
+        boxes = self.params[self.kinds == BOX]
+        spheres = self.params[self.kinds == SPHERE]
+        return PackedObstacles(
+            np.ascontiguousarray(boxes[:, :3]),
+            np.ascontiguousarray(boxes[:, 3:]),
+            np.ascontiguousarray(spheres[:, :3]),
+            np.ascontiguousarray(spheres[:, 3]),
+        )
+
+    def to_world(self, seed_caches: bool = True) -> World:
+        # seed_caches installs the stored occupancy/ESDF arrays in the per-world
+        # caches, so planners on this world skip rasterization entirely.
+        world = World(self.bounds_min, self.bounds_max, self.obstacles())
+        object.__setattr__(world, "_packed", self.packed())
+        if seed_caches:
+            from ..modules.distance_field import DistanceField, seed_distance_field_cache
+            from ..modules.grid import Grid3D
+            from ..modules.occupancy import seed_occupancy_cache
+
+            for res, occ in self.occupancy.items():
+                seed_occupancy_cache(Grid3D(world, res), occ)
+            for res, sdf in self.distance.items():
+                seed_distance_field_cache(DistanceField(Grid3D(world, res), sdf))
+        return world
+
+    def save(self, path: str | Path) -> None:
+        arrays = {"kinds": self.kinds, "params": self.params}
+        occ_names, dist_names = [], []
+        for i, (res, occ) in enumerate(self.occupancy.items()):
+            arrays[f"occupancy{i}"] = occ
+            occ_names.append([res, f"occupancy{i}"])
+        for i, (res, sdf) in enumerate(self.distance.items()):
+            arrays[f"distance{i}"] = sdf
+            dist_names.append([res, f"distance{i}"])
+
+        header = {
+            "bounds_min": list(self.bounds_min),
+            "bounds_max": list(self.bounds_max),
+            "arrays": {},
+            "occupancy": occ_names,
+            "distance": dist_names,
+        }
+        blobs = {name: np.ascontiguousarray(arr) for name, arr in arrays.items()}
+        offset = 0
+        for name, arr in blobs.items():
+            header["arrays"][name] = [offset, arr.dtype.str, list(arr.shape)]
+            offset = _align(offset + arr.nbytes)
+        encoded = json.dumps(header).encode()
+        data_start = _align(16 + len(encoded))
+
+        with open(path, "wb") as fh:
+            fh.write(_MAGIC)
+            fh.write(np.uint64(len(encoded)).tobytes())
+            fh.write(encoded)
+            for name, arr in blobs.items():
+                fh.seek(data_start + header["arrays"][name][0])
+                fh.write(arr.tobytes())
+            fh.truncate(data_start + offset)
+
+
+def save_scene(
+    path: str | Path,
+    world: World,
+    occupancy: Iterable[float] = (),
+    distance: Iterable[float] = (),
+) -> None:
+    Scene.from_world(world, occupancy, distance).save(path)
+
+
+def load_scene(path: str | Path, use_mmap: bool = True) -> Scene:
+    # With use_mmap the arrays are read-only views of one shared page-cache copy,
+    # so any number of worker processes can load the same file without copying.
+    with open(path, "rb") as fh:
+        if use_mmap:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buf = fh.read()
+    if bytes(buf[:8]) != _MAGIC:
+        raise ValueError(f"{path} is not a scene file")
+    size = int(np.frombuffer(buf, dtype="<u8", count=1, offset=8)[0])
+    header = json.loads(bytes(buf[16 : 16 + size]))
+    data_start = _align(16 + size)
+
+    arrays = {}
+    for name, (offset, dtype, shape) in header["arrays"].items():
+        dt = np.dtype(dtype)
+        count = int(np.prod(shape, dtype=np.int64))
+        arr = np.frombuffer(buf, dtype=dt, count=count, offset=data_start + offset).reshape(shape)
+        arr.setflags(write=False)
+        arrays[name] = arr
+    return Scene(
+        tuple(header["bounds_min"]),
+        tuple(header["bounds_max"]),
+        arrays["kinds"],
+        arrays["params"],
+        {float(res): arrays[name] for res, name in header["occupancy"]},
+        {float(res): arrays[name] for res, name in header["distance"]},
+    )
+
+
+def load_world(path: str | Path, use_mmap: bool = True, seed_caches: bool = True) -> World:
+    return load_scene(path, use_mmap).to_world(seed_caches)
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
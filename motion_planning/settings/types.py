@@ -1,5 +1,8 @@
-from dataclasses import dataclass
-from typing import Iterable, List, Tuple
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Tuple
+
+import numpy as np
 
 
 Point3 = Tuple[float, float, float]
@@ -9,14 +12,36 @@ Point3 = Tuple[float, float, float]
 class Box:
     min_corner: Point3
     max_corner: Point3
+    # Rounded box: every point within this distance of the box (its Minkowski
+    # sum with a ball), as produced by World.inflate.
+    rounding: float = 0.0
 
     def contains(self, p: Point3) -> bool:
+        r = self.rounding
+        if r > 0:
+            mn, mx = self.min_corner, self.max_corner
+            dx = max(mn[0] - p[0], p[0] - mx[0], 0.0)
+            if dx > r:
+                return False
+            dy = max(mn[1] - p[1], p[1] - mx[1], 0.0)
+            if dy > r:
+                return False
+            dz = max(mn[2] - p[2], p[2] - mx[2], 0.0)
+            return dx * dx + dy * dy + dz * dz <= r * r
         return (
             self.min_corner[0] <= p[0] <= self.max_corner[0]
             and self.min_corner[1] <= p[1] <= self.max_corner[1]
             and self.min_corner[2] <= p[2] <= self.max_corner[2]
         )
 
+    def aabb(self) -> Tuple[Point3, Point3]:
+        r = self.rounding
+        mn, mx = self.min_corner, self.max_corner
+        return (mn[0] - r, mn[1] - r, mn[2] - r), (mx[0] + r, mx[1] + r, mx[2] + r)
+
+    def inflate(self, radius: float) -> "Box":
+        return Box(self.min_corner, self.max_corner, self.rounding + radius)
+
 
 @dataclass(frozen=True)
 class Sphere:
@@ -26,6 +51,13 @@ class Sphere:
     def contains(self, p: Point3) -> bool:
         return distance(self.center, p) <= self.radius
 
+    def aabb(self) -> Tuple[Point3, Point3]:
+        (cx, cy, cz), r = self.center, self.radius
+        return (cx - r, cy - r, cz - r), (cx + r, cy + r, cz + r)
+
+    def inflate(self, radius: float) -> "Sphere":
+        return Sphere(self.center, self.radius + radius)
+
 
 Obstacle = Box | Sphere
 
@@ -35,6 +67,12 @@ class World:
     bounds_min: Point3
     bounds_max: Point3
     obstacles: List[Obstacle]
+    # Optional spatial index over obstacles, see build_index().
+    _index: Any = field(default=None, init=False, repr=False, compare=False)
+    # Obstacles packed into arrays for the batched queries, built on first use.
+    _packed: Any = field(default=None, init=False, repr=False, compare=False)
+    # inflate() results by radius.
+    _inflated: Any = field(default=None, init=False, repr=False, compare=False)
 
     def in_bounds(self, p: Point3) -> bool:
         return (
@@ -43,22 +81,270 @@ class World:
             and self.bounds_min[2] <= p[2] <= self.bounds_max[2]
         )
 
+    # Hashable content key; equal worlds share cached precomputations.
+    def fingerprint(self) -> tuple:
+        return (self.bounds_min, self.bounds_max, tuple(self.obstacles))
+
+    # Build a BVH over obstacle AABBs; collides/path_collides then only test
+    # nearby candidates. The world must not be mutated afterwards.
+    def build_index(self, leaf_size: int = 4) -> "World":
+        from ..modules.spatial import ObstacleBVH
+
+        object.__setattr__(self, "_index", ObstacleBVH(self.obstacles, leaf_size))
+        return self
+
+    # Configuration space of a ball-shaped robot: every obstacle grown by radius
+    # (boxes become rounded boxes, spheres larger spheres), so point and segment
+    # queries on the result answer for the whole robot. Built once per radius and
+    # kept on this world; radius <= 0 returns the world itself.
+    def inflate(self, radius: float) -> "World":
+        if radius <= 0:
+            return self
+        if self._inflated is None:
+            object.__setattr__(self, "_inflated", {})
+        world = self._inflated.get(radius)
+        if world is None:
+            world = World(
+                self.bounds_min, self.bounds_max, [obs.inflate(radius) for obs in self.obstacles]
+            )
+            if self._index is not None:
+                world.build_index()
+            self._inflated[radius] = world
+        return world
+
     def collides(self, p: Point3) -> bool:
+        if self._index is not None:
+            return self._index.collides(p)
         for obs in self.obstacles:
             if obs.contains(p):
                 return True
         return False
 
     def path_collides(self, a: Point3, b: Point3) -> bool:
+        if self._index is not None:
+            return self._index.path_collides(a, b)
         for obs in self.obstacles:
             if isinstance(obs, Box):
-                if segment_intersects_aabb(a, b, obs):
+                if segment_intersects_box(a, b, obs):
                     return True
             else:
                 if segment_intersects_sphere(a, b, obs):
                     return True
         return False
 
+    # Batched collides over an (N, 3) array of points.
+    def collides_many(self, points) -> np.ndarray:
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if self._index is not None:
+            return np.fromiter((self._index.collides(tuple(p)) for p in pts), bool, len(pts))
+        packed = self._packed_obstacles()
+        out = np.zeros(len(pts), dtype=bool)
+        rounding = packed.box_rounding
+        for lo, hi in _chunks(len(packed.box_min), len(pts)):
+            if rounding is not None:
+                inside = points_in_rounded_aabbs(
+                    pts, packed.box_min[lo:hi], packed.box_max[lo:hi], rounding[lo:hi]
+                )
+            else:
+                inside = points_in_aabbs(pts, packed.box_min[lo:hi], packed.box_max[lo:hi])
+            out |= inside.any(axis=1)
+        for lo, hi in _chunks(len(packed.radius), len(pts)):
+            out |= points_in_spheres(pts, packed.center[lo:hi], packed.radius[lo:hi]).any(axis=1)
+        return out
+
+    # Batched path_collides over segments a[i] -> b[i], both (N, 3).
+    def path_collides_many(self, a, b) -> np.ndarray:
+        pa = np.asarray(a, dtype=np.float64).reshape(-1, 3)
+        pb = np.asarray(b, dtype=np.float64).reshape(-1, 3)
+        if pa.shape != pb.shape:
+            raise ValueError("a and b must have the same shape")
+        if self._index is not None:
+            return np.fromiter(
+                (self._index.path_collides(tuple(p), tuple(q)) for p, q in zip(pa, pb)),
+                bool,
+                len(pa),
+            )
+        packed = self._packed_obstacles()
+        out = np.zeros(len(pa), dtype=bool)
+        rounding = packed.box_rounding
+        for lo, hi in _chunks(len(packed.box_min), len(pa)):
+            if rounding is not None:
+                hits = segments_intersect_rounded_aabbs(
+                    pa, pb, packed.box_min[lo:hi], packed.box_max[lo:hi], rounding[lo:hi]
+                )
+            else:
+                hits = segments_intersect_aabbs(
+                    pa, pb, packed.box_min[lo:hi], packed.box_max[lo:hi]
+                )
+            out |= hits.any(axis=1)
+        for lo, hi in _chunks(len(packed.radius), len(pa)):
+            out |= segments_intersect_spheres(
+                pa, pb, packed.center[lo:hi], packed.radius[lo:hi]
+            ).any(axis=1)
+        return out
+
+    # Segments from a to each of points; batched only when the segment x obstacle
+    # work is large enough to amortize numpy call overhead.
+    def path_collides_fan(self, a: Point3, points: List[Point3]) -> List[bool]:
+        if len(points) * len(self.obstacles) >= _FAN_BATCH_MIN_WORK and self._index is None:
+            return self.path_collides_many([a] * len(points), points).tolist()
+        return [self.path_collides(a, p) for p in points]
+
+    def _packed_obstacles(self) -> "PackedObstacles":
+        if self._packed is None:
+            object.__setattr__(self, "_packed", PackedObstacles.from_obstacles(self.obstacles))
+        return self._packed
+
+
+def world_key(world: World) -> str:
+    # Stable id for World.fingerprint(), the same in every process.
+    return hashlib.blake2b(repr(world.fingerprint()).encode(), digest_size=8).hexdigest()
+
+
+@dataclass(frozen=True)
+class PackedObstacles:
+    box_min: np.ndarray
+    box_max: np.ndarray
+    center: np.ndarray
+    radius: np.ndarray
+    # Per-box Box.rounding; None when every box is sharp.
+    box_rounding: np.ndarray | None = None
+
+    @staticmethod
+    def from_obstacles(obstacles: Iterable[Obstacle]) -> "PackedObstacles":
+        boxes = [o for o in obstacles if isinstance(o, Box)]
+        spheres = [o for o in obstacles if not isinstance(o, Box)]
+        rounding = np.array([b.rounding for b in boxes], dtype=np.float64)
+        return PackedObstacles(
+            np.array([b.min_corner for b in boxes], dtype=np.float64).reshape(-1, 3),
+            np.array([b.max_corner for b in boxes], dtype=np.float64).reshape(-1, 3),
+            np.array([s.center for s in spheres], dtype=np.float64).reshape(-1, 3),
+            np.array([s.radius for s in spheres], dtype=np.float64),
+            rounding if rounding.any() else None,
+        )
+
+
+# Below this many segment/obstacle pairs numpy call overhead outweighs batching.
+_FAN_BATCH_MIN_WORK = 256
+
+# Keep the (points x obstacles) intermediates around a million entries.
+_BATCH_ELEMS = 1 << 20
+
+
+def _chunks(n_obstacles: int, n_queries: int):
+    step = max(1, _BATCH_ELEMS // max(n_queries, 1))
+    for lo in range(0, n_obstacles, step):
+        yield lo, min(lo + step, n_obstacles)
+
+
+def points_in_aabbs(p: np.ndarray, mn: np.ndarray, mx: np.ndarray) -> np.ndarray:
+    # (N, 3) points vs (M, 3) boxes -> (N, M).
+    p = p[:, None, :]
+    return ((mn[None] <= p) & (p <= mx[None])).all(axis=2)
+
+
+def points_in_rounded_aabbs(
+    p: np.ndarray, mn: np.ndarray, mx: np.ndarray, rounding: np.ndarray
+) -> np.ndarray:
+    # (N, 3) points vs (M,) rounded boxes -> (N, M); exact for rounding 0 too.
+    p = p[:, None, :]
+    excess = np.maximum(np.maximum(mn[None] - p, p - mx[None]), 0.0)
+    return (excess * excess).sum(axis=2) <= (rounding * rounding)[None]
+
+
+def points_in_spheres(p: np.ndarray, center: np.ndarray, radius: np.ndarray) -> np.ndarray:
+    d = center[None] - p[:, None, :]
+    dist = np.sqrt(d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1] + d[..., 2] * d[..., 2])
+    return dist <= radius[None]
+
+
+def segments_intersect_aabbs(
+    a: np.ndarray, b: np.ndarray, mn: np.ndarray, mx: np.ndarray
+) -> np.ndarray:
+    # Vectorized segment_intersects_aabb: (N,) segments vs (M,) boxes -> (N, M).
+    n, m = len(a), len(mn)
+    tmin = np.zeros((n, m))
+    tmax = np.ones((n, m))
+    miss = np.zeros((n, m), dtype=bool)
+    for i in range(3):
+        ai = a[:, i : i + 1]
+        da = b[:, i : i + 1] - ai
+        parallel = np.abs(da) < 1e-9
+        miss |= parallel & ((ai < mn[None, :, i]) | (ai > mx[None, :, i]))
+        inv = 1.0 / np.where(parallel, 1.0, da)
+        t1 = (mn[None, :, i] - ai) * inv
+        t2 = (mx[None, :, i] - ai) * inv
+        t_low = np.where(parallel, -np.inf, np.minimum(t1, t2))
+        t_high = np.where(parallel, np.inf, np.maximum(t1, t2))
+        np.maximum(tmin, t_low, out=tmin)
+        np.minimum(tmax, t_high, out=tmax)
+    return ~miss & (tmin <= tmax)
+
+
+def segments_intersect_rounded_aabbs(
+    a: np.ndarray, b: np.ndarray, mn: np.ndarray, mx: np.ndarray, rounding: np.ndarray
+) -> np.ndarray:
+    # (N,) segments vs (M,) rounded boxes -> (N, M). Slab test against the grown
+    # AABBs first; only those candidates get the exact distance test.
+    r = rounding[:, None]
+    out = segments_intersect_aabbs(a, b, mn - r, mx + r)
+    si, bi = np.nonzero(out & (rounding > 0)[None])
+    if len(si):
+        d2 = segment_aabb_distance_sq(a[si], b[si], mn[bi], mx[bi])
+        out[si, bi] = d2 <= rounding[bi] * rounding[bi]
+    return out
+
+
+def segment_aabb_distance_sq(
+    a: np.ndarray, b: np.ndarray, mn: np.ndarray, mx: np.ndarray
+) -> np.ndarray:
+    # Squared distance between segments a[i] -> b[i] and boxes [mn[i], mx[i]]. Along
+    # the segment it is a convex piecewise quadratic that changes form only where
+    # a coordinate crosses a box face, so the minimum is the clamped stationary
+    # point of one of those (at most seven) pieces.
+    d = b - a
+    flat = np.abs(d) < 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cross = np.concatenate([(mn - a) / d, (mx - a) / d], axis=1)
+    cross[np.concatenate([flat, flat], axis=1)] = 0.0
+    ends = np.zeros((len(a), 2))
+    ends[:, 1] = 1.0
+    ts = np.sort(np.clip(np.concatenate([ends, cross], axis=1), 0.0, 1.0), axis=1)
+    t0, t1 = ts[:, :-1], ts[:, 1:]
+    # Which faces are active on each piece, from its midpoint.
+    s = a[:, None, :] + d[:, None, :] * ((t0 + t1) * 0.5)[..., None]
+    below, above = s < mn[:, None, :], s > mx[:, None, :]
+    c = np.where(below, (a - mn)[:, None, :], np.where(above, (a - mx)[:, None, :], 0.0))
+    dd = np.where(below | above, d[:, None, :], 0.0)
+    num = (c * dd).sum(axis=2)
+    den = (dd * dd).sum(axis=2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(den > 0.0, np.clip(-num / den, t0, t1), t0)
+    q = a[:, None, :] + d[:, None, :] * t[..., None]
+    excess = np.maximum(np.maximum(mn[:, None, :] - q, q - mx[:, None, :]), 0.0)
+    return (excess * excess).sum(axis=2).min(axis=1)
+
+
+def segments_intersect_spheres(
+    a: np.ndarray, b: np.ndarray, center: np.ndarray, radius: np.ndarray
+) -> np.ndarray:
+    # Vectorized segment_intersects_sphere: (N,) segments vs (M,) spheres -> (N, M).
+    d = (b - a)[:, None, :]
+    f = a[:, None, :] - center[None]
+    a_coeff = d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1] + d[..., 2] * d[..., 2]
+    b_coeff = 2.0 * (f[..., 0] * d[..., 0] + f[..., 1] * d[..., 1] + f[..., 2] * d[..., 2])
+    c_coeff = f[..., 0] * f[..., 0] + f[..., 1] * f[..., 1] + f[..., 2] * f[..., 2]
+    r2 = (radius * radius)[None]
+    degenerate = a_coeff < 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        disc = b_coeff * b_coeff - 4.0 * a_coeff * (c_coeff - r2)
+        sqrt_disc = np.sqrt(np.where(disc < 0.0, 0.0, disc))
+        t1 = (-b_coeff - sqrt_disc) / (2.0 * a_coeff)
+        t2 = (-b_coeff + sqrt_disc) / (2.0 * a_coeff)
+    crosses = (disc >= 0.0) & (((0.0 <= t1) & (t1 <= 1.0)) | ((0.0 <= t2) & (t2 <= 1.0)))
+    inside = np.sqrt(c_coeff) <= radius[None]
+    return np.where(degenerate, inside, crosses)
+
 
 def segment_intersects_aabb(a: Point3, b: Point3, box: Box) -> bool:
     # Slab method for segment vs axis-aligned bounding box.
@@ -82,6 +368,31 @@ def segment_intersects_aabb(a: Point3, b: Point3, box: Box) -> bool:
     return True
 
 
+def segment_intersects_box(a: Point3, b: Point3, box: Box) -> bool:
+    # Box.rounding aware: slab test on the grown AABB, then the exact distance.
+    r = box.rounding
+    if r <= 0:
+        return segment_intersects_aabb(a, b, box)
+    mn, mx = box.min_corner, box.max_corner
+    tmin, tmax = 0.0, 1.0
+    for i in range(3):
+        lo, hi = mn[i] - r, mx[i] + r
+        da = b[i] - a[i]
+        if abs(da) < 1e-9:
+            if a[i] < lo or a[i] > hi:
+                return False
+            continue
+        t1 = (lo - a[i]) / da
+        t2 = (hi - a[i]) / da
+        if t1 > t2:
+            t1, t2 = t2, t1
+        tmin = max(tmin, t1)
+        tmax = min(tmax, t2)
+        if tmin > tmax:
+            return False
+    return _segment_box_distance_sq(a, b, mn, mx) <= r * r
+
+
 def segment_intersects_sphere(a: Point3, b: Point3, sphere: Sphere) -> bool:
     d = sub(b, a)
     f = sub(a, sphere.center)
@@ -99,6 +410,44 @@ def segment_intersects_sphere(a: Point3, b: Point3, sphere: Sphere) -> bool:
     return (0.0 <= t1 <= 1.0) or (0.0 <= t2 <= 1.0)
 
 
+def _box_distance_sq(p: Point3, mn: Point3, mx: Point3) -> float:
+    total = 0.0
+    for k in range(3):
+        e = max(mn[k] - p[k], p[k] - mx[k], 0.0)
+        total += e * e
+    return total
+
+
+def _segment_box_distance_sq(a: Point3, b: Point3, mn: Point3, mx: Point3) -> float:
+    # Scalar segment_aabb_distance_sq.
+    d = (b[0] - a[0], b[1] - a[1], b[2] - a[2])
+    ts = [0.0, 1.0]
+    for k in range(3):
+        if abs(d[k]) >= 1e-12:
+            for bound in (mn[k], mx[k]):
+                t = (bound - a[k]) / d[k]
+                if 0.0 < t < 1.0:
+                    ts.append(t)
+    ts.sort()
+    best = float("inf")
+    for t0, t1 in zip(ts, ts[1:]):
+        mid = (t0 + t1) * 0.5
+        num = den = 0.0
+        for k in range(3):
+            s = a[k] + d[k] * mid
+            if s < mn[k]:
+                num += (a[k] - mn[k]) * d[k]
+            elif s > mx[k]:
+                num += (a[k] - mx[k]) * d[k]
+            else:
+                continue
+            den += d[k] * d[k]
+        t = min(max(-num / den, t0), t1) if den > 0.0 else t0
+        q = (a[0] + d[0] * t, a[1] + d[1] * t, a[2] + d[2] * t)
+        best = min(best, _box_distance_sq(q, mn, mx))
+    return best
+
+
 def distance(a: Point3, b: Point3) -> float:
     dx = a[0] - b[0]
     dy = a[1] - b[1]
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Iterable, Sequence
 
+import numpy as np
+
 from .types import Box, Point3, Sphere, World
 
 
@@ -13,17 +16,30 @@ def plot_world(
     visited: Sequence[Point3] | None = None,
     show: bool = True,
     ax=None,
+    save: str | Path | None = None,
+    max_visited: int | None = 20000,
+    visited_voxel: float | None = None,
+    dpi: int = 120,
 ):
+    # save renders headless (Agg, no pyplot state) straight to the file; show is
+    # ignored then. visited sets larger than max_visited are voxel-binned down to
+    # about that many points; visited_voxel forces a bin size.
     try:
-        import matplotlib.pyplot as plt
-        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+        if save is not None and ax is None:
+            from matplotlib.figure import Figure
+        else:
+            import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  (registers "3d")
     except ImportError as exc:  # pragma: no cover - optional dependency
         raise RuntimeError(
             "matplotlib is required for visualization. Install with: pip install matplotlib"
         ) from exc
 
     if ax is None:
-        fig = plt.figure(figsize=(7, 6))
+        if save is not None:
+            fig = Figure(figsize=(7, 6))
+        else:
+            fig = plt.figure(figsize=(7, 6))
         ax = fig.add_subplot(111, projection="3d")
 
     _plot_grid(ax, world.bounds_min, world.bounds_max, step=1.0)
@@ -42,9 +58,11 @@ def plot_world(
     if path:
         xs, ys, zs = zip(*path)
         ax.plot(xs, ys, zs, c="blue", linewidth=2, label="path")
-    if visited:
-        xs, ys, zs = zip(*visited)
-        ax.scatter(xs, ys, zs, c="purple", s=20, alpha=0.35, label="visited")
+    if visited is not None and len(visited):
+        # Accepts Point3 sequences as well as the compact VisitedNodes buffer.
+        pts = np.asarray(visited, dtype=float).reshape(-1, 3)
+        pts = reduce_points(pts, max_visited, visited_voxel)
+        ax.scatter(pts[:, 0], pts[:, 1], pts[:, 2], c="purple", s=20, alpha=0.35, label="visited")
 
     ax.set_xlabel("X", color="black")
     ax.set_ylabel("Y", color="black")
@@ -60,13 +78,36 @@ def plot_world(
     ax.set_zlim(world.bounds_min[2], world.bounds_max[2])
     ax.legend(loc="upper right")
 
-    if show:
+    if save is not None:
+        ax.figure.savefig(save, dpi=dpi)
+    elif show:
         plt.show()
     return ax
 
 
+def reduce_points(
+    points: np.ndarray, max_points: int | None, voxel: float | None = None
+) -> np.ndarray:
+    # Voxel-bin points (one point per occupied voxel, at the voxel centre). Without
+    # an explicit voxel size, one is chosen so roughly max_points voxels survive.
+    if voxel is None:
+        if max_points is None or len(points) <= max_points:
+            return points
+        extent = float((points.max(axis=0) - points.min(axis=0)).max())
+        voxel = max(extent / max(max_points, 1) ** (1.0 / 3.0), 1e-9)
+    origin = points.min(axis=0)
+    cells = np.unique(np.floor((points - origin) / voxel).astype(np.int64), axis=0)
+    reduced = origin + (cells + 0.5) * voxel
+    if max_points is not None and len(reduced) > max_points:
+        # Points concentrated on a thin shell can still exceed the budget.
+        reduced = reduced[:: -(-len(reduced) // max_points)]
+    return reduced
+
+
 def _plot_bounds(ax, mn: Point3, mx: Point3) -> None:
     # Draw a faint bounding box.
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
     lines = [
         ((mn[0], mn[1], mn[2]), (mx[0], mn[1], mn[2])),
         ((mn[0], mn[1], mn[2]), (mn[0], mx[1], mn[2])),
@@ -81,26 +122,31 @@ def _plot_bounds(ax, mn: Point3, mx: Point3) -> None:
         ((mn[0], mn[1], mx[2]), (mx[0], mn[1], mx[2])),
         ((mn[0], mn[1], mx[2]), (mn[0], mx[1], mx[2])),
     ]
-    for a, b in lines:
-        ax.plot([a[0], b[0]], [a[1], b[1]], [a[2], b[2]], c="gray", alpha=0.3)
+    ax.add_collection3d(Line3DCollection(lines, colors="gray", alpha=0.3))
+
+
+# More lines than this per axis turn the grid into noise; widen the step instead.
+_MAX_GRID_LINES = 25
 
 
 def _plot_grid(ax, mn: Point3, mx: Point3, step: float = 1.0) -> None:
     if step <= 0:
         return
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+    span = max(mx[i] - mn[i] for i in range(3))
+    while span / step > _MAX_GRID_LINES:
+        step *= 2
     xs = _frange(mn[0], mx[0], step)
     ys = _frange(mn[1], mx[1], step)
     zs = _frange(mn[2], mx[2], step)
 
-    for y in ys:
-        for z in zs:
-            ax.plot([mn[0], mx[0]], [y, y], [z, z], c="gray", alpha=0.05, linewidth=0.5)
-    for x in xs:
-        for z in zs:
-            ax.plot([x, x], [mn[1], mx[1]], [z, z], c="gray", alpha=0.05, linewidth=0.5)
-    for x in xs:
-        for y in ys:
-            ax.plot([x, x], [y, y], [mn[2], mx[2]], c="gray", alpha=0.05, linewidth=0.5)
+    # One collection for every grid line instead of one artist per line.
+    segments = []
+    segments += [((mn[0], y, z), (mx[0], y, z)) for y in ys for z in zs]
+    segments += [((x, mn[1], z), (x, mx[1], z)) for x in xs for z in zs]
+    segments += [((x, y, mn[2]), (x, y, mx[2])) for x in xs for y in ys]
+    ax.add_collection3d(Line3DCollection(segments, colors="gray", alpha=0.05, linewidths=0.5))
 
 
 def _frange(start: float, stop: float, step: float) -> list[float]:
@@ -144,14 +190,26 @@ def _plot_boxes(ax, boxes: Iterable[Box]) -> None:
 
 
 def _plot_spheres(ax, spheres: Iterable[Sphere]) -> None:
-    import numpy as np
-
-    u_vals = np.linspace(0, 2 * np.pi, 18)
-    v_vals = np.linspace(0, np.pi, 14)
-    for sphere in spheres:
-        cx, cy, cz = sphere.center
-        r = sphere.radius
-        x = cx + r * np.outer(np.cos(u_vals), np.sin(v_vals))
-        y = cy + r * np.outer(np.sin(u_vals), np.sin(v_vals))
-        z = cz + r * np.outer(np.ones_like(u_vals), np.cos(v_vals))
-        ax.plot_surface(x, y, z, color="orange", alpha=0.2, linewidth=0.2, edgecolor="k")
+    # All spheres as quads of one Poly3DCollection rather than a surface each.
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+    u_vals = np.linspace(0, 2 * np.pi, 13)
+    v_vals = np.linspace(0, np.pi, 9)
+    unit = np.stack(
+        [
+            np.outer(np.cos(u_vals), np.sin(v_vals)),
+            np.outer(np.sin(u_vals), np.sin(v_vals)),
+            np.outer(np.ones_like(u_vals), np.cos(v_vals)),
+        ],
+        axis=-1,
+    )
+    # Quad corners (u, v), (u+1, v), (u+1, v+1), (u, v+1) on the unit sphere.
+    quads = np.stack([unit[:-1, :-1], unit[1:, :-1], unit[1:, 1:], unit[:-1, 1:]], axis=2)
+    quads = quads.reshape(-1, 4, 3)
+    centers = np.array([s.center for s in spheres], dtype=float)
+    radii = np.array([s.radius for s in spheres], dtype=float)
+    faces = centers[:, None, None, :] + radii[:, None, None, None] * quads[None]
+    poly = Poly3DCollection(
+        faces.reshape(-1, 4, 3), alpha=0.2, facecolor="orange", edgecolor="k", linewidths=0.2
+    )
+    ax.add_collection3d(poly)
@@ -0,0 +1,16 @@
+import random
+
+from motion_planning import RandomWorld, World
+
+
+def random_world(
+    seed: int,
+    bounds_max=(10.0, 10.0, 10.0),
+    count: int = 15,
+    **options,
+) -> World:
+    # Seeded RandomWorld shared by the tests; options go to RandomWorld as is
+    # (e.g. obstacle_size_range). Worlds start at the origin.
+    return RandomWorld(bounds_max=bounds_max, obstacle_count=count, **options).generate(
+        random.Random(seed)
+    )
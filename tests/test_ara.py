@@ -0,0 +1,51 @@
+import math
+import threading
+
+from motion_planning import ARAStarPlanner, AStarPlanner
+
+from conftest import random_world
+
+
+def _cost(path):
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def _world(seed=3):
+    return random_world(seed, (16.0, 16.0, 6.0), 40)
+
+
+def test_unbounded_ara_reaches_optimal_cost():
+    for seed in range(5):
+        world = _world(seed)
+        start, goal = (0.0, 0.0, 0.0), (16.0, 16.0, 6.0)
+        optimal = AStarPlanner(allow_diagonal=True).plan(world, start, goal)
+        result = ARAStarPlanner().plan(world, start, goal)
+        assert result.success == optimal.success
+        if optimal.success:
+            assert result.bound == 1.0 and not result.interrupted
+            assert math.isclose(_cost(result.path), _cost(optimal.path))
+
+
+def test_budget_returns_bounded_first_solution():
+    world = _world()
+    start, goal = (0.0, 0.0, 0.0), (16.0, 16.0, 6.0)
+    optimal = _cost(AStarPlanner(allow_diagonal=True).plan(world, start, goal).path)
+    budget = 16
+    first = ARAStarPlanner(epsilon=3.0, max_expansions=budget).plan(world, start, goal)
+    while not first.success:
+        assert first.interrupted and first.iterations <= budget
+        budget *= 2
+        first = ARAStarPlanner(epsilon=3.0, max_expansions=budget).plan(world, start, goal)
+
+    assert first.iterations <= budget
+    assert first.interrupted and first.solutions >= 1
+    assert 1.0 <= first.bound <= 3.0
+    assert _cost(first.path) <= first.bound * optimal + 1e-9
+
+
+def test_cancellation_stops_search():
+    event = threading.Event()
+    event.set()
+    result = ARAStarPlanner().plan(_world(), (0.0, 0.0, 0.0), (16.0, 16.0, 6.0), cancel=event.is_set)
+    assert not result.success and result.interrupted
+    assert result.bound == math.inf
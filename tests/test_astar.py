@@ -1,5 +1,13 @@
+import math
+
 from motion_planning import AStarPlanner, Box, Sphere, World
 
+from conftest import random_world
+
+
+def _cost(path):
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
 
 def test_astar_empty_world_path_found():
     world = World(bounds_min=(0.0, 0.0, 0.0), bounds_max=(4.0, 4.0, 4.0), obstacles=[])
@@ -37,3 +45,48 @@ def test_astar_avoids_obstacle():
     assert result.success is True
     assert result.path[0] == (1.0, 1.0, 1.0)
     assert result.path[-1] == (3.0, 3.0, 3.0)
+
+
+def test_astar_diagonal_empty_world_is_straight_line():
+    world = World(bounds_min=(0.0, 0.0, 0.0), bounds_max=(4.0, 4.0, 4.0), obstacles=[])
+    planner = AStarPlanner(resolution=1.0, allow_diagonal=True)
+    result = planner.plan(world, (1.0, 1.0, 1.0), (3.0, 3.0, 3.0))
+
+    assert result.path == [(1.0, 1.0, 1.0), (2.0, 2.0, 2.0), (3.0, 3.0, 3.0)]
+    assert result.iterations == 3
+
+
+def test_astar_expands_each_cell_at_most_once():
+    world = World(
+        bounds_min=(0.0, 0.0, 0.0),
+        bounds_max=(4.0, 4.0, 4.0),
+        obstacles=[Box((0.0, 1.5, 0.0), (3.5, 2.5, 4.0))],
+    )
+    planner = AStarPlanner(resolution=0.5, allow_diagonal=True)
+    result = planner.plan(world, (0.5, 0.5, 0.5), (0.5, 3.5, 0.5))
+
+    assert result.success is True
+    assert len(result.visited) == result.iterations
+    assert len(set(result.visited)) == result.iterations
+    for a, b in zip(result.path, result.path[1:]):
+        assert not world.path_collides(a, b)
+
+
+def test_astar_lazy_edges_match_eager_costs_with_fewer_checks():
+    eager_checks = lazy_checks = 0
+    for seed in range(5):
+        world = random_world(seed, (12.0, 12.0, 5.0), 30)
+        start, goal = (0.0, 0.0, 0.0), (12.0, 12.0, 5.0)
+        kwargs = dict(allow_diagonal=True, cache_edges=False, collect_stats=True)
+        eager = AStarPlanner(**kwargs).plan(world, start, goal)
+        lazy = AStarPlanner(lazy_edges=True, **kwargs).plan(world, start, goal)
+
+        assert lazy.success == eager.success
+        if eager.success:
+            assert math.isclose(_cost(lazy.path), _cost(eager.path))
+            for a, b in zip(lazy.path, lazy.path[1:]):
+                assert not world.path_collides(a, b)
+        assert lazy.stats.heap_pops == lazy.iterations + lazy.stats.stale_pops
+        eager_checks += eager.stats.segment_checks
+        lazy_checks += lazy.stats.segment_checks
+    assert lazy_checks < eager_checks
@@ -0,0 +1,39 @@
+import numpy as np
+
+from motion_planning import World
+
+from conftest import random_world
+
+
+def _world(seed: int) -> World:
+    return random_world(seed, (8.0, 8.0, 8.0), 25)
+
+
+def test_collides_many_matches_scalar():
+    world = _world(0)
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0.0, 8.0, size=(400, 3))
+
+    expected = [world.collides(tuple(p)) for p in points]
+    assert world.collides_many(points).tolist() == expected
+
+
+def test_path_collides_many_matches_scalar():
+    world = _world(1)
+    rng = np.random.default_rng(1)
+    a = rng.uniform(0.0, 8.0, size=(400, 3))
+    b = a + rng.uniform(-1.5, 1.5, size=(400, 3))
+    # Axis-aligned and zero-length segments exercise the degenerate branches.
+    b[:50, 1:] = a[:50, 1:]
+    b[50:80] = a[50:80]
+
+    expected = [world.path_collides(tuple(p), tuple(q)) for p, q in zip(a, b)]
+    assert world.path_collides_many(a, b).tolist() == expected
+    indexed = World(world.bounds_min, world.bounds_max, list(world.obstacles)).build_index()
+    assert indexed.path_collides_many(a, b).tolist() == expected
+
+
+def test_batch_queries_on_empty_world():
+    world = World((0.0, 0.0, 0.0), (1.0, 1.0, 1.0), [])
+    assert world.collides_many([(0.5, 0.5, 0.5)]).tolist() == [False]
+    assert world.path_collides_many(np.zeros((0, 3)), np.zeros((0, 3))).shape == (0,)
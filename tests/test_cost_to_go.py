@@ -0,0 +1,80 @@
+import math
+import random
+
+from motion_planning import (
+    AStarPlanner,
+    Box,
+    World,
+    clear_cost_to_go_cache,
+    cost_to_go_field,
+)
+from motion_planning.planners import cost_to_go as module
+
+from conftest import random_world
+
+
+def _cost(path):
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def _world(seed):
+    return random_world(seed, (14.0, 12.0, 6.0), 35)
+
+
+def test_field_paths_match_astar_costs():
+    goal = (14.0, 12.0, 6.0)
+    for seed in range(3):
+        world = _world(seed)
+        for diagonal in (False, True):
+            field = cost_to_go_field(world, goal, allow_diagonal=diagonal)
+            rng = random.Random(seed)
+            for _ in range(5):
+                start = tuple(rng.uniform(0.0, m) for m in world.bounds_max)
+                reference = AStarPlanner(allow_diagonal=diagonal).plan(world, start, goal)
+                path = field.path(start)
+                assert bool(path) == reference.success
+                if path:
+                    assert path[-1] == reference.path[-1]
+                    assert math.isclose(_cost(path), _cost(reference.path))
+                    assert math.isclose(field.value(start), _cost(path))
+                    assert not any(world.path_collides(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_field_as_heuristic_expands_only_the_path():
+    world, goal = _world(1), (14.0, 12.0, 6.0)
+    rng = random.Random(5)
+    for _ in range(5):
+        start = tuple(rng.uniform(0.0, m) for m in world.bounds_max)
+        plain = AStarPlanner(allow_diagonal=True).plan(world, start, goal)
+        guided = AStarPlanner(allow_diagonal=True, cost_to_go=True).plan(world, start, goal)
+        assert guided.success == plain.success
+        if plain.success:
+            assert math.isclose(_cost(guided.path), _cost(plain.path))
+            assert guided.iterations == len(guided.path) <= plain.iterations
+
+
+def test_fields_are_cached_and_evicted_by_size():
+    clear_cost_to_go_cache()
+    world = _world(2)
+    first = cost_to_go_field(world, (14.0, 12.0, 6.0))
+    assert cost_to_go_field(world, (14.0, 12.0, 6.0)) is first
+    limit = module._FIELD_CACHE.max_weight
+    module.set_cost_to_go_cache_limit(first.nbytes)
+    try:
+        cost_to_go_field(world, (0.0, 0.0, 0.0))
+        assert cost_to_go_field(world, (14.0, 12.0, 6.0)) is not first
+        assert module._FIELD_CACHE.weight <= first.nbytes
+    finally:
+        module.set_cost_to_go_cache_limit(limit)
+        clear_cost_to_go_cache()
+
+
+def test_blocked_goal_and_unreachable_start():
+    world = World(
+        (0.0, 0.0, 0.0), (6.0, 6.0, 2.0), [Box((2.0, -1.0, -1.0), (3.0, 7.0, 3.0))]
+    )
+    assert cost_to_go_field(world, (2.5, 3.0, 1.0)) is None
+    field = cost_to_go_field(world, (5.0, 5.0, 1.0))
+    assert field.path((0.0, 0.0, 0.0)) == [] and not field.plan((0.0, 0.0, 0.0)).success
+    assert field.value((0.0, 0.0, 0.0)) == float("inf")
+    assert field.plan((4.0, 1.0, 1.0)).success
@@ -0,0 +1,43 @@
+import itertools
+
+import numpy as np
+
+from motion_planning import AStarPlanner, Box, Grid3D, World
+from motion_planning.modules.distance_field import edt_squared
+
+from conftest import random_world
+
+
+def test_edt_matches_brute_force():
+    rng = np.random.default_rng(1)
+    sites = rng.random((6, 5, 7)) < 0.05
+    points = np.argwhere(sites)
+    dist2 = edt_squared(sites)
+    for idx in itertools.product(*map(range, sites.shape)):
+        expected = ((points - np.array(idx)) ** 2).sum(axis=1).min()
+        assert dist2[idx] == expected
+
+
+def test_clearance_and_gradient():
+    world = World((0.0, 0.0, 0.0), (4.0, 4.0, 4.0), [Box((0.0, 0.0, 0.0), (1.0, 4.0, 4.0))])
+    field = Grid3D(world, 0.5).distance_field()
+
+    assert field.clearance((3.0, 2.0, 2.0)) == 2.0
+    assert field.clearance((0.5, 2.0, 2.0)) < 0
+    assert field.gradient((3.0, 2.0, 2.0)) == (1.0, 0.0, 0.0)
+    assert Grid3D(world, 0.5).distance_field() is field
+
+
+def test_astar_safety_margin_keeps_clear_of_obstacles():
+    world = random_world(5, (8.0, 8.0, 4.0), 10)
+    field = Grid3D(world, 0.5).distance_field()
+    start, goal = (0.0, 0.0, 0.0), (8.0, 8.0, 4.0)
+
+    plain = AStarPlanner(resolution=0.5, allow_diagonal=True).plan(world, start, goal)
+    safe = AStarPlanner(resolution=0.5, allow_diagonal=True, safety_margin=1.0).plan(
+        world, start, goal
+    )
+
+    assert safe.success
+    assert min(field.clearance(p) for p in plain.path) < 1.0
+    assert min(field.clearance(p) for p in safe.path) >= 1.0
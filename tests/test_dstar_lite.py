@@ -0,0 +1,82 @@
+import pytest
+
+from motion_planning import AStarPlanner, Box, DStarLitePlanner, Grid3D, Sphere, World
+from motion_planning.settings.types import distance
+
+
+def _cost(path):
+    return sum(distance(a, b) for a, b in zip(path, path[1:]))
+
+
+def _astar_cost(world, start, goal):
+    result = AStarPlanner(resolution=0.5, allow_diagonal=True).plan(world, start, goal)
+    assert result.success
+    return _cost(result.path)
+
+
+def test_dstar_lite_repairs_after_obstacle_changes():
+    bounds = ((0.0, 0.0, 0.0), (8.0, 8.0, 8.0))
+    world = World(*bounds, [Sphere((2.0, 5.0, 4.0), 1.0)])
+    start, goal = (1.0, 1.0, 4.0), (7.0, 7.0, 4.0)
+    planner = DStarLitePlanner(resolution=0.5, allow_diagonal=True)
+
+    first = planner.plan(world, start, goal)
+    assert first.success
+    assert _cost(first.path) == pytest.approx(_astar_cost(world, start, goal))
+
+    wall = Box((3.5, 3.5, 2.0), (4.5, 4.5, 6.0))
+    blocked = planner.update(added=[wall])
+    assert blocked.success
+    assert not any(wall.contains(p) for p in blocked.path)
+    assert _cost(blocked.path) == pytest.approx(_astar_cost(planner.world, start, goal))
+    assert blocked.iterations > 0
+
+    # A change away from the current path repairs without re-expanding anything.
+    far = planner.update(added=[Sphere((7.0, 1.0, 7.0), 0.5)])
+    assert far.iterations == 0
+    assert far.path == blocked.path
+
+    restored = planner.update(removed=[wall, Sphere((7.0, 1.0, 7.0), 0.5)])
+    assert _cost(restored.path) == pytest.approx(_cost(first.path))
+
+
+def test_dstar_lite_reports_failure_and_recovers():
+    world = World((0.0, 0.0, 0.0), (4.0, 4.0, 4.0), [])
+    planner = DStarLitePlanner(resolution=1.0)
+    planner.plan(world, (0.0, 0.0, 0.0), (4.0, 4.0, 4.0))
+
+    cage = Box((2.5, 2.5, 2.5), (4.0, 4.0, 4.0))
+    assert planner.update(added=[cage]).success is False
+    assert planner.update(removed=[cage]).success is True
+    with pytest.raises(RuntimeError):
+        DStarLitePlanner().update()
+
+
+def test_dstar_lite_removals_restore_fresh_grid_state():
+    bounds = ((0.0, 0.0, 0.0), (6.0, 6.0, 3.0))
+    keep = Box((1.0, 1.0, 0.0), (2.0, 2.0, 3.0))
+    world = World(*bounds, [keep])
+    planner = DStarLitePlanner(resolution=0.5, allow_diagonal=True)
+    planner.plan(world, (0.0, 5.0, 1.0), (6.0, 0.0, 1.0))
+
+    # Overlaps keep's near band, so some cells must stay near after removal.
+    extra = Box((2.5, 1.0, 0.0), (4.0, 3.0, 3.0))
+    planner.update(added=[extra])
+    result = planner.update(removed=[extra])
+    fresh = Grid3D(world, 0.5).flat()
+    assert bytes(planner._near) == fresh.near
+    assert bytes(planner._blocked) == fresh.blocked
+    assert result.success
+
+
+def test_dstar_lite_rejects_unknown_removals_without_changes():
+    world = World((0.0, 0.0, 0.0), (4.0, 4.0, 4.0), [Box((1.0, 1.0, 1.0), (2.0, 2.0, 2.0))])
+    planner = DStarLitePlanner(resolution=1.0)
+    first = planner.plan(world, (0.0, 0.0, 0.0), (4.0, 4.0, 4.0))
+    state = (planner.world, bytes(planner._blocked), bytes(planner._near), list(planner._g))
+
+    ghost = Sphere((3.0, 3.0, 3.0), 0.5)
+    with pytest.raises(ValueError, match="Sphere"):
+        planner.update(added=[Box((0.0, 2.0, 0.0), (1.0, 3.0, 1.0))], removed=[ghost])
+    assert state == (planner.world, bytes(planner._blocked), bytes(planner._near), list(planner._g))
+    assert planner.update().path == first.path
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from motion_planning import (
+    AStarPlanner,
+    BidirectionalAStarPlanner,
+    Box,
+    JPSPlanner,
+    RandomWorld,
+    World,
+)
+from motion_planning.settings.types import distance
+
+
+def _cost(path):
+    return sum(distance(a, b) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize(
+    "planner, reference",
+    [
+        (JPSPlanner(resolution=0.5), AStarPlanner(resolution=0.5, allow_diagonal=True)),
+        (
+            BidirectionalAStarPlanner(resolution=0.5, allow_diagonal=True),
+            AStarPlanner(resolution=0.5, allow_diagonal=True),
+        ),
+        (
+            BidirectionalAStarPlanner(resolution=0.5, allow_diagonal=False),
+            AStarPlanner(resolution=0.5, allow_diagonal=False),
+        ),
+    ],
+)
+def test_grid_planner_cost_matches_astar(planner, reference):
+    world_gen = RandomWorld(bounds_max=(6.0, 6.0, 6.0), obstacle_count=12)
+    rng = random.Random(4)
+    for _ in range(5):
+        world = world_gen.generate(rng)
+        start, goal = world_gen.sample_line_segment(world, rng)
+        expected = reference.plan(world, start, goal)
+        result = planner.plan(world, start, goal)
+
+        assert result.success == expected.success
+        if expected.success:
+            assert result.path[0] == expected.path[0]
+            assert result.path[-1] == expected.path[-1]
+            assert _cost(result.path) == pytest.approx(_cost(expected.path))
+            for a, b in zip(result.path, result.path[1:]):
+                assert not world.path_collides(a, b)
+
+
+def test_jps_prunes_expansions_in_open_space():
+    world = World((0.0, 0.0, 0.0), (10.0, 10.0, 10.0), [Box((4.0, 4.0, 0.0), (6.0, 6.0, 10.0))])
+    start, goal = (1.0, 1.0, 1.0), (9.0, 9.0, 8.0)
+    jps = JPSPlanner(resolution=0.5).plan(world, start, goal)
+    astar = AStarPlanner(resolution=0.5, allow_diagonal=True).plan(world, start, goal)
+
+    assert jps.success and astar.success
+    assert jps.iterations < astar.iterations
+    assert _cost(jps.path) == pytest.approx(_cost(astar.path))
@@ -0,0 +1,80 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from motion_planning import AStarPlanner, Grid3D, HierarchicalPlanner, RandomWorld
+from motion_planning.planners.hierarchical import ClusterGraph
+from motion_planning.settings.types import distance
+
+
+def _cost(path):
+    return sum(distance(a, b) for a, b in zip(path, path[1:]))
+
+
+def _setup():
+    world_gen = RandomWorld(
+        bounds_max=(12.0, 12.0, 12.0), obstacle_count=25, obstacle_size_range=(1.0, 3.0)
+    )
+    rng = random.Random(5)
+    world = world_gen.generate(rng)
+    return world, [world_gen.sample_line_segment(world, rng) for _ in range(4)]
+
+
+def test_hierarchical_paths_are_valid_and_near_optimal():
+    world, queries = _setup()
+    planner = HierarchicalPlanner(resolution=0.5, cluster_size=6)
+    reference = AStarPlanner(resolution=0.5, allow_diagonal=True)
+    for start, goal in queries:
+        result = planner.plan(world, start, goal)
+        expected = reference.plan(world, start, goal)
+
+        assert result.success == expected.success
+        if expected.success:
+            assert result.path[0] == expected.path[0]
+            assert result.path[-1] == expected.path[-1]
+            assert _cost(result.path) <= 1.2 * _cost(expected.path)
+            for a, b in zip(result.path, result.path[1:]):
+                assert not world.path_collides(a, b)
+
+
+def test_hierarchical_graph_is_cached_and_wide_corridor_is_optimal():
+    world, queries = _setup()
+    planner = HierarchicalPlanner(resolution=0.5, cluster_size=6, corridor_margin=10)
+    grid = Grid3D(world, 0.5)
+    assert planner.graph(grid) is planner.graph(grid)
+
+    start, goal = queries[0]
+    expected = AStarPlanner(resolution=0.5, allow_diagonal=True).plan(world, start, goal)
+    result = planner.plan(world, start, goal)
+    assert _cost(result.path) == pytest.approx(_cost(expected.path))
+
+
+def test_hierarchical_bound_holds_against_optimal_cost():
+    world, queries = _setup()
+    planner = HierarchicalPlanner(resolution=0.5, cluster_size=6)
+    reference = AStarPlanner(resolution=0.5, allow_diagonal=True)
+    for start, goal in queries:
+        result = planner.plan(world, start, goal)
+        expected = reference.plan(world, start, goal)
+        if not expected.success:
+            assert result.bound == float("inf")
+            continue
+        optimal = _cost(expected.path)
+        assert 1.0 <= result.bound < float("inf")
+        assert _cost(result.path) <= result.bound * optimal + 1e-9
+
+
+def test_cluster_graph_fills_consistently_across_threads():
+    world, queries = _setup()
+    grid = Grid3D(world, 0.5)
+    expected = ClusterGraph(grid, 6, 6, True).complete()
+    shared = ClusterGraph(grid, 6, 6, True)
+    to_id = lambda p: shared.flat.to_id(grid.to_index(grid.snap(p)))  # noqa: E731
+    ids = [(to_id(start), to_id(goal)) for start, goal in queries]
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda q: shared.search(*q), ids * 4))
+        list(pool.map(shared._ensure_intra, list(shared.portals) * 2))
+    assert {u: sorted(e) for u, e in shared.edges.items()} == {
+        u: sorted(e) for u, e in expected.edges.items()
+    }
@@ -0,0 +1,27 @@
+from motion_planning import Box, Grid3D, Sphere, World
+
+from conftest import random_world
+
+
+def test_occupancy_matches_world_collides():
+    world = random_world(3, (6.0, 6.0, 6.0), 12)
+    grid = Grid3D(world, 0.5)
+    occ = grid.occupancy()
+
+    assert occ.shape == grid.dims()
+    nx, ny, nz = grid.dims()
+    for ix in range(nx):
+        for iy in range(ny):
+            for iz in range(nz):
+                idx = (ix, iy, iz)
+                assert bool(occ[idx]) == world.collides(grid.to_point(idx))
+
+
+def test_occupancy_is_cached_per_world_and_resolution():
+    obstacles = [Box((1.0, 1.0, 1.0), (2.0, 2.0, 2.0)), Sphere((3.0, 3.0, 3.0), 0.7)]
+    world_a = World((0.0, 0.0, 0.0), (4.0, 4.0, 4.0), list(obstacles))
+    world_b = World((0.0, 0.0, 0.0), (4.0, 4.0, 4.0), list(obstacles))
+
+    occ = Grid3D(world_a, 0.5).occupancy()
+    assert Grid3D(world_b, 0.5).occupancy() is occ
+    assert Grid3D(world_a, 1.0).occupancy() is not occ
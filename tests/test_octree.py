@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+import pytest
+
+from motion_planning import AStarPlanner, Box, Grid3D, Sphere, World
+from motion_planning.modules.octree import NEAR, OCCUPIED
+from motion_planning.settings.types import segments_intersect_aabbs
+
+from conftest import random_world
+
+
+def _world(seed):
+    return random_world(seed, (13.0, 11.0, 7.0), 25)
+
+
+def test_octree_states_match_flat_grid():
+    for seed in range(3):
+        grid = Grid3D(_world(seed), 0.5)
+        flat, tree = grid.flat(), grid.octree()
+        blocked = np.frombuffer(flat.blocked, dtype=np.uint8)
+        near = np.frombuffer(flat.near, dtype=np.uint8)
+        for node in range(flat.size):
+            state = tree.node_state(node)
+            assert (state == OCCUPIED) == bool(blocked[node])
+            assert (state >= NEAR) == bool(near[node])
+
+
+def test_octree_point_and_segment_queries():
+    world = World(
+        (0.0, 0.0, 0.0),
+        (16.0, 16.0, 8.0),
+        [Box((4.0, 4.0, 0.0), (6.0, 12.0, 8.0)), Sphere((11.0, 11.0, 4.0), 2.0)],
+    )
+    grid = Grid3D(world, 0.5)
+    tree = grid.octree()
+    assert tree.collides((5.0, 8.0, 4.0)) and tree.collides((11.0, 11.0, 4.0))
+    assert not tree.collides((1.0, 1.0, 1.0)) and tree.collides((20.0, 1.0, 1.0))
+
+    occ = np.argwhere(grid.occupancy())
+    lo = np.asarray(world.bounds_min) + (occ - 0.5) * grid.resolution
+    rng = random.Random(0)
+    for _ in range(200):
+        a = tuple(rng.uniform(0.0, m) for m in world.bounds_max)
+        b = tuple(rng.uniform(0.0, m) for m in world.bounds_max)
+        brute = segments_intersect_aabbs(np.array([a]), np.array([b]), lo, lo + grid.resolution)
+        assert tree.segment_collides(a, b) == bool(brute.any())
+
+
+def test_octree_keeps_free_space_as_large_leaves():
+    world = World(
+        (0.0, 0.0, 0.0), (1000.0, 1000.0, 100.0), [Box((500.0, 500.0, 0.0), (510.0, 520.0, 50.0))]
+    )
+    tree = Grid3D(world, 0.5).octree()
+    assert tree.nbytes() < 10_000_000
+    assert tree.state((0, 0, 0)) == 0
+    assert tree.state((1010, 1020, 50)) == OCCUPIED
+
+
+def test_sparse_astar_matches_dense_search():
+    for seed in range(3):
+        world = _world(seed)
+        start, goal = (0.0, 0.0, 0.0), (13.0, 11.0, 7.0)
+        for diagonal in (False, True):
+            dense = AStarPlanner(allow_diagonal=diagonal).plan(world, start, goal)
+            sparse = AStarPlanner(allow_diagonal=diagonal, sparse=True).plan(world, start, goal)
+            assert sparse.path == dense.path
+            assert sparse.iterations == dense.iterations
+    with pytest.raises(ValueError):
+        AStarPlanner(sparse=True, safety_margin=0.5).plan(_world(0), start, goal)
@@ -0,0 +1,49 @@
+import random
+
+from motion_planning import AStarPlanner, Grid3D, RandomWorld, plan_all, plan_many
+from motion_planning.modules.flat import clear_flat_cache
+from motion_planning.planners.parallel import _init_worker, precompute_grid
+
+
+def _setup():
+    world_gen = RandomWorld(
+        bounds_min=(0.0, 0.0, 0.0), bounds_max=(6.0, 6.0, 6.0), obstacle_count=8
+    )
+    rng = random.Random(11)
+    world = world_gen.generate(rng)
+    queries = [world_gen.sample_line_segment(world, rng) for _ in range(6)]
+    return world, queries
+
+
+def test_plan_many_matches_serial_loop():
+    world, queries = _setup()
+    planner = AStarPlanner(resolution=0.5, allow_diagonal=True)
+    serial = [planner.plan(world, s, g) for s, g in queries]
+
+    assert plan_all(world, queries, planner, workers=2) == serial
+    assert [i for i, _ in plan_many(world, queries, planner, workers=1)] == list(range(6))
+
+
+def test_plan_many_unordered_yields_every_query():
+    world, queries = _setup()
+    planner = AStarPlanner(resolution=0.5)
+    results = dict(plan_many(world, queries, planner, workers=2, ordered=False))
+
+    assert sorted(results) == list(range(len(queries)))
+    for i, (start, goal) in enumerate(queries):
+        assert results[i] == planner.plan(world, start, goal)
+
+
+def test_workers_rebuild_the_flat_grid_from_shipped_masks():
+    world, queries = _setup()
+    planner = AStarPlanner(resolution=0.5, allow_diagonal=True, robot_radius=0.2)
+    flat = precompute_grid(planner, world)
+    clear_flat_cache()
+    _init_worker(planner, world, (flat.blocked, flat.near))
+    seeded = Grid3D(world.inflate(0.2), 0.5).flat()
+    # Served from the seeded masks, not rasterized again.
+    assert seeded is not flat and seeded.blocked is flat.blocked
+    assert (seeded.blocked, seeded.near, seeded.xs) == (flat.blocked, flat.near, flat.xs)
+
+    serial = [planner.plan(world, s, g) for s, g in queries]
+    assert plan_all(world, queries, planner, workers=2) == serial
@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pytest
+
+from motion_planning import (
+    PRMPlanner,
+    RandomWorld,
+    Sphere,
+    World,
+    build_roadmap,
+    clear_roadmap_cache,
+    load_roadmap,
+)
+
+from conftest import random_world
+
+
+def _path_is_valid(world, path):
+    return all(not world.path_collides(a, b) for a, b in zip(path, path[1:]))
+
+
+def _world(seed=3):
+    return random_world(seed, (12.0, 12.0, 6.0), 20, obstacle_size_range=(1.0, 2.5))
+
+
+# Uniform free samples inside the world's bounds.
+_free_point = RandomWorld().sample_free_point
+
+
+def test_prm_finds_path_around_obstacle():
+    world = World((0.0, 0.0, 0.0), (6.0, 6.0, 6.0), [Sphere((3.0, 3.0, 3.0), 1.5)])
+    planner = PRMPlanner(n_samples=300, seed=1)
+    result = planner.plan(world, (1.5, 1.5, 1.5), (4.5, 4.5, 4.5))
+
+    assert result.success is True
+    assert result.path[0] == (1.5, 1.5, 1.5)
+    assert result.path[-1] == (4.5, 4.5, 4.5)
+    assert len(result.path) > 2
+    assert _path_is_valid(world, result.path)
+
+
+def test_prm_queries_reuse_one_roadmap():
+    clear_roadmap_cache()
+    world = _world()
+    planner = PRMPlanner(n_samples=800, seed=2)
+    rng = random.Random(0)
+    roadmap = planner.roadmap_for(world)
+    for _ in range(20):
+        start, goal = _free_point(world, rng), _free_point(world, rng)
+        result = planner.plan(world, start, goal)
+        assert result.success
+        assert (result.path[0], result.path[-1]) == (start, goal)
+        assert _path_is_valid(world, result.path)
+    assert planner.roadmap_for(world) is roadmap
+
+
+def test_roadmap_edges_are_free_and_parallel_build_matches():
+    world = _world()
+    serial = build_roadmap(world, n_samples=1500, k=8, seed=4)
+    parallel = build_roadmap(world, n_samples=1500, k=8, seed=4, workers=2)
+
+    assert len(serial) == 1500 and serial.edge_count > 0
+    for name in ("nodes", "indptr", "indices", "weights"):
+        assert np.array_equal(getattr(serial, name), getattr(parallel, name))
+    src = np.repeat(np.arange(len(serial)), np.diff(serial.indptr))
+    a, b = serial.nodes[src], serial.nodes[serial.indices]
+    assert not world.path_collides_many(a, b).any()
+    assert np.allclose(serial.weights, np.linalg.norm(a - b, axis=1))
+
+
+def test_roadmap_save_and_load(tmp_path):
+    world = _world()
+    roadmap = build_roadmap(world, n_samples=500, seed=5)
+    roadmap.save(tmp_path / "roadmap.npz")
+    loaded = load_roadmap(tmp_path / "roadmap.npz")
+
+    assert loaded.world_id == roadmap.world_id
+    assert np.array_equal(loaded.indices, roadmap.indices)
+    rng = random.Random(1)
+    start, goal = _free_point(world, rng), _free_point(world, rng)
+    assert PRMPlanner(roadmap=loaded).plan(world, start, goal) == PRMPlanner(
+        roadmap=roadmap
+    ).plan(world, start, goal)
+
+    other = World((0.0, 0.0, 0.0), (12.0, 12.0, 6.0), [])
+    with pytest.raises(ValueError):
+        PRMPlanner(roadmap=loaded).plan(other, start, goal)
+
+
+def test_prm_rejects_blocked_endpoints():
+    world = World((0.0, 0.0, 0.0), (6.0, 6.0, 6.0), [Sphere((3.0, 3.0, 3.0), 1.5)])
+    planner = PRMPlanner(n_samples=100, seed=0)
+
+    assert planner.plan(world, (3.0, 3.0, 3.0), (5.0, 5.0, 5.0)).success is False
+    assert planner.plan(world, (-1.0, 0.0, 0.0), (5.0, 5.0, 5.0)).success is False
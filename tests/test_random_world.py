@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+from motion_planning import Box, RandomWorld
+
+
+def _aabbs(world):
+    lo, hi = [], []
+    for obs in world.obstacles:
+        if isinstance(obs, Box):
+            lo.append(obs.min_corner)
+            hi.append(obs.max_corner)
+        else:
+            lo.append(tuple(c - obs.radius for c in obs.center))
+            hi.append(tuple(c + obs.radius for c in obs.center))
+    return np.array(lo), np.array(hi)
+
+
+def _closest_gap(world):
+    lo, hi = _aabbs(world)
+    sep = np.maximum(lo[:, None] - hi[None], lo[None] - hi[:, None]).max(axis=2)
+    np.fill_diagonal(sep, np.inf)
+    return sep.min()
+
+
+def test_min_gap_is_enforced_in_both_generators():
+    gen = RandomWorld(bounds_max=(20.0, 20.0, 20.0), obstacle_count=300, min_gap=0.4)
+    vectorized = gen.generate_vectorized(3)
+    assert len(vectorized.obstacles) == 300
+    assert _closest_gap(vectorized) >= 0.4 - 1e-9
+
+    scalar = gen.generate(random.Random(3))
+    assert _closest_gap(scalar) >= 0.4 - 1e-9
+
+    lo, hi = _aabbs(vectorized)
+    assert (lo >= 0.0).all() and (hi <= 20.0).all()
+
+
+def test_vectorized_generation_is_seeded_and_packed():
+    gen = RandomWorld(bounds_max=(50.0, 50.0, 50.0), obstacle_count=2000)
+    world = gen.generate_vectorized(7)
+    assert world == gen.generate_vectorized(7)
+    points = np.random.default_rng(0).uniform(0.0, 50.0, (500, 3))
+    expected = [world.collides(tuple(p)) for p in points]
+    assert world.collides_many(points).tolist() == expected
+
+
+def test_sample_free_points_in_bulk():
+    gen = RandomWorld(bounds_max=(20.0, 20.0, 20.0), obstacle_count=400)
+    world = gen.generate_vectorized(1)
+    points = gen.sample_free_points(world, 1000, rng=2)
+    assert points.shape == (1000, 3)
+    assert not any(world.collides(tuple(p)) for p in points)
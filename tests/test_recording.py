@@ -0,0 +1,58 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from motion_planning import AStarPlanner, JPSPlanner, VisitedNodes
+
+from conftest import random_world
+
+
+def _world():
+    return random_world(2, (6.0, 6.0, 3.0), 8)
+
+
+def test_record_modes_agree_with_full_recording():
+    world = _world()
+    start, goal = (0.0, 0.0, 0.0), (6.0, 6.0, 3.0)
+    full = AStarPlanner(allow_diagonal=True).plan(world, start, goal)
+
+    off = AStarPlanner(allow_diagonal=True, record_visited="off").plan(world, start, goal)
+    assert off.visited is None
+    assert off.path == full.path and off.iterations == full.iterations
+
+    compact = AStarPlanner(allow_diagonal=True, record_visited="compact").plan(world, start, goal)
+    assert isinstance(compact.visited, VisitedNodes)
+    assert compact.visited.ids.dtype == np.int64
+    assert list(compact.visited) == full.visited
+    assert np.array_equal(np.asarray(compact.visited), np.array(full.visited))
+
+    sampled = AStarPlanner(
+        allow_diagonal=True, record_visited="sampled", sample_every=4
+    ).plan(world, start, goal)
+    assert sampled.visited == full.visited[3::4]
+
+
+def test_jps_compact_recording_and_bad_mode():
+    world = _world()
+    result = JPSPlanner(record_visited="compact").plan(world, (0.0, 0.0, 0.0), (6.0, 6.0, 3.0))
+    assert len(result.visited) == result.iterations
+
+    with pytest.raises(ValueError):
+        AStarPlanner(record_visited="everything").plan(world, (0.0, 0.0, 0.0), (6.0, 6.0, 3.0))
+
+
+def test_compact_visited_pickles_small_and_compares_by_ids():
+    world = _world()
+    start, goal = (0.0, 0.0, 0.0), (6.0, 6.0, 3.0)
+    planner = AStarPlanner(allow_diagonal=True, record_visited="compact")
+    visited = planner.plan(world, start, goal).visited
+
+    # The ids plus a few decode parameters, not the grid they came from.
+    assert len(pickle.dumps(visited)) < visited.ids.nbytes + 1024
+    again = pickle.loads(pickle.dumps(visited))
+    assert again == visited and list(again) == list(visited)
+    assert planner.plan(world, start, goal).visited == visited
+    assert visited != VisitedNodes(
+        visited.ids[:-1], visited.stride_x, visited.stride_y, visited.origin, visited.resolution
+    )
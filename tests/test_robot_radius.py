@@ -0,0 +1,137 @@
+import numpy as np
+import pytest
+
+from motion_planning import (
+    AStarPlanner,
+    Box,
+    DStarLitePlanner,
+    Grid3D,
+    JPSPlanner,
+    PRMPlanner,
+    RRTPlanner,
+    Scene,
+    Sphere,
+    World,
+)
+from motion_planning.modules.hashgrid import points_collide
+from motion_planning.modules.octree import NEAR, OCCUPIED
+
+from conftest import random_world
+
+
+def _world(seed):
+    return random_world(seed, (10.0, 10.0, 6.0), 15)
+
+
+def _clearance(world, p):
+    # Exact distance from p to the nearest obstacle surface (0 inside).
+    best = float("inf")
+    for obs in world.obstacles:
+        if isinstance(obs, Box):
+            e = np.maximum(
+                np.maximum(np.subtract(obs.min_corner, p), np.subtract(p, obs.max_corner)), 0.0
+            )
+            best = min(best, float(np.sqrt((e * e).sum())))
+        else:
+            d = float(np.linalg.norm(np.subtract(p, obs.center))) - obs.radius
+            best = min(best, max(d, 0.0))
+    return best
+
+
+def test_inflate_is_cached_per_radius():
+    world = _world(0)
+    assert world.inflate(0.0) is world
+    assert world.inflate(0.3) is world.inflate(0.3)
+    assert world.inflate(0.3) is not world.inflate(0.4)
+    assert world.inflate(0.3).inflate(0.2) == world.inflate(0.5)
+
+
+def test_inflated_queries_match_clearance():
+    world = _world(1)
+    inflated = world.inflate(0.4)
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0.0, [10.0, 10.0, 6.0], size=(500, 3))
+    expected = [_clearance(world, p) <= 0.4 for p in points]
+
+    assert [inflated.collides(tuple(p)) for p in points] == expected
+    assert inflated.collides_many(points).tolist() == expected
+    assert points_collide(inflated, points).tolist() == expected
+
+    # Segments: compare with dense sampling along each segment.
+    a = points[:200]
+    b = a + rng.uniform(-2.0, 2.0, size=(200, 3))
+    b[:20, 1:] = a[:20, 1:]
+    b[20:30] = a[20:30]
+    scalar = [inflated.path_collides(tuple(p), tuple(q)) for p, q in zip(a, b)]
+    assert inflated.path_collides_many(a, b).tolist() == scalar
+    indexed = World(inflated.bounds_min, inflated.bounds_max, inflated.obstacles).build_index()
+    assert [indexed.path_collides(tuple(p), tuple(q)) for p, q in zip(a, b)] == scalar
+    for p, q, hit in zip(a, b, scalar):
+        if inflated.collides(tuple(p)) or inflated.collides(tuple(q)):
+            continue
+        samples = [_clearance(world, p + (q - p) * t) for t in np.linspace(0.0, 1.0, 200)]
+        if not hit:
+            assert min(samples) > 0.4
+        elif min(samples) > 0.41:
+            pytest.fail("segment reported hit with clearance everywhere above radius")
+
+
+def test_inflated_grid_and_octree_agree_with_collides():
+    inflated = _world(2).inflate(0.35)
+    grid = Grid3D(inflated, 0.5)
+    occ = grid.occupancy()
+    for idx in np.ndindex(occ.shape):
+        assert occ[idx] == inflated.collides(grid.to_point(idx))
+
+    flat, tree = grid.flat(), grid.octree()
+    blocked = np.frombuffer(flat.blocked, dtype=np.uint8)
+    near = np.frombuffer(flat.near, dtype=np.uint8)
+    for node in range(flat.size):
+        state = tree.node_state(node)
+        assert (state == OCCUPIED) == bool(blocked[node])
+        assert (state >= NEAR) == bool(near[node])
+
+
+def test_robot_radius_keeps_clearance_and_closes_narrow_gaps():
+    # A wall with a 0.6 wide slot: a point fits through, a 0.4 radius robot does not.
+    world = World(
+        (0.0, 0.0, 0.0),
+        (10.0, 10.0, 4.0),
+        [Box((4.5, 0.0, 0.0), (5.5, 4.7, 4.0)), Box((4.5, 5.3, 0.0), (5.5, 10.0, 4.0))],
+    )
+    start, goal = (2.0, 5.0, 2.0), (8.0, 5.0, 2.0)
+    point = AStarPlanner(resolution=0.25, allow_diagonal=True).plan(world, start, goal)
+    assert point.success and len(point.path) < 30
+
+    robot = AStarPlanner(resolution=0.25, allow_diagonal=True, robot_radius=0.4)
+    assert not robot.plan(world, start, goal).success
+
+    open_world = World(world.bounds_min, world.bounds_max, [Sphere((5.0, 5.0, 2.0), 1.5)])
+    for planner in (
+        AStarPlanner(resolution=0.25, allow_diagonal=True, robot_radius=0.4),
+        JPSPlanner(resolution=0.25, robot_radius=0.4),
+        RRTPlanner(step_size=0.5, max_iters=5000, goal_sample_rate=0.1, seed=0, robot_radius=0.4),
+        PRMPlanner(n_samples=400, seed=0, robot_radius=0.4),
+    ):
+        result = planner.plan(open_world, start, goal)
+        assert result.success, planner
+        inflated = open_world.inflate(0.4)
+        assert not any(inflated.path_collides(p, q) for p, q in zip(result.path, result.path[1:]))
+
+
+def test_dstar_lite_updates_take_workspace_obstacles():
+    world = World((0.0, 0.0, 0.0), (8.0, 8.0, 2.0), [])
+    planner = DStarLitePlanner(resolution=0.5, allow_diagonal=True, robot_radius=0.5)
+    assert planner.plan(world, (1.0, 4.0, 1.0), (7.0, 4.0, 1.0)).success
+
+    wall = Box((3.5, 0.0, 0.0), (4.5, 7.2, 2.0))
+    result = planner.update(added=[wall])
+    assert result.success
+    inflated = World(world.bounds_min, world.bounds_max, [wall]).inflate(0.5)
+    assert not any(inflated.path_collides(p, q) for p, q in zip(result.path, result.path[1:]))
+    assert planner.update(removed=[wall]).success
+
+
+def test_rounded_boxes_are_not_written_to_scene_files():
+    with pytest.raises(ValueError):
+        Scene.from_world(_world(0).inflate(0.2))
@@ -0,0 +1,72 @@
+import random
+
+from motion_planning import RRTPlanner, Sphere, World
+from motion_planning.modules import BucketIndex
+from motion_planning.settings.types import distance
+
+from conftest import random_world
+
+
+def _path_is_valid(world, path):
+    return all(not world.path_collides(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_rrt_finds_path_around_obstacle():
+    world = World((0.0, 0.0, 0.0), (6.0, 6.0, 6.0), [Sphere((3.0, 3.0, 3.0), 1.5)])
+    planner = RRTPlanner(step_size=0.5, max_iters=5000, goal_sample_rate=0.1, seed=1)
+    result = planner.plan(world, (0.5, 0.5, 0.5), (5.5, 5.5, 5.5))
+
+    assert result.success is True
+    assert result.path[0] == (0.5, 0.5, 0.5)
+    assert result.path[-1] == (5.5, 5.5, 5.5)
+    assert _path_is_valid(world, result.path)
+
+
+def test_rrt_is_reproducible_with_seed():
+    world = random_world(2, (6.0, 6.0, 6.0), 6)
+    planner = RRTPlanner(step_size=0.5, max_iters=3000, star=True, seed=5)
+    first = planner.plan(world, (0.2, 0.2, 0.2), (5.8, 5.8, 5.8))
+    second = planner.plan(world, (0.2, 0.2, 0.2), (5.8, 5.8, 5.8), rng=random.Random(5))
+
+    assert first == second
+
+
+def test_rrt_star_does_not_lengthen_path():
+    world = World((0.0, 0.0, 0.0), (6.0, 6.0, 6.0), [])
+    start, goal = (0.5, 0.5, 0.5), (5.5, 5.5, 5.5)
+    rrt = RRTPlanner(step_size=0.5, max_iters=2000, seed=3).plan(world, start, goal)
+    star = RRTPlanner(step_size=0.5, max_iters=2000, star=True, seed=3).plan(world, start, goal)
+
+    def cost(path):
+        return sum(distance(a, b) for a, b in zip(path, path[1:]))
+
+    assert rrt.success and star.success
+    assert cost(star.path) <= cost(rrt.path) + 1e-9
+    assert cost(star.path) < 1.2 * distance(start, goal)
+
+
+def test_goal_samples_do_not_repeat_waypoints():
+    world = World((0.0, 0.0, 0.0), (6.0, 6.0, 6.0), [])
+    start, goal = (0.5, 0.5, 0.5), (5.5, 5.5, 5.5)
+    for star in (True, False):
+        for seed in (3, 4, 5, 7, 9):
+            planner = RRTPlanner(
+                step_size=0.5, max_iters=1500, goal_sample_rate=0.3, star=star, seed=seed
+            )
+            path = planner.plan(world, start, goal).path
+            assert path[-1] == goal
+            assert all(a != b for a, b in zip(path, path[1:])), (star, seed)
+
+
+def test_bucket_index_matches_brute_force():
+    rng = random.Random(0)
+    index = BucketIndex(0.7)
+    for _ in range(300):
+        index.add((rng.uniform(0, 10), rng.uniform(0, 10), rng.uniform(0, 10)))
+
+    for _ in range(50):
+        q = (rng.uniform(-2, 12), rng.uniform(-2, 12), rng.uniform(-2, 12))
+        brute = min(range(len(index)), key=lambda i: distance(index.points[i], q))
+        assert distance(index.points[index.nearest(q)], q) == distance(index.points[brute], q)
+        near = [i for i, p in enumerate(index.points) if distance(p, q) <= 1.3]
+        assert sorted(index.within(q, 1.3)) == near
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from motion_planning import AStarPlanner, Grid3D, load_scene, load_world, save_scene
+
+from conftest import random_world
+
+
+def _world():
+    return random_world(6, (8.0, 8.0, 4.0), 15)
+
+
+def test_scene_round_trip_is_lossless(tmp_path):
+    world = _world()
+    path = tmp_path / "world.scn"
+    save_scene(path, world)
+
+    for use_mmap in (True, False):
+        loaded = load_world(path, use_mmap=use_mmap)
+        assert loaded == world
+        assert loaded.fingerprint() == world.fingerprint()
+        points = [(1.0, 1.0, 1.0), (4.0, 4.0, 2.0), (7.5, 0.5, 3.0)]
+        assert np.array_equal(loaded.collides_many(points), world.collides_many(points))
+
+
+def test_precomputed_grids_are_mapped_and_seeded(tmp_path):
+    world = _world()
+    path = tmp_path / "world.scn"
+    occ = Grid3D(world, 0.5).occupancy()
+    sdf = Grid3D(world, 0.5).distance_field().sdf
+    save_scene(path, world, occupancy=[0.5], distance=[0.5])
+
+    scene = load_scene(path)
+    assert np.array_equal(scene.occupancy[0.5], occ)
+    assert np.array_equal(scene.distance[0.5], sdf)
+    assert not scene.occupancy[0.5].flags.writeable
+
+    loaded = scene.to_world()
+    assert Grid3D(loaded, 0.5).occupancy() is scene.occupancy[0.5]
+    assert Grid3D(loaded, 0.5).distance_field().sdf is scene.distance[0.5]
+    expected = AStarPlanner(allow_diagonal=True).plan(world, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0))
+    result = AStarPlanner(allow_diagonal=True).plan(loaded, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0))
+    assert result.path == expected.path
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.scn"
+    path.write_bytes(b"not a scene at all")
+    with pytest.raises(ValueError):
+        load_scene(path)
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import pytest
+
+from motion_planning import (
+    AStarPlanner,
+    ARAStarPlanner,
+    PlanningClient,
+    PlanningService,
+    PlanResult,
+    World,
+)
+from motion_planning.modules.cache import LRUCache
+
+from conftest import random_world
+
+
+@dataclass
+class _SlowPlanner:
+    # Blocks until released so tests control when the computation finishes.
+    release: threading.Event = field(default_factory=threading.Event)
+    calls: int = 0
+
+    def plan(self, world, start, goal):
+        self.calls += 1
+        self.release.wait(5)
+        return PlanResult([start, goal], True, 1, None)
+
+
+def _world(seed=2):
+    return random_world(seed, (10.0, 10.0, 4.0), 15)
+
+
+def test_service_over_socket_matches_direct_planning(tmp_path):
+    async def main():
+        world = _world()
+        service = PlanningService(workers=2)
+        server = await service.serve(str(tmp_path / "plan.sock"))
+        client = await PlanningClient.connect(str(tmp_path / "plan.sock"))
+        try:
+            world_id = await client.register(world)
+            assert await client.register(world) == world_id
+            start, goal = (0.0, 0.0, 0.0), (10.0, 10.0, 4.0)
+            results = await asyncio.gather(*[client.plan(world_id, start, goal) for _ in range(4)])
+            stats = await client.stats()
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+        direct = AStarPlanner(record_visited="off").plan(world, start, goal)
+        assert all(r.path == direct.path and r.success == direct.success for r in results)
+        assert stats["computed"] == 1 and stats["coalesced"] == 3
+        assert set(stats["latency"]) == {"p50", "p90", "p99"}
+
+    asyncio.run(main())
+
+
+def test_malformed_lines_get_an_error_and_keep_the_connection(tmp_path):
+    async def main():
+        service = PlanningService(workers=1)
+        server = await service.serve(str(tmp_path / "plan.sock"))
+        reader, writer = await asyncio.open_unix_connection(str(tmp_path / "plan.sock"))
+        try:
+            writer.write(b'{"id": 1, "op": \n[2]\n{"id": 3, "op": "stats"}\n')
+            await writer.drain()
+            replies = [json.loads(await reader.readline()) for _ in range(3)]
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            service.close()
+        assert [r["id"] for r in replies] == [None, None, 3]
+        assert "malformed" in replies[0]["error"] and "error" in replies[1]
+        assert "computed" in replies[2]
+
+    asyncio.run(main())
+
+
+def test_identical_queries_are_coalesced_and_timeouts_are_per_request():
+    async def main():
+        planner = _SlowPlanner()
+        service = PlanningService(planner, workers=2)
+        world_id = await service.register(World((0, 0, 0), (4, 4, 4), []))
+        patient = asyncio.create_task(service.plan(world_id, (0, 0, 0), (1, 1, 1)))
+        with pytest.raises(asyncio.TimeoutError):
+            await service.plan(world_id, (0, 0, 0), (1, 1, 1), timeout=0.05)
+        planner.release.set()
+        result = await patient
+        service.close()
+        assert result.success and planner.calls == 1
+        assert service.counts["coalesced"] == 1 and service.counts["timeouts"] == 1
+
+    asyncio.run(main())
+
+
+def test_cancel_stops_cancellable_planners_and_unknown_worlds_raise():
+    async def main():
+        service = PlanningService(ARAStarPlanner(resolution=0.1, record_visited="off"), workers=1)
+        world_id = await service.register(_world())
+        task = asyncio.create_task(service.plan(world_id, (0, 0, 0), (10, 10, 4)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert service.counts["cancelled"] == 1 and service.stats()["in_flight"] == 0
+        with pytest.raises(KeyError):
+            await service.plan("missing", (0, 0, 0), (1, 1, 1))
+        service.close()
+
+    asyncio.run(main())
+
+
+def test_world_cache_evicts_least_recently_used():
+    async def main():
+        service = PlanningService(workers=1, max_worlds=1)
+        first = await service.register(_world(1))
+        await service.register(_world(2))
+        with pytest.raises(KeyError):
+            await service.plan(first, (0, 0, 0), (1, 1, 1))
+        assert service.stats()["world_evictions"] == 1
+        service.close()
+
+    asyncio.run(main())
+
+
+def test_shared_lru_cache_stays_consistent_across_threads():
+    cache = LRUCache(maxsize=4, max_weight=40, weigh=lambda value: value % 16)
+
+    def work(seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            key = rng.randrange(12)
+            if rng.random() < 0.5:
+                assert cache.get_or_create(key, lambda: key) == key
+            else:
+                cache.get(key)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(8)))
+    info = cache.info()
+    assert info.hits + info.misses == 8 * 2000
+    assert info.size <= 4
+    assert cache.weight == sum(cache.get(k) % 16 for k in range(12) if k in cache)
@@ -0,0 +1,40 @@
+import random
+
+from motion_planning import World
+from motion_planning.modules import ObstacleBVH
+
+from conftest import random_world
+
+
+def _world(seed: int, count: int) -> World:
+    return random_world(seed, (20.0, 20.0, 20.0), count)
+
+
+def test_indexed_world_matches_linear_scan():
+    plain = _world(0, 200)
+    indexed = World(plain.bounds_min, plain.bounds_max, list(plain.obstacles)).build_index()
+    rng = random.Random(1)
+
+    for _ in range(500):
+        p = tuple(rng.uniform(0.0, 20.0) for _ in range(3))
+        q = tuple(c + rng.uniform(-2.0, 2.0) for c in p)
+        assert indexed.collides(p) == plain.collides(p)
+        assert indexed.path_collides(p, q) == plain.path_collides(p, q)
+
+
+def test_bvh_query_returns_only_nearby_candidates():
+    world = _world(2, 300)
+    bvh = ObstacleBVH(world.obstacles, leaf_size=2)
+    p = (10.0, 10.0, 10.0)
+
+    candidates = bvh.query_point(p)
+    assert len(candidates) < len(world.obstacles)
+    assert any(o.contains(p) for o in candidates) == world.collides(p)
+    assert ObstacleBVH([]).path_collides(p, (0.0, 0.0, 0.0)) is False
+
+
+def test_index_is_not_part_of_world_equality():
+    world = _world(3, 10)
+    copy = World(world.bounds_min, world.bounds_max, list(world.obstacles)).build_index()
+    assert copy == world
+    assert copy.fingerprint() == world.fingerprint()
@@ -0,0 +1,99 @@
+import pytest
+
+from motion_planning import (
+    ARAStarPlanner,
+    AStarPlanner,
+    BidirectionalAStarPlanner,
+    Box,
+    DStarLitePlanner,
+    HierarchicalPlanner,
+    JPSPlanner,
+    LazyThetaStarPlanner,
+    RRTPlanner,
+    add_stats_hook,
+    remove_stats_hook,
+)
+
+from conftest import random_world
+
+
+def _world():
+    return random_world(4, (8.0, 8.0, 4.0), 12)
+
+
+def test_stats_are_off_by_default_and_consistent_when_on():
+    world = _world()
+    start, goal = (0.0, 0.0, 0.0), (8.0, 8.0, 4.0)
+    plain = AStarPlanner(allow_diagonal=True).plan(world, start, goal)
+    assert plain.stats is None
+
+    result = AStarPlanner(allow_diagonal=True, collect_stats=True).plan(world, start, goal)
+    stats = result.stats
+    assert result.path == plain.path
+    assert stats.heap_pops == result.iterations + stats.stale_pops
+    assert stats.heap_pushes >= stats.heap_pops
+    assert stats.nodes_generated >= result.iterations
+    assert stats.segment_checks > 0
+    assert 0 <= stats.collision_time <= stats.total_time
+    assert stats.search_time > 0
+
+
+def test_hooks_receive_stats_from_every_planner():
+    world = _world()
+    seen = []
+    hook = add_stats_hook(lambda planner, stats: seen.append((type(planner).__name__, stats)))
+    try:
+        AStarPlanner().plan(world, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0))
+        HierarchicalPlanner(cluster_size=4).plan(world, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0))
+        rrt = RRTPlanner(step_size=1.0, max_iters=500, seed=1).plan(
+            world, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0)
+        )
+    finally:
+        remove_stats_hook(hook)
+
+    assert [name for name, _ in seen] == ["AStarPlanner", "HierarchicalPlanner", "RRTPlanner"]
+    assert rrt.stats is seen[-1][1]
+    assert rrt.stats.point_checks > 0 and rrt.stats.segment_checks > 0
+    assert AStarPlanner().plan(world, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0)).stats is None
+
+
+@pytest.mark.parametrize(
+    "make",
+    [
+        lambda **kw: JPSPlanner(**kw),
+        lambda **kw: BidirectionalAStarPlanner(allow_diagonal=True, **kw),
+        lambda **kw: DStarLitePlanner(allow_diagonal=True, **kw),
+        lambda **kw: ARAStarPlanner(**kw),
+        lambda **kw: LazyThetaStarPlanner(**kw),
+    ],
+)
+def test_grid_planners_report_stats(make):
+    world = _world()
+    start, goal = (0.0, 0.0, 0.0), (8.0, 8.0, 4.0)
+    plain = make().plan(world, start, goal)
+    assert plain.stats is None
+
+    seen = []
+    hook = add_stats_hook(lambda planner, stats: seen.append(stats))
+    try:
+        result = make(collect_stats=True).plan(world, start, goal)
+    finally:
+        remove_stats_hook(hook)
+    stats = result.stats
+    assert seen == [stats]
+    assert result.path == plain.path
+    assert stats.heap_pops >= result.iterations + stats.stale_pops
+    assert stats.heap_pushes >= stats.heap_pops
+    assert stats.nodes_generated >= result.iterations
+    assert stats.segment_checks > 0
+    assert 0 <= stats.collision_time <= stats.total_time
+
+
+def test_dstar_lite_stats_cover_each_update():
+    world = _world()
+    planner = DStarLitePlanner(allow_diagonal=True, collect_stats=True)
+    first = planner.plan(world, (0.0, 0.0, 0.0), (8.0, 8.0, 4.0))
+    update = planner.update(added=[Box((3.0, 3.0, 0.0), (5.0, 5.0, 4.0))])
+    assert update.stats is not first.stats
+    assert update.stats.point_checks > 0
+    assert update.stats.heap_pushes >= update.stats.heap_pops > 0
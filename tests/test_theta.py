@@ -0,0 +1,78 @@
+import math
+
+from motion_planning import (
+    AStarPlanner,
+    Box,
+    LazyThetaStarPlanner,
+    World,
+    shortcut_path,
+)
+
+from conftest import random_world
+
+
+def _cost(path):
+    return sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+
+
+def _world(seed):
+    return random_world(seed, (16.0, 16.0, 6.0), 40)
+
+
+def _segments_free(world, path):
+    return not any(world.path_collides(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_lazy_theta_paths_are_free_and_no_longer_than_grid_astar():
+    start, goal = (0.0, 0.0, 0.0), (16.0, 16.0, 6.0)
+    for seed in range(5):
+        world = _world(seed)
+        grid = AStarPlanner(allow_diagonal=True).plan(world, start, goal)
+        result = LazyThetaStarPlanner().plan(world, start, goal)
+        assert result.success == grid.success
+        if not result.success:
+            continue
+        assert result.path[0] == start and result.path[-1] == goal
+        assert _segments_free(world, result.path)
+        assert _cost(result.path) <= _cost(grid.path) + 1e-9
+        assert len(result.path) < result.waypoints_before
+        assert 0.0 < result.waypoint_reduction < 1.0
+        assert result.added_time >= 0.0
+
+
+def test_lazy_theta_open_world_is_a_single_segment():
+    world = World((0.0, 0.0, 0.0), (10.0, 10.0, 4.0), [])
+    result = LazyThetaStarPlanner(resolution=1.0).plan(world, (0, 0, 0), (10, 7, 3))
+    assert result.path == [(0.0, 0.0, 0.0), (10.0, 7.0, 3.0)]
+    assert result.waypoints_before == 11
+
+
+def test_lazy_theta_rejects_blocked_goal():
+    world = World((0.0, 0.0, 0.0), (10.0, 10.0, 4.0), [Box((4, 4, 0), (6, 6, 4))])
+    result = LazyThetaStarPlanner().plan(world, (0, 0, 0), (5, 5, 2))
+    assert not result.success and result.path == []
+
+
+def test_shortcut_path_keeps_endpoints_and_clearance():
+    start, goal = (0.0, 0.0, 0.0), (16.0, 16.0, 6.0)
+    for seed in range(5):
+        world = _world(seed)
+        grid = AStarPlanner(allow_diagonal=True).plan(world, start, goal)
+        if not grid.success:
+            continue
+        smoothed = shortcut_path(world, grid)
+        assert smoothed.success and smoothed.iterations == grid.iterations
+        assert smoothed.path[0] == grid.path[0] and smoothed.path[-1] == grid.path[-1]
+        assert _segments_free(world, smoothed.path)
+        assert _cost(smoothed.path) <= _cost(grid.path) + 1e-9
+        assert smoothed.waypoints_before == len(grid.path)
+        assert smoothed.waypoint_reduction > 0.0
+
+
+def test_shortcut_path_lookahead_and_plain_sequences():
+    world = World((0.0, 0.0, 0.0), (10.0, 10.0, 4.0), [])
+    path = [(float(i), 0.0, 0.0) for i in range(11)]
+    assert shortcut_path(world, path).path == [path[0], path[-1]]
+    assert shortcut_path(world, path, max_lookahead=4).path == path[::4] + [path[-1]]
+    assert shortcut_path(world, path[:2]).path == path[:2]
+    assert shortcut_path(world, []).success is False
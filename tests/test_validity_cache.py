@@ -0,0 +1,40 @@
+from motion_planning import AStarPlanner, Grid3D
+from motion_planning.modules import ValidityCache
+
+from conftest import random_world
+
+
+def _world():
+    return random_world(7, (6.0, 6.0, 6.0), 10)
+
+
+def test_edge_cache_is_shared_across_plan_calls():
+    world = _world()
+    planner = AStarPlanner(resolution=0.5, allow_diagonal=True)
+    cache = Grid3D(world, 0.5).validity_cache()
+    cache.clear()
+
+    first = planner.plan(world, (0.5, 0.5, 0.5), (5.5, 5.5, 5.5))
+    misses = cache.edge_info().misses
+    second = planner.plan(world, (0.5, 0.5, 0.5), (5.5, 5.5, 5.5))
+    uncached = AStarPlanner(resolution=0.5, allow_diagonal=True, cache_edges=False).plan(
+        world, (0.5, 0.5, 0.5), (5.5, 5.5, 5.5)
+    )
+
+    assert misses > 0
+    assert cache.edge_info().misses == misses
+    assert cache.edge_info().hits >= misses
+    assert first.path == second.path == uncached.path
+
+
+def test_edge_cache_is_bounded_and_undirected():
+    world = _world()
+    cache = ValidityCache(world, size=1000, max_edges=4)
+    for v in range(1, 10):
+        cache.edge_collides(0, v, (0.0, 0.0, 0.0), (float(v) * 0.1, 0.0, 0.0))
+
+    info = cache.edge_info()
+    assert info.size == 4
+    assert info.evictions == 5
+    cache.edge_collides(9, 0, (0.9, 0.0, 0.0), (0.0, 0.0, 0.0))
+    assert cache.edge_info().hits == 1
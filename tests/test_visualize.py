@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from motion_planning import AStarPlanner, plot_world
+from motion_planning.settings.visualize import reduce_points
+
+from conftest import random_world
+
+
+def test_reduce_points_bins_to_budget():
+    points = np.random.default_rng(0).uniform(0.0, 10.0, (50000, 3))
+    reduced = reduce_points(points, 1000)
+    assert 0 < len(reduced) <= 1000
+    assert reduced.min() >= 0.0 and reduced.max() <= 10.0 + 1e-9
+    few = points[:10]
+    assert reduce_points(few, 1000) is few
+    assert len(reduce_points(points, None, voxel=5.0)) == 8
+
+
+def test_plot_world_renders_headless_to_file(tmp_path):
+    pytest.importorskip("matplotlib")
+    world = random_world(0, (12.0, 12.0, 6.0), 20)
+    result = AStarPlanner(allow_diagonal=True, record_visited="compact").plan(
+        world, (0.0, 0.0, 0.0), (12.0, 12.0, 6.0)
+    )
+    out = tmp_path / "world.png"
+    ax = plot_world(
+        world,
+        start=(0.0, 0.0, 0.0),
+        goal=(12.0, 12.0, 6.0),
+        path=result.path,
+        visited=result.visited,
+        save=out,
+        max_visited=200,
+    )
+    assert out.stat().st_size > 0
+    # Grid, bounds, boxes and spheres are batched into a handful of collections.
+    assert len(ax.collections) < 10